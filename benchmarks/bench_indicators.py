@@ -0,0 +1,53 @@
+"""
+bench_indicators.py
+Time the vectorized technical indicators against the naive loops in reference.py.
+
+Usage: python benchmarks/bench_indicators.py [n_bars]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stocktoolkit.indicators import atr, bollinger_bands, ema, macd, rsi, vwap
+from stocktoolkit.synthetic import make_ohlcv
+import reference
+
+
+def best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_ohlcv(n, freq="min")
+    close = df["Close"]
+    h, l, c, v = (df[col].to_numpy() for col in ("High", "Low", "Close", "Volume"))
+
+    cases = [
+        ("ema", lambda: ema(close, 20), lambda: reference.ema_loop(c, 20)),
+        ("rsi", lambda: rsi(close, 14), lambda: reference.rsi_loop(c, 14)),
+        ("macd", lambda: macd(close), lambda: reference.macd_loop(c)),
+        ("bollinger_bands", lambda: bollinger_bands(close), lambda: reference.bollinger_loop(c)),
+        ("atr", lambda: atr(df), lambda: reference.atr_loop(h, l, c)),
+        ("vwap", lambda: vwap(df), lambda: reference.vwap_loop(h, l, c, v)),
+    ]
+
+    print(f"{n:,} bars")
+    print(f"{'indicator':<16}{'vectorized':>12}{'naive loop':>12}{'speedup':>10}")
+    for name, fast, naive in cases:
+        t_fast = best_of(fast)
+        t_naive = best_of(naive, repeat=1)
+        print(f"{name:<16}{t_fast * 1e3:>10.1f}ms{t_naive * 1e3:>10.1f}ms{t_naive / t_fast:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
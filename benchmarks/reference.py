@@ -0,0 +1,73 @@
+"""
+reference.py
+Naive per-bar loop implementations of the stocktoolkit indicators, used as
+correctness and speed baselines for the vectorized versions.
+"""
+
+import math
+
+import numpy as np
+
+
+def ema_loop(values, span):
+    alpha = 2.0 / (span + 1)
+    out = np.empty(len(values))
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def rsi_loop(values, window=14):
+    out = np.full(len(values), np.nan)
+    avg_gain = avg_loss = 0.0
+    for i in range(1, len(values)):
+        delta = values[i] - values[i - 1]
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if i == 1:
+            avg_gain, avg_loss = gain, loss
+        else:
+            avg_gain += (gain - avg_gain) / window
+            avg_loss += (loss - avg_loss) / window
+        if i >= window:
+            out[i] = 100.0 * avg_gain / (avg_gain + avg_loss)
+    return out
+
+
+def macd_loop(values, fast=12, slow=26, signal=9):
+    line = ema_loop(values, fast) - ema_loop(values, slow)
+    signal_line = ema_loop(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_loop(values, window=20, num_std=2.0):
+    middle = np.full(len(values), np.nan)
+    width = np.full(len(values), np.nan)
+    for i in range(window - 1, len(values)):
+        chunk = values[i - window + 1:i + 1]
+        mean = sum(chunk) / window
+        middle[i] = mean
+        width[i] = num_std * math.sqrt(sum((x - mean) ** 2 for x in chunk) / window)
+    return middle, middle + width, middle - width
+
+
+def atr_loop(high, low, close, window=14):
+    out = np.full(len(close), np.nan)
+    avg = high[0] - low[0]
+    for i in range(len(close)):
+        if i:
+            tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+            avg += (tr - avg) / window
+        if i >= window - 1:
+            out[i] = avg
+    return out
+
+
+def vwap_loop(high, low, close, volume):
+    out = np.empty(len(close))
+    traded = total = 0.0
+    for i in range(len(close)):
+        traded += (high[i] + low[i] + close[i]) / 3.0 * volume[i]
+        total += volume[i]
+        out[i] = traded / total
+    return out
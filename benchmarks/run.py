@@ -0,0 +1,457 @@
+"""
+run.py
+Benchmark suite for the stocktoolkit hot paths: downloads (against an offline
+fetcher with simulated latency), close extraction, resampling, validation,
+every indicator and both plot functions. Records the best wall time and the peak
+traced memory of each case and compares them with a stored baseline.
+
+Usage:
+  python benchmarks/run.py                          # quick profile, compare with baseline.json
+  python benchmarks/run.py --profile full           # 1k..10M bars, 10..5,000 symbols
+  python benchmarks/run.py --filter indicators      # only cases whose name contains the text
+  python benchmarks/run.py --update-baseline        # store the results as the new baseline
+
+Exit status is 1 when a case is slower or uses more memory than the baseline
+allows (see --time-tolerance / --memory-tolerance).
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")  # headless: plt.show() is a no-op
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functools import partial
+
+from stocktoolkit import (
+    aio, analytics, backtest, data, indicators, memo, parallel, pipeline, plotting, profiling, providers,
+    validation,
+)
+from stocktoolkit.synthetic import AsyncSyntheticFetcher, SyntheticFetcher, make_ohlcv, make_universe
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+PROFILES = {
+    "quick": {
+        "bars": [1_000, 100_000],
+        "symbols": [10, 100],
+        "latency": 0.002,
+        "plot_bars": [1_000, 100_000],
+    },
+    "full": {
+        "bars": [1_000, 100_000, 1_000_000, 10_000_000],
+        "symbols": [10, 500, 5_000],
+        "latency": 0.05,
+        "plot_bars": [1_000, 100_000, 1_000_000],
+    },
+}
+
+# Serial downloads of huge universes only measure time.sleep; skip them
+MAX_SERIAL_SYMBOLS = 500
+
+PANEL_BARS = 2_520  # ten years of daily bars
+CHART_SYMBOLS = 20
+
+
+# asyncio.run on Python 3.11 may repr the main task's result on exit; keep it small
+async def _discard(coro):
+    await coro
+
+
+def _symbols(n):
+    return [f"SYM{i:04d}" for i in range(n)]
+
+
+def _close(n):
+    return make_ohlcv(n, freq="min")["Close"]
+
+
+def _yfinance_frame(n):
+    # Single-ticker yfinance layout: (Price, Ticker) MultiIndex columns
+    df = make_ohlcv(n, freq="min")
+    df.columns = pd.MultiIndex.from_product([df.columns, ["SYM"]], names=["Price", "Ticker"])
+    return df
+
+
+"""
+Each case factory takes the profile and returns (name, size, setup) triples;
+setup() prepares inputs outside the timed region and returns the callable to time.
+"""
+
+
+def download_cases(profile):
+    for n in profile["symbols"]:
+        symbols = _symbols(n)
+        latency = profile["latency"]
+
+        def serial(symbols=symbols, latency=latency):
+            fetcher = SyntheticFetcher(latency=latency)
+            return lambda: data.download_multiple_price_data(
+                symbols, "2023-01-01", "2024-01-01", fetcher=fetcher
+            )
+
+        def concurrent(symbols=symbols, latency=latency):
+            fetcher = SyntheticFetcher(latency=latency)
+            return lambda: data.download_multiple_price_data(
+                symbols, "2023-01-01", "2024-01-01", fetcher=fetcher, max_workers=32
+            )
+
+        def batched(symbols=symbols, latency=latency):
+            fetcher = SyntheticFetcher(latency=latency)
+            return lambda: data.download_multiple_price_data(
+                symbols, "2023-01-01", "2024-01-01", batch_size=100, batch_fetcher=fetcher.batch
+            )
+
+        def asynchronous(symbols=symbols, latency=latency):
+            fetcher = AsyncSyntheticFetcher(latency=latency)
+            return lambda: asyncio.run(_discard(aio.download_multiple_price_data_async(
+                symbols, "2023-01-01", "2024-01-01", fetcher=fetcher, max_concurrency=32
+            )))
+
+        if n <= MAX_SERIAL_SYMBOLS:
+            yield "data.download_multiple_price_data[serial]", n, serial
+        yield "data.download_multiple_price_data[concurrent]", n, concurrent
+        yield "data.download_multiple_price_data[batched]", n, batched
+        yield "aio.download_multiple_price_data_async", n, asynchronous
+
+    for n in profile["symbols"]:
+        def local(n=n):
+            root = tempfile.mkdtemp(prefix="stocktoolkit-bench-")
+            for symbol, df in make_universe(n, PANEL_BARS).items():
+                df.to_csv(os.path.join(root, f"{symbol}.csv"))
+            provider = providers.LocalFileProvider(root)
+            provider.preload()
+            symbols = provider.symbols()
+            return lambda: data.download_multiple_price_data(
+                symbols, "2005-01-01", "2006-01-01", fetcher=provider
+            )
+
+        yield "data.download_multiple_price_data[local]", n, local
+
+
+def data_cases(profile):
+    for n in profile["bars"]:
+        def close_price(n=n):
+            df = _yfinance_frame(n)
+            return lambda: data.get_close_price(df)
+
+        def resample(n=n):
+            df = make_ohlcv(n, freq="min")
+            return lambda: data.resample_price(df, freq="W", how="last")
+
+        def resample_bars(n=n):
+            df = make_ohlcv(n, freq="min")
+            return lambda: data.resample_price(df, freq="D", how="ohlc")
+
+        def resample_multi(n=n):
+            df = make_ohlcv(n, freq="min")
+            return lambda: data.resample_price_multi(df, ["h", "D", "W", "ME"])
+
+        yield "data.get_close_price", n, close_price
+        yield "data.resample_price", n, resample
+        yield "data.resample_price[ohlc]", n, resample_bars
+        yield "data.resample_price_multi", n, resample_multi
+
+    for n in profile["symbols"]:
+        def close_panel(n=n):
+            universe = make_universe(n, PANEL_BARS)
+            return lambda: data.build_close_panel(universe)
+
+        yield "data.build_close_panel", n, close_panel
+
+
+def validation_cases(profile):
+    for n in profile["bars"]:
+        def series(n=n):
+            close = _close(n)
+            return lambda: validation.validate_price_series(close)
+
+        def leading_gap(n=n):
+            # NaN at both ends forces a scan up to the first value
+            close = _close(n).copy()
+            close.iloc[: n // 2] = np.nan
+            close.iloc[-1] = np.nan
+            return lambda: validation.validate_price_series(close)
+
+        def trusted(n=n):
+            close = _close(n)
+
+            def run():
+                with validation.trusted_inputs():
+                    indicators.moving_average(close, 20)
+            return run
+
+        yield "validation.validate_price_series", n, series
+        yield "validation.validate_price_series[gap]", n, leading_gap
+        yield "indicators.moving_average[trusted]", n, trusted
+
+    for n in profile["symbols"]:
+        def universe(n=n):
+            frames = make_universe(n, PANEL_BARS)
+            return lambda: validation.validate_price_universe(frames)
+
+        def panel(n=n):
+            frames = pd.concat(make_universe(n, PANEL_BARS), axis=1)
+            return lambda: validation.validate_price_universe(frames)
+
+        yield "validation.validate_price_universe", n, universe
+        yield "validation.validate_price_universe[panel]", n, panel
+
+
+def indicator_cases(profile):
+    series_cases = {
+        "compute_returns": lambda s: indicators.compute_returns(s),
+        "moving_average": lambda s: indicators.moving_average(s, 20),
+        "rolling_volatility": lambda s: indicators.rolling_volatility(s, 20),
+        "moving_averages": lambda s: indicators.moving_averages(s, [5, 10, 20, 50, 100, 200]),
+        "rolling_volatilities": lambda s: indicators.rolling_volatilities(s, [5, 10, 20, 50, 100, 200]),
+        "ema": lambda s: indicators.ema(s, 20),
+        "rsi": lambda s: indicators.rsi(s),
+        "macd": lambda s: indicators.macd(s),
+        "bollinger_bands": lambda s: indicators.bollinger_bands(s),
+    }
+    frame_cases = {
+        "atr": lambda df: indicators.atr(df),
+        "vwap": lambda df: indicators.vwap(df),
+    }
+    panel_cases = {
+        "compute_returns_panel": lambda p: indicators.compute_returns_panel(p),
+        "moving_average_panel": lambda p: indicators.moving_average_panel(p, 20),
+        "rolling_volatility_panel": lambda p: indicators.rolling_volatility_panel(p, 20),
+    }
+
+    for n in profile["bars"]:
+        for name, func in series_cases.items():
+            def setup(n=n, func=func):
+                series = _close(n)
+                return lambda: func(series)
+            yield f"indicators.{name}", n, setup
+        for name, func in frame_cases.items():
+            def setup(n=n, func=func):
+                df = make_ohlcv(n, freq="min")
+                return lambda: func(df)
+            yield f"indicators.{name}", n, setup
+
+        def profiled(n=n):
+            series = _close(n)
+
+            def run():
+                with profiling.profile(trace=True):
+                    indicators.moving_average(series, 20)
+            return run
+        yield "indicators.moving_average[profiled]", n, profiled
+
+        def memoized(n=n):
+            series = _close(n)
+
+            def run():
+                # One computation and three hits
+                with memo.memoization():
+                    for _ in range(4):
+                        indicators.moving_average(series, 20)
+            return run
+        yield "indicators.moving_average[memoized]", n, memoized
+
+    for n in profile["symbols"]:
+        for name, func in panel_cases.items():
+            def setup(n=n, func=func):
+                panel = data.build_close_panel(make_universe(n, PANEL_BARS)).to_numpy()
+                return lambda: func(panel)
+            yield f"indicators.{name}", n, setup
+
+
+def analytics_cases(profile):
+    matrix_cases = {
+        "covariance_matrix": lambda r: analytics.covariance_matrix(r),
+        "correlation_matrix[gaps]": lambda r: analytics.correlation_matrix(r),
+        "correlation_matrix[blocked]": lambda r: analytics.correlation_matrix(r, block_size=64),
+        "covariance_matrix[ledoit-wolf]": lambda r: analytics.covariance_matrix(r, shrinkage="ledoit-wolf"),
+        "rolling_correlation": lambda r: analytics.rolling_correlation(r, 60, step=5),
+    }
+    for n in profile["symbols"]:
+        for name, func in matrix_cases.items():
+            def setup(n=n, name=name, func=func):
+                panel = data.build_close_panel(make_universe(n, PANEL_BARS))
+                returns = indicators.compute_returns_panel(panel)
+                if "gaps" in name or "blocked" in name:
+                    mask = np.random.default_rng(0).random(returns.shape) < 0.05
+                    returns = returns.mask(mask)
+                return lambda: func(returns)
+            yield f"analytics.{name}", n, setup
+
+
+def backtest_cases(profile):
+    for n in profile["symbols"]:
+        def grid(n=n):
+            panel = data.build_close_panel(make_universe(n, PANEL_BARS))
+            return lambda: backtest.backtest_ma_crossover(panel, [5, 10, 20], [50, 100, 200], cost=0.0005)
+
+        yield "backtest.backtest_ma_crossover", n, grid
+
+
+def plotting_cases(profile):
+    for n in profile["plot_bars"]:
+        def price(n=n):
+            series = _close(n)
+            return lambda: (plotting.plot_price(series, ma_windows=[20, 60]), plt.close("all"))
+
+        def returns(n=n):
+            series = indicators.compute_returns(_close(n))
+            return lambda: (plotting.plot_returns(series), plt.close("all"))
+
+        def price_full(n=n):
+            series = _close(n)
+            return lambda: (plotting.plot_price(series, ma_windows=[20, 60], downsample=False),
+                            plt.close("all"))
+
+        yield "plotting.plot_price", n, price
+        yield "plotting.plot_price[full]", n, price_full
+        yield "plotting.plot_returns", n, returns
+
+    def charts(n=CHART_SYMBOLS):
+        universe = make_universe(n, PANEL_BARS)
+        out_dir = tempfile.mkdtemp(prefix="stocktoolkit-bench-")
+        return lambda: plotting.render_charts(universe, out_dir, ma_windows=[20, 60])
+
+    yield "plotting.render_charts", CHART_SYMBOLS, charts
+
+
+def parallel_cases(profile):
+    steps = [data.get_close_price, indicators.compute_returns, partial(indicators.rolling_volatility, window=20)]
+    for n in profile["symbols"]:
+        def serial(n=n):
+            universe = make_universe(n, PANEL_BARS)
+            return lambda: parallel.parallel_map(universe, steps, max_workers=1)
+
+        def pool(n=n):
+            universe = make_universe(n, PANEL_BARS)
+            return lambda: parallel.parallel_map(universe, steps)
+
+        yield "parallel.parallel_map[serial]", n, serial
+        yield "parallel.parallel_map[processes]", n, pool
+
+
+def pipeline_cases(profile):
+    for n in profile["symbols"]:
+        def run(n=n):
+            symbols = _symbols(n)
+            fetcher = SyntheticFetcher(latency=profile["latency"])
+            out_dir = tempfile.mkdtemp(prefix="stocktoolkit-bench-")
+            return lambda: pipeline.run_pipeline(
+                symbols, "2023-01-01", "2024-01-01", out_dir, fetcher=fetcher, freq="W", max_workers=32
+            )
+
+        yield "pipeline.run_pipeline", n, run
+
+
+CASE_GROUPS = [
+    download_cases, data_cases, validation_cases, indicator_cases,
+    analytics_cases, backtest_cases, parallel_cases, pipeline_cases, plotting_cases,
+]
+
+
+def measure(setup, repeat):
+    func = setup()
+    func()  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"time": best, "peak_bytes": peak}
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance, min_time):
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        slower = result["time"] > base["time"] * (1 + time_tolerance) and result["time"] - base["time"] > min_time
+        bigger = result["peak_bytes"] > base["peak_bytes"] * (1 + memory_tolerance) + 64 * 1024
+        if slower:
+            regressions.append(f"{key}: time {base['time'] * 1e3:.2f}ms -> {result['time'] * 1e3:.2f}ms")
+        if bigger:
+            regressions.append(
+                f"{key}: peak memory {base['peak_bytes'] / 1e6:.2f}MB -> {result['peak_bytes'] / 1e6:.2f}MB"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed relative memory growth")
+    parser.add_argument("--min-time", type=float, default=0.002, help="ignore slowdowns below this many seconds")
+    args = parser.parse_args(argv)
+
+    profile = PROFILES[args.profile]
+    results = {}
+    print(f"{'case':<52}{'size':>11}{'time':>12}{'peak mem':>12}")
+    for group in CASE_GROUPS:
+        for name, size, setup in group(profile):
+            if args.filter not in name:
+                continue
+            key = f"{args.profile}:{name}[{size}]"
+            results[key] = measure(setup, args.repeat)
+            print(
+                f"{name:<52}{size:>11,}{results[key]['time'] * 1e3:>10.2f}ms"
+                f"{results[key]['peak_bytes'] / 1e6:>10.2f}MB"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance, args.min_time)
+    if regressions:
+        print("\nPERFORMANCE REGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    compared = sum(1 for key in results if key in baseline)
+    print(f"\nNo regressions ({compared} of {len(results)} cases compared with the baseline).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,195 @@
 """
 stocktoolkit
 A simple Python package for stock data analysis.
+
+Public names are loaded lazily on first attribute access (PEP 562), so
+`import stocktoolkit` does not import yfinance or matplotlib; each is
+imported when a download or plot function is first called.
+
+Public functions record their calls while profiling is enabled (see
+profiling.py), and indicator results are reused while memoization is enabled
+(see memo.py); when disabled, each only checks one flag.
 """
 
-from .data import (
-    download_price_data,
-    download_multiple_price_data,
-    get_close_price,
-    resample_price,
-)
-
-from .indicators import (
-    compute_returns,
-    moving_average,
-    rolling_volatility,
-)
-
-from .plotting import (
-    plot_price,
-    plot_returns,
-)
-
-__all__ = [
+import importlib
+from typing import TYPE_CHECKING
+
+# public name -> submodule that defines it
+_LAZY_ATTRS = {
     # data
-    "download_price_data",
-    "download_multiple_price_data",
-    "get_close_price",
-    "resample_price",
+    "download_price_data": "data",
+    "download_multiple_price_data": "data",
+    "get_close_price": "data",
+    "resample_price": "data",
+    "resample_price_multi": "data",
+    "update_price_data": "data",
+    "build_close_panel": "data",
+    "compact_price_frame": "data",
+    "to_long_format": "data",
+    "from_long_format": "data",
+    # aio
+    "download_price_data_async": "aio",
+    "download_multiple_price_data_async": "aio",
+    # providers
+    "LocalFileProvider": "providers",
+    "YFinanceProvider": "providers",
+    "get_default_provider": "providers",
+    "set_default_provider": "providers",
     # indicators
-    "compute_returns",
-    "moving_average",
-    "rolling_volatility",
+    "compute_returns": "indicators",
+    "moving_average": "indicators",
+    "rolling_volatility": "indicators",
+    "compute_returns_panel": "indicators",
+    "moving_average_panel": "indicators",
+    "rolling_volatility_panel": "indicators",
+    "moving_averages": "indicators",
+    "rolling_volatilities": "indicators",
+    "ema": "indicators",
+    "rsi": "indicators",
+    "macd": "indicators",
+    "bollinger_bands": "indicators",
+    "atr": "indicators",
+    "vwap": "indicators",
+    # memo
+    "memoization": "memo",
+    "enable_memoization": "memo",
+    "disable_memoization": "memo",
+    "get_memo": "memo",
+    "IndicatorMemo": "memo",
+    # analytics
+    "covariance_matrix": "analytics",
+    "correlation_matrix": "analytics",
+    "rolling_covariance": "analytics",
+    "rolling_correlation": "analytics",
+    "ledoit_wolf_shrinkage": "analytics",
+    # backtest
+    "backtest_ma_crossover": "backtest",
+    "BacktestResult": "backtest",
+    # parallel
+    "parallel_map": "parallel",
+    # pipeline
+    "run_pipeline": "pipeline",
+    "read_symbols": "pipeline",
+    "PipelineReport": "pipeline",
+    # profiling
+    "profile": "profiling",
+    "enable_profiling": "profiling",
+    "disable_profiling": "profiling",
+    "get_profiler": "profiling",
+    "Profiler": "profiling",
     # plotting
-    "plot_price",
-    "plot_returns",
-]
\ No newline at end of file
+    "plot_price": "plotting",
+    "plot_returns": "plotting",
+    "render_price": "plotting",
+    "render_returns": "plotting",
+    "render_charts": "plotting",
+    # cache
+    "PriceCache": "cache",
+    # store
+    "PriceStore": "store",
+    # concurrency
+    "DownloadReport": "concurrency",
+    # validation
+    "mark_validated": "validation",
+    "trusted_inputs": "validation",
+    "validate_price_universe": "validation",
+    "ValidationReport": "validation",
+    # buffer
+    "PriceBuffer": "buffer",
+    "PriceUpdate": "buffer",
+    # streaming
+    "OnlineReturns": "streaming",
+    "OnlineSMA": "streaming",
+    "OnlineRollingVolatility": "streaming",
+}
+
+_SUBMODULES = {
+    "aio",
+    "analytics",
+    "backtest",
+    "buffer",
+    "cache",
+    "concurrency",
+    "data",
+    "indicators",
+    "memo",
+    "parallel",
+    "pipeline",
+    "plotting",
+    "profiling",
+    "providers",
+    "store",
+    "streaming",
+    "synthetic",
+    "validation",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | _SUBMODULES)
+
+
+if TYPE_CHECKING:
+    from .data import (
+        download_price_data,
+        download_multiple_price_data,
+        get_close_price,
+        resample_price,
+        resample_price_multi,
+        update_price_data,
+        build_close_panel,
+        compact_price_frame,
+        to_long_format,
+        from_long_format,
+    )
+    from .aio import download_price_data_async, download_multiple_price_data_async
+    from .providers import LocalFileProvider, YFinanceProvider, get_default_provider, set_default_provider
+    from .indicators import (
+        compute_returns,
+        moving_average,
+        rolling_volatility,
+        compute_returns_panel,
+        moving_average_panel,
+        rolling_volatility_panel,
+        moving_averages,
+        rolling_volatilities,
+        ema,
+        rsi,
+        macd,
+        bollinger_bands,
+        atr,
+        vwap,
+    )
+    from .memo import memoization, enable_memoization, disable_memoization, get_memo, IndicatorMemo
+    from .analytics import (
+        covariance_matrix,
+        correlation_matrix,
+        rolling_covariance,
+        rolling_correlation,
+        ledoit_wolf_shrinkage,
+    )
+    from .backtest import backtest_ma_crossover, BacktestResult
+    from .parallel import parallel_map
+    from .pipeline import run_pipeline, read_symbols, PipelineReport
+    from .profiling import profile, enable_profiling, disable_profiling, get_profiler, Profiler
+    from .plotting import plot_price, plot_returns, render_price, render_returns, render_charts
+    from .cache import PriceCache
+    from .store import PriceStore
+    from .concurrency import DownloadReport
+    from .validation import mark_validated, trusted_inputs, validate_price_universe, ValidationReport
+    from .buffer import PriceBuffer, PriceUpdate
+    from .streaming import OnlineReturns, OnlineSMA, OnlineRollingVolatility
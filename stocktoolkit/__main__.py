@@ -0,0 +1,12 @@
+"""
+__main__.py
+Batch pipeline command line: python -m stocktoolkit SYMBOLS_FILE --start ... --end ... --out DIR
+(see pipeline.py, or --help for the options).
+"""
+
+import sys
+
+from .pipeline import main
+
+if __name__ == "__main__":
+    sys.exit(main())
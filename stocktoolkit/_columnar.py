@@ -0,0 +1,145 @@
+"""
+_columnar.py
+Internal helpers to store a price DataFrame as one NumPy .npy file per column.
+"""
+
+import errno
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+INDEX_FILE = "index.npy"
+
+# Renames retried when concurrent writers of one entry keep replacing it
+_REPLACE_ATTEMPTS = 10
+
+"""
+Write a DataFrame with a DateTimeIndex into a directory of .npy files.
+The previous content of the directory is replaced.
+-Parameters
+--path: str
+  Target directory, created if missing.
+--df: pd.DataFrame
+  Frame with a DateTimeIndex and numeric columns.
+--extra: dict, optional
+  Additional JSON-serializable metadata stored next to the columns.
+-Returns int: number of bytes written.
+-Raise ValueError if a column has object dtype.
+"""
+def write_frame(path: str, df: pd.DataFrame, extra: dict | None = None) -> int:
+    index = pd.DatetimeIndex(df.index)
+    parent, name = os.path.split(path)
+    os.makedirs(parent, exist_ok=True)
+    # Unique per writer, so concurrent writes of one entry never share it
+    tmp_path = tempfile.mkdtemp(prefix=f"{name}.", suffix=".tmp", dir=parent)
+    try:
+        _write_columns(tmp_path, df, index, extra)
+        nbytes = directory_size(tmp_path)
+        # Move the previous version aside with an atomic rename, retrying if
+        # another writer renamed its own copy into place in between
+        trash = tmp_path[: -len(".tmp")] + ".old.tmp"
+        for attempt in range(1, _REPLACE_ATTEMPTS + 1):
+            try:
+                os.replace(tmp_path, path)
+                break
+            except OSError as exc:
+                # Anything but an existing target (e.g. EXDEV, EACCES, EBUSY) is not retried
+                if exc.errno not in (errno.ENOTEMPTY, errno.EEXIST) or attempt == _REPLACE_ATTEMPTS:
+                    raise
+                try:
+                    os.replace(path, trash)
+                except FileNotFoundError:
+                    pass
+                shutil.rmtree(trash, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return nbytes
+
+
+def _write_columns(tmp_path: str, df: pd.DataFrame, index: pd.DatetimeIndex, extra: dict | None) -> None:
+    columns = []
+    for i, label in enumerate(df.columns):
+        values = df.iloc[:, i].to_numpy()
+        if values.dtype == object:
+            raise ValueError(f"Column {label!r} has object dtype and cannot be stored.")
+        np.save(os.path.join(tmp_path, f"col_{i}.npy"), values, allow_pickle=False)
+        columns.append(list(label) if isinstance(label, tuple) else label)
+
+    np.save(os.path.join(tmp_path, INDEX_FILE), index.asi8, allow_pickle=False)
+    meta = {
+        "columns": columns,
+        "column_names": list(df.columns.names),
+        "multiindex": isinstance(df.columns, pd.MultiIndex),
+        "index_name": index.name,
+        "unit": index.unit,
+        "tz": str(index.tz) if index.tz is not None else None,
+        "extra": extra or {},
+    }
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh)
+
+"""
+Read the metadata written by write_frame.
+-Returns dict, or None if the directory holds no stored frame.
+"""
+def read_meta(path: str) -> dict | None:
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+"""
+Read a DataFrame written by write_frame.
+-Parameters
+--path: str
+--mmap: bool, default False
+  If True, columns are memory-mapped read-only instead of loaded into RAM.
+-Returns pd.DataFrame, or None if the directory holds no stored frame.
+"""
+def read_frame(path: str, mmap: bool = False) -> pd.DataFrame | None:
+    meta = read_meta(path)
+    if meta is None:
+        return None
+    mmap_mode = "r" if mmap else None
+
+    # copy=False keeps a naive index on the mapped pages; localizing a
+    # tz-aware index materializes it (the columns stay mapped either way)
+    raw_index = np.load(os.path.join(path, INDEX_FILE), mmap_mode=mmap_mode)
+    index = pd.DatetimeIndex(
+        np.asarray(raw_index).view(f"datetime64[{meta['unit']}]"),
+        name=meta["index_name"],
+        copy=False,
+    )
+    if meta["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+
+    data = {}
+    for i in range(len(meta["columns"])):
+        # Plain ndarray views: the np.memmap subclass would leak into results
+        data[i] = np.asarray(np.load(os.path.join(path, f"col_{i}.npy"), mmap_mode=mmap_mode))
+    df = pd.DataFrame(data, index=index, copy=False)
+
+    if meta["multiindex"]:
+        df.columns = pd.MultiIndex.from_tuples(
+            [tuple(c) for c in meta["columns"]], names=meta["column_names"]
+        )
+    else:
+        df.columns = pd.Index(meta["columns"], name=meta["column_names"][0])
+    return df
+
+"""
+Total size in bytes of the files in a directory (non-recursive).
+"""
+def directory_size(path: str) -> int:
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                total += entry.stat().st_size
+    return total
@@ -0,0 +1,187 @@
+"""
+aio.py
+Asyncio counterparts of the download functions, for use inside an event loop.
+Fetchers may be coroutine functions; blocking fetchers (such as the default
+yfinance provider) are run in worker threads so the loop is never stalled.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable
+
+import pandas as pd
+
+from .concurrency import DownloadReport, FetchFailure
+from .data import Fetcher, _apply_report, _normalize_price_frame
+from .profiling import _is_async, instrument, traced
+from .providers import get_default_provider
+from .validation import validate_date_string, validate_symbols
+
+# async_fetcher(symbol, start_date, end_date, interval) -> raw OHLCV DataFrame
+AsyncFetcher = Callable[[str, str, str, str], Awaitable[pd.DataFrame]]
+
+"""
+Download price data for a single symbol without blocking the event loop.
+-Parameters
+--symbol: str
+--start_date: str
+  Start date in YYYY-MM-DD format.
+--end_date: str
+  End date in YYYY-MM-DD format.
+--interval: str = "1d"
+--fetcher: callable, optional
+  Async fetcher (coroutine function) or blocking fetcher with the signature
+  fetcher(symbol, start_date, end_date, interval). Blocking fetchers run in a
+  worker thread. Defaults to the default provider (yfinance).
+--timeout: float, optional
+  Seconds allowed for the download. A blocking fetcher's thread cannot be
+  interrupted; it is abandoned and finishes in the background.
+--compact: bool, default False
+  Same as in download_price_data.
+-Return pd.DataFrame: OHLCV data with a DateTimeIndex.
+-Raise ValueError if the date format is invalid or no data is returned.
+-Raise TimeoutError if the download takes longer than timeout.
+"""
+@instrument
+async def download_price_data_async(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1d",
+    fetcher: AsyncFetcher | Fetcher | None = None,
+    timeout: float | None = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    symbol = symbol.strip().upper()
+    interval = interval.strip().lower()
+    validate_date_string(start_date)
+    validate_date_string(end_date)
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive.")
+
+    return await _fetch_price_frame_async(
+        symbol, start_date, end_date, interval, fetcher or get_default_provider(), timeout, compact
+    )
+
+"""
+Download price data for multiple symbols concurrently without blocking the
+event loop. Cancelling the calling task cancels every download in flight.
+-Parameters
+--symbols: list of str
+--start_date: str
+--end_date: str
+--interval: str = "1d"
+--fetcher: callable, optional
+  Same as in download_price_data_async. A blocking fetcher gets its own pool
+  of max_concurrency threads.
+--max_concurrency: int, default 8
+  Maximum number of downloads in flight, enforced with a semaphore.
+--timeout: float, optional
+  Seconds allowed per download attempt.
+--retries: int, default 0
+  Extra attempts per symbol after a failure or timeout.
+--backoff: float, default 0.5
+  Delay before retry k is backoff * 2 ** (k - 1) seconds.
+--report: DownloadReport, optional
+  If given, per-symbol failures are recorded in it and the other symbols are
+  still returned. Otherwise the first failure (in symbol order) is raised.
+--compact: bool, default False
+  Same as in download_price_data.
+-Returns dict[str, pd.DataFrame]: Mapping from symbol -> price DataFrame, in input order.
+"""
+@instrument
+async def download_multiple_price_data_async(
+    symbols: list[str] | tuple[str, ...],
+    start_date: str,
+    end_date: str,
+    interval: str = "1d",
+    fetcher: AsyncFetcher | Fetcher | None = None,
+    max_concurrency: int = 8,
+    timeout: float | None = None,
+    retries: int = 0,
+    backoff: float = 0.5,
+    report: DownloadReport | None = None,
+    compact: bool = False,
+) -> dict[str, pd.DataFrame]:
+    valid_symbols = list(dict.fromkeys(validate_symbols(symbols)))
+    validate_date_string(start_date)
+    validate_date_string(end_date)
+    interval = interval.strip().lower()
+    if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer.")
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive.")
+    if not isinstance(retries, int) or retries < 0:
+        raise ValueError("retries must be a non-negative integer.")
+    if backoff < 0:
+        raise ValueError("backoff must be non-negative.")
+
+    fetcher = fetcher or get_default_provider()
+    # The default executor has only a few threads; size the pool to the limit
+    executor = None if _is_async(fetcher) else ThreadPoolExecutor(
+        max_concurrency, thread_name_prefix="stocktoolkit-fetch"
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    batch_report = DownloadReport()
+    results: dict[str, pd.DataFrame] = {}
+    started = time.monotonic()
+
+    async def download(sym: str) -> None:
+        for attempt in range(1, retries + 2):
+            batch_report.attempts[sym] = attempt
+            try:
+                async with semaphore:
+                    results[sym] = await _fetch_price_frame_async(
+                        sym, start_date, end_date, interval, fetcher, timeout, compact, executor
+                    )
+                return
+            except Exception as exc:  # CancelledError is not an Exception and propagates
+                if attempt > retries:
+                    batch_report.failed[sym] = FetchFailure(sym, exc, attempt)
+                    return
+            # Back off outside the semaphore so other symbols can proceed
+            await asyncio.sleep(backoff * 2 ** (attempt - 1))
+
+    try:
+        await asyncio.gather(*(download(sym) for sym in valid_symbols))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    batch_report.succeeded = [s for s in valid_symbols if s in results]
+    batch_report.elapsed = time.monotonic() - started
+    result = {s: results[s] for s in batch_report.succeeded}
+    return _apply_report(result, batch_report, valid_symbols, report)
+
+
+async def _call_fetcher(fetcher, symbol: str, start_date: str, end_date: str, interval: str, executor):
+    fetcher = traced(fetcher, "aio.fetch", nbytes=True)
+    if _is_async(fetcher):
+        df = await fetcher(symbol, start_date, end_date, interval)
+    else:
+        loop = asyncio.get_running_loop()
+        df = await loop.run_in_executor(executor, fetcher, symbol, start_date, end_date, interval)
+    # e.g. a lambda wrapping a coroutine function
+    if inspect.isawaitable(df):
+        df = await df
+    return df
+
+
+async def _fetch_price_frame_async(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    interval: str,
+    fetcher,
+    timeout: float | None,
+    compact: bool,
+    executor: ThreadPoolExecutor | None = None,
+) -> pd.DataFrame:
+    call = _call_fetcher(fetcher, symbol, start_date, end_date, interval, executor)
+    try:
+        df = await asyncio.wait_for(call, timeout) if timeout is not None else await call
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"Download of {symbol!r} timed out after {timeout}s.") from None
+    return _normalize_price_frame(df, symbol, compact)
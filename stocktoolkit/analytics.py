@@ -0,0 +1,487 @@
+"""
+analytics.py
+Cross-sectional covariance and correlation matrices of return panels, for
+universes of thousands of symbols: full, blocked (tiled to bound memory) and
+rolling, with pairwise handling of missing values and shrinkage.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .profiling import instrument
+from .validation import validate_ma_window, validate_price_panel, validate_price_series
+
+SHRINKAGE_METHODS = ("ledoit-wolf",)
+
+# Rolling accumulators are rebuilt from the window rows after this many windows
+# of incremental updates, so rounding errors do not build up along the series.
+_REANCHOR = 8
+
+"""
+Returns as a float64 (dates x symbols) array with its row and column labels
+(None for an ndarray input). A dict of return series is aligned on the union
+of their dates; dates missing for a symbol become NaN.
+"""
+def _returns_matrix(returns) -> tuple[np.ndarray, pd.Index | None, pd.Index | None]:
+    if isinstance(returns, dict):
+        if not returns:
+            raise ValueError("At least one return series must be provided.")
+        for series in returns.values():
+            validate_price_series(series)
+        returns = pd.concat(returns, axis=1, sort=True)
+    validate_price_panel(returns)
+    if isinstance(returns, pd.DataFrame):
+        return returns.to_numpy(dtype=np.float64), returns.index, returns.columns
+    return np.asarray(returns, dtype=np.float64), None, None
+
+"""
+Center every column on the mean of its valid values and set missing entries
+to 0, so that cross products over all rows only count the valid pairs.
+Centering limits cancellation in the sum-of-products formulas.
+-Returns (centered, valid): valid is the float mask of non-missing entries,
+ or None if nothing is missing.
+"""
+def _centered(x: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+    missing = np.isnan(x)
+    if not missing.any():
+        centered = x - x.mean(axis=0)
+        # Constant columns center to exactly 0, not to rounding noise
+        centered[:, x.min(axis=0) == x.max(axis=0)] = 0.0
+        return centered, None
+    valid = (~missing).astype(np.float64)
+    count = valid.sum(axis=0)
+    center = np.where(missing, 0.0, x).sum(axis=0) / np.maximum(count, 1.0)
+    centered = x - center
+    centered[missing] = 0.0
+    constant = np.where(missing, np.inf, x).min(axis=0) == np.where(missing, -np.inf, x).max(axis=0)
+    centered[:, constant] = 0.0
+    return centered, valid
+
+"""
+Sums over the rows of a pairwise moment block between column sets i and j:
+cross products, pair counts, sums and sums of squares of each side over the
+rows where both values are present. Without missing values the counts are a
+scalar, the sums are None (the columns are centered) and the sums of squares
+are broadcastable vectors.
+-Returns (cross, n, sx, sy, qx, qy); qx and qy are None if not squares.
+"""
+def _moments(xc: np.ndarray, valid: np.ndarray | None, i: slice, j: slice, squares: bool):
+    a, b = xc[:, i], xc[:, j]
+    cross = a.T @ b
+    qx = qy = None
+    if valid is None:
+        n = float(xc.shape[0])
+        sx = sy = None
+        if squares:
+            qx = np.einsum("ij,ij->j", a, a)[:, None]
+            qy = np.einsum("ij,ij->j", b, b)[None, :]
+        return cross, n, sx, sy, qx, qy
+
+    va, vb = valid[:, i], valid[:, j]
+    n = va.T @ vb
+    sx = a.T @ vb
+    sy = va.T @ b
+    if squares:
+        qx = (a * a).T @ vb
+        qy = va.T @ (b * b)
+    return cross, n, sx, sy, qx, qy
+
+"""
+Covariance or correlation from pairwise moment sums (sx and sy None for
+centered sums, and cross then overwritten). Pairs with fewer than min_periods
+observations, and correlations of a constant side, are NaN.
+"""
+def _from_moments(cross, n, sx, sy, qx, qy, ddof: int, min_periods: int, correlation: bool) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = cross if sx is None else cross - sx * sy / n
+        if correlation:
+            varx = qx if sx is None else qx - sx * sx / n
+            vary = qy if sy is None else qy - sy * sy / n
+            # Relative noise floor of the sum-of-squares formula
+            constant = (varx <= qx * 1e-14) | (vary <= qy * 1e-14)
+            out /= np.sqrt(varx)
+            out /= np.sqrt(vary)
+            np.clip(out, -1.0, 1.0, out=out)
+            out[np.broadcast_to(constant, out.shape)] = np.nan
+        else:
+            out /= n - ddof
+    too_few = (n < min_periods) | (n <= ddof)
+    if np.ndim(too_few) == 0:
+        if too_few:
+            out[:] = np.nan
+    else:
+        out[too_few] = np.nan
+    return out
+
+"""
+Set the defined entries of a correlation block's diagonal to exactly 1.
+"""
+def _unit_diagonal(block: np.ndarray) -> None:
+    diagonal = np.diagonal(block)
+    np.fill_diagonal(block, np.where(np.isnan(diagonal), np.nan, 1.0))
+
+"""
+Full pairwise matrix computed in square tiles of block_size columns (one tile
+if None); only the upper tiles are computed and mirrored.
+-Returns (matrix, frobenius): frobenius is the squared Frobenius norm of the
+ cross-product matrix of the centered values (0.0 unless track_frobenius).
+"""
+def _pairwise_matrix(
+    xc: np.ndarray,
+    valid: np.ndarray | None,
+    ddof: int,
+    min_periods: int,
+    correlation: bool,
+    block_size: int | None,
+    track_frobenius: bool = False,
+) -> tuple[np.ndarray, float]:
+    p = xc.shape[1]
+    step = p if block_size is None else block_size
+    out = np.empty((p, p))
+    frobenius = 0.0
+    for i0 in range(0, p, step):
+        i = slice(i0, min(i0 + step, p))
+        for j0 in range(i0, p, step):
+            j = slice(j0, min(j0 + step, p))
+            moments = _moments(xc, valid, i, j, squares=correlation)
+            if track_frobenius:
+                frobenius += np.einsum("ij,ij->", moments[0], moments[0]) * (1 if i0 == j0 else 2)
+            block = _from_moments(*moments, ddof, min_periods, correlation)
+            if correlation and i0 == j0:
+                _unit_diagonal(block)
+            out[i, j] = block
+            if i0 != j0:
+                out[j, i] = block.T
+    return out, frobenius
+
+"""
+Ledoit-Wolf optimal shrinkage intensity towards a scaled identity, from the
+centered values and the squared Frobenius norm of their cross products.
+"""
+def _ledoit_wolf(xc: np.ndarray, frobenius: float) -> float:
+    n, p = xc.shape
+    squares = xc * xc
+    variances = squares.sum(axis=0) / n
+    mu = variances.sum() / p
+    # sum of the entries of squares.T @ squares, without the p x p product
+    beta = np.square(squares.sum(axis=1)).sum()
+    delta = frobenius / n**2
+    beta = (beta / n - delta) / (p * n)
+    delta = (delta - 2.0 * mu * variances.sum() + p * mu**2) / p
+    if delta <= 0:
+        return 0.0
+    return float(np.clip(min(beta, delta) / delta, 0.0, 1.0))
+
+
+def _validate_shrinkage(shrinkage) -> str | float | None:
+    if shrinkage is None:
+        return None
+    if isinstance(shrinkage, str):
+        method = shrinkage.strip().lower()
+        if method not in SHRINKAGE_METHODS:
+            raise ValueError(f"Unsupported shrinkage: {shrinkage!r}. Use one of {SHRINKAGE_METHODS} or a float.")
+        return method
+    if isinstance(shrinkage, (int, float)) and not isinstance(shrinkage, bool) and 0 <= shrinkage <= 1:
+        return float(shrinkage)
+    raise ValueError("shrinkage must be None, 'ledoit-wolf' or a number between 0 and 1.")
+
+
+def _validate_block_size(block_size: int | None) -> None:
+    if block_size is not None and (not isinstance(block_size, int) or block_size <= 0):
+        raise ValueError("block_size must be a positive integer.")
+
+
+def _validate_min_periods(min_periods: int | None, default: int, maximum: int | None = None) -> int:
+    if min_periods is None:
+        return default
+    if not isinstance(min_periods, int) or min_periods <= 0:
+        raise ValueError("min_periods must be a positive integer.")
+    if maximum is not None and min_periods > maximum:
+        raise ValueError("min_periods must not exceed window.")
+    return min_periods
+
+"""
+Covariance matrix (symbols x symbols), possibly shrunk, as an array.
+-Returns (matrix, intensity): intensity is the shrinkage applied (None if none).
+"""
+def _covariance(x, ddof, min_periods, block_size, shrinkage):
+    xc, valid = _centered(x)
+    out, frobenius = _pairwise_matrix(
+        xc, valid, ddof, min_periods, False, block_size, track_frobenius=shrinkage == "ledoit-wolf"
+    )
+    if shrinkage is None:
+        return out, None
+
+    intensity = _ledoit_wolf(xc, frobenius) if shrinkage == "ledoit-wolf" else shrinkage
+    diagonal = np.diagonal(out)
+    mu = np.nanmean(diagonal) if not np.isnan(diagonal).all() else np.nan
+    out *= 1.0 - intensity
+    out[np.diag_indices_from(out)] += intensity * mu
+    return out, intensity
+
+
+def _wrap_matrix(out: np.ndarray, columns: pd.Index | None, intensity: float | None):
+    if columns is None:
+        return out
+    result = pd.DataFrame(out, index=columns, columns=columns)
+    if intensity is not None:
+        result.attrs["shrinkage"] = intensity
+    return result
+
+"""
+Compute the covariance matrix of a returns panel.
+Each pair uses the dates where both symbols have a return (pairwise deletion,
+as DataFrame.cov), computed for all pairs at once with matrix products.
+-Parameters
+--returns : pd.DataFrame, np.ndarray or dict[str, pd.Series]
+  Returns as dates x symbols, or a mapping symbol -> return series (e.g. the
+  output of compute_returns), aligned on the union of their dates.
+--ddof : int, default 1
+--min_periods : int, optional
+  Minimum number of common dates for a pair (default 2); fewer gives NaN.
+--block_size : int, optional
+  Compute the matrix in tiles of block_size x block_size symbols. Temporary
+  memory is then a few tiles instead of a few full matrices; the result is
+  the same.
+--shrinkage : "ledoit-wolf" or float, optional
+  Shrink towards a scaled identity: (1 - d) * S + d * mean(diag(S)) * I, with
+  d the Ledoit-Wolf optimal intensity or the given number in [0, 1]. Missing
+  returns count as the column mean when estimating the intensity. The
+  intensity is stored in result.attrs["shrinkage"] for DataFrame results.
+-Returns pd.DataFrame (symbols x symbols) for DataFrame or dict input, else np.ndarray.
+-Raise ValueError if an argument is invalid.
+"""
+@instrument
+def covariance_matrix(
+    returns: pd.DataFrame | np.ndarray | dict[str, pd.Series],
+    ddof: int = 1,
+    min_periods: int | None = None,
+    block_size: int | None = None,
+    shrinkage: str | float | None = None,
+) -> pd.DataFrame | np.ndarray:
+    x, _, columns = _returns_matrix(returns)
+    min_periods = _validate_min_periods(min_periods, 2)
+    _validate_block_size(block_size)
+    shrinkage = _validate_shrinkage(shrinkage)
+
+    out, intensity = _covariance(x, ddof, min_periods, block_size, shrinkage)
+    return _wrap_matrix(out, columns, intensity)
+
+"""
+Compute the Pearson correlation matrix of a returns panel, with pairwise
+deletion of missing values (as DataFrame.corr).
+-Parameters
+--returns : pd.DataFrame, np.ndarray or dict[str, pd.Series]
+  Same as in covariance_matrix.
+--min_periods : int, optional
+  Minimum number of common dates for a pair (default 2); fewer gives NaN.
+--block_size : int, optional
+  Same as in covariance_matrix.
+--shrinkage : "ledoit-wolf" or float, optional
+  Return the correlation matrix of the shrunk covariance matrix (see
+  covariance_matrix). Each pair is then normalized by the full-sample
+  variances instead of the pairwise ones.
+-Returns pd.DataFrame (symbols x symbols) for DataFrame or dict input, else np.ndarray.
+ Symbols with constant returns have NaN correlations.
+-Raise ValueError if an argument is invalid.
+"""
+@instrument
+def correlation_matrix(
+    returns: pd.DataFrame | np.ndarray | dict[str, pd.Series],
+    min_periods: int | None = None,
+    block_size: int | None = None,
+    shrinkage: str | float | None = None,
+) -> pd.DataFrame | np.ndarray:
+    x, _, columns = _returns_matrix(returns)
+    min_periods = _validate_min_periods(min_periods, 2)
+    _validate_block_size(block_size)
+    shrinkage = _validate_shrinkage(shrinkage)
+
+    if shrinkage is None:
+        xc, valid = _centered(x)
+        out, _ = _pairwise_matrix(xc, valid, 1, min_periods, True, block_size)
+        return _wrap_matrix(out, columns, None)
+
+    out, intensity = _covariance(x, 1, min_periods, block_size, shrinkage)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = 1.0 / np.sqrt(np.diagonal(out))
+    out *= scale[:, None]  # in place: no second symbols x symbols temporary
+    out *= scale[None, :]
+    np.clip(out, -1.0, 1.0, out=out)
+    _unit_diagonal(out)
+    return _wrap_matrix(out, columns, intensity)
+
+"""
+Ledoit-Wolf optimal shrinkage intensity of the covariance matrix of a returns
+panel, between 0 (sample covariance) and 1 (scaled identity).
+-Parameters
+--returns : pd.DataFrame, np.ndarray or dict[str, pd.Series]
+--block_size : int, optional
+  Same as in covariance_matrix.
+-Returns float
+"""
+@instrument
+def ledoit_wolf_shrinkage(
+    returns: pd.DataFrame | np.ndarray | dict[str, pd.Series],
+    block_size: int | None = None,
+) -> float:
+    x, _, _ = _returns_matrix(returns)
+    _validate_block_size(block_size)
+    xc, _ = _centered(x)
+    p = xc.shape[1]
+    step = p if block_size is None else block_size
+    frobenius = 0.0
+    for i0 in range(0, p, step):
+        a = xc[:, i0:i0 + step]
+        for j0 in range(i0, p, step):
+            cross = a.T @ xc[:, j0:j0 + step]
+            frobenius += np.einsum("ij,ij->", cross, cross) * (1 if i0 == j0 else 2)
+    return _ledoit_wolf(xc, frobenius)
+
+"""
+Pairwise moment sums over a sliding window of rows, updated with the rows
+that enter and leave the window instead of being recomputed.
+"""
+class _WindowMoments:
+    def __init__(self, xc: np.ndarray, valid: np.ndarray | None, squares: bool) -> None:
+        self.xc = xc
+        self.valid = valid
+        self.sq = xc * xc if squares or valid is None else None
+        p = xc.shape[1]
+        self.cross = np.zeros((p, p))
+        if valid is None:
+            self.n = 0.0
+            self.sums = np.zeros(p)
+            self.squares = np.zeros(p)
+        else:
+            self.n = np.zeros((p, p))
+            self.sx = np.zeros((p, p))
+            self.qx = np.zeros((p, p)) if squares else None
+
+    def reset(self) -> None:
+        self.cross[:] = 0.0
+        if self.valid is None:
+            self.n = 0.0
+            self.sums[:] = 0.0
+            self.squares[:] = 0.0
+        else:
+            self.n[:] = 0.0
+            self.sx[:] = 0.0
+            if self.qx is not None:
+                self.qx[:] = 0.0
+
+    """
+    Add rows [add_lo, add_hi) and remove rows [remove_lo, remove_hi), with one
+    matrix product per sum.
+    """
+    def update(self, add_lo: int, add_hi: int, remove_lo: int = 0, remove_hi: int = 0) -> None:
+        added, removed = slice(add_lo, add_hi), slice(remove_lo, remove_hi)
+        n_added, n_removed = add_hi - add_lo, remove_hi - remove_lo
+        x = np.concatenate([self.xc[added], self.xc[removed]])
+        sign = np.concatenate([np.ones(n_added), -np.ones(n_removed)])[:, None]
+        if self.valid is None:
+            self.cross += x.T @ (x * sign)
+            self.n += n_added - n_removed
+            self.sums += (x * sign).sum(axis=0)
+            self.squares += (np.concatenate([self.sq[added], self.sq[removed]]) * sign).sum(axis=0)
+            return
+
+        signed_valid = np.concatenate([self.valid[added], -self.valid[removed]])
+        self.cross += x.T @ (x * sign)
+        self.n += np.concatenate([self.valid[added], self.valid[removed]]).T @ signed_valid
+        self.sx += x.T @ signed_valid
+        if self.qx is not None:
+            self.qx += np.concatenate([self.sq[added], self.sq[removed]]).T @ signed_valid
+
+    def matrix(self, ddof: int, min_periods: int, correlation: bool) -> np.ndarray:
+        if self.valid is None:
+            sx, sy = self.sums[:, None], self.sums[None, :]
+            qx, qy = self.squares[:, None], self.squares[None, :]
+        else:
+            sx, sy = self.sx, self.sx.T
+            qx, qy = (self.qx, self.qx.T) if correlation else (None, None)
+        out = _from_moments(self.cross, self.n, sx, sy, qx, qy, ddof, min_periods, correlation)
+        if correlation:
+            _unit_diagonal(out)
+        return out
+
+
+def _rolling_matrices(returns, window, min_periods, step, ddof, correlation):
+    x, index, columns = _returns_matrix(returns)
+    validate_ma_window(window)
+    min_periods = _validate_min_periods(min_periods, window, maximum=window)
+    if not isinstance(step, int) or step <= 0:
+        raise ValueError("step must be a positive integer.")
+
+    xc, valid = _centered(x)
+    n_rows, p = xc.shape
+    rows = range(0, n_rows, step)
+    out = np.empty((len(rows), p, p))
+    moments = _WindowMoments(xc, valid, squares=correlation)
+    lo = hi = 0  # the accumulated rows are [lo, hi)
+    since_anchor = 0
+    for k, row in enumerate(rows):
+        new_hi = row + 1
+        new_lo = max(0, new_hi - window)
+        if new_lo >= hi or since_anchor >= _REANCHOR * window:
+            moments.reset()
+            moments.update(new_lo, new_hi)
+            since_anchor = 0
+        else:
+            moments.update(hi, new_hi, lo, new_lo)
+            since_anchor += new_hi - hi
+        lo, hi = new_lo, new_hi
+        out[k] = moments.matrix(ddof, min_periods, correlation)
+
+    if index is None:
+        return out
+    keys = pd.MultiIndex.from_product([index[::step], columns])
+    return pd.DataFrame(out.reshape(len(rows) * p, p), index=keys, columns=columns)
+
+"""
+Compute rolling covariance matrices of a returns panel, updating the window
+sums with the rows that enter and leave each window instead of recomputing
+them, at a cost per step proportional to step rather than to window.
+-Parameters
+--returns : pd.DataFrame, np.ndarray or dict[str, pd.Series]
+  Same as in covariance_matrix.
+--window : int
+--min_periods : int, optional
+  Minimum number of common dates in the window for a pair (default window).
+--step : int, default 1
+  Evaluate every step-th date only (dates 0, step, 2 * step, ... as in
+  DataFrame.rolling(step=...)).
+--ddof : int, default 1
+-Returns the layout of DataFrame.rolling(window).cov(): a DataFrame with
+ (date, symbol) MultiIndex rows and symbol columns for DataFrame or dict
+ input, else an array of shape (n_evaluated_dates, symbols, symbols).
+-Raise ValueError if an argument is invalid.
+"""
+@instrument
+def rolling_covariance(
+    returns: pd.DataFrame | np.ndarray | dict[str, pd.Series],
+    window: int,
+    min_periods: int | None = None,
+    step: int = 1,
+    ddof: int = 1,
+) -> pd.DataFrame | np.ndarray:
+    return _rolling_matrices(returns, window, min_periods, step, ddof, correlation=False)
+
+"""
+Compute rolling correlation matrices of a returns panel, updated incrementally
+as in rolling_covariance.
+-Parameters
+--returns : pd.DataFrame, np.ndarray or dict[str, pd.Series]
+--window : int
+--min_periods : int, optional
+--step : int, default 1
+-Returns the layout of DataFrame.rolling(window).corr() (see rolling_covariance).
+"""
+@instrument
+def rolling_correlation(
+    returns: pd.DataFrame | np.ndarray | dict[str, pd.Series],
+    window: int,
+    min_periods: int | None = None,
+    step: int = 1,
+) -> pd.DataFrame | np.ndarray:
+    return _rolling_matrices(returns, window, min_periods, step, 1, correlation=True)
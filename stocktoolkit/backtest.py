@@ -0,0 +1,249 @@
+"""
+backtest.py
+Vectorized backtests of moving-average crossover strategies: every (fast,
+slow) window pair is evaluated on every symbol with whole-panel array
+operations instead of per-bar loops.
+"""
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .data import build_close_panel
+from .indicators import _rolling_means, _unique_windows
+from .profiling import instrument
+from .validation import validate_price_panel
+
+BACKTEST_STATS = (
+    "total_return",
+    "annual_return",
+    "annual_volatility",
+    "sharpe",
+    "max_drawdown",
+    "trades",
+    "exposure",
+)
+
+# Window pairs are evaluated in groups whose (pairs, dates, symbols) arrays
+# hold at most this many elements
+_BLOCK_ELEMENTS = 1 << 22
+
+"""
+Outcome of backtest_ma_crossover.
+--params: (fast, slow) window pairs, in evaluation order.
+--stats: one row per (fast, slow, symbol) with the BACKTEST_STATS columns.
+--equity: equity curves (growth of 1.0) of shape (pairs, dates, symbols),
+  or None if keep_equity was False.
+--index: dates of the price panel (None for an array input).
+--symbols: symbols of the price panel (range(n) for an array input).
+"""
+@dataclass
+class BacktestResult:
+    params: list[tuple[int, int]]
+    stats: pd.DataFrame
+    equity: np.ndarray | None
+    index: pd.Index | None
+    symbols: pd.Index
+
+    """
+    Equity curves of one window pair, as a dates x symbols DataFrame (an array
+    for an array input).
+    -Raise KeyError if the pair was not evaluated; ValueError if equity curves were not kept.
+    """
+    def equity_curve(self, fast: int, slow: int) -> pd.DataFrame | np.ndarray:
+        if self.equity is None:
+            raise ValueError("Equity curves were not kept; run the backtest with keep_equity=True.")
+        try:
+            k = self.params.index((fast, slow))
+        except ValueError:
+            raise KeyError(f"Window pair {(fast, slow)} was not evaluated.") from None
+        if self.index is None:
+            return self.equity[k]
+        return pd.DataFrame(self.equity[k], index=self.index, columns=self.symbols)
+
+    """
+    Best window pair of each symbol: the one with the highest value of a
+    statistic (max_drawdown is negative, so its highest is the shallowest).
+    -Returns pd.DataFrame: one stats row per symbol, indexed by (fast, slow, symbol).
+    """
+    def best(self, metric: str = "sharpe") -> pd.DataFrame:
+        if metric not in BACKTEST_STATS:
+            raise ValueError(f"Unsupported metric: {metric!r}. Use one of {BACKTEST_STATS}.")
+        column = self.stats[metric].dropna()
+        return self.stats.loc[column.groupby(level="symbol", sort=False).idxmax().to_list()]
+
+"""
+Backtest moving-average crossover strategies over a grid of window pairs.
+On each bar the position is long (1) while the fast MA is above the slow MA,
+and flat (or short with allow_short) otherwise; positions are taken at the
+close of the signal bar and earn the next bar's return. Bars without both
+MAs are flat, and missing prices earn nothing.
+-Parameters
+--prices : pd.DataFrame, np.ndarray or dict[str, pd.DataFrame]
+  Close prices as dates x symbols, or per-symbol OHLCV frames (e.g. from
+  download_multiple_price_data), aligned with build_close_panel.
+--fast_windows, slow_windows : iterable of int
+  Every pair with fast < slow is evaluated.
+--cost : float, default 0.0
+  Transaction cost as a fraction of the traded notional, charged per unit of
+  position change, e.g. 0.0005 for 5 bps (a long-short flip trades 2 units).
+--allow_short : bool, default False
+--periods_per_year : int, default 252
+  Bars per year, for the annualized statistics.
+--keep_equity : bool, default True
+  Keep the equity curves of every pair and symbol (pairs x dates x symbols floats).
+--max_workers : int, default 1
+  Split the symbols over this many processes (see parallel_map); 1 runs in
+  this process, which is fastest unless the panel is large.
+-Returns BacktestResult
+-Raise ValueError if no pair has fast < slow or an argument is invalid.
+"""
+@instrument
+def backtest_ma_crossover(
+    prices: pd.DataFrame | np.ndarray | dict[str, pd.DataFrame],
+    fast_windows: Iterable[int],
+    slow_windows: Iterable[int],
+    cost: float = 0.0,
+    allow_short: bool = False,
+    periods_per_year: int = 252,
+    keep_equity: bool = True,
+    max_workers: int = 1,
+) -> BacktestResult:
+    if isinstance(prices, dict):
+        prices = build_close_panel(prices)
+    validate_price_panel(prices)
+    fast_windows = _unique_windows(fast_windows)
+    slow_windows = _unique_windows(slow_windows)
+    params = [(f, s) for f in fast_windows for s in slow_windows if f < s]
+    if not params:
+        raise ValueError("At least one (fast, slow) window pair with fast < slow is required.")
+    if cost < 0:
+        raise ValueError("cost must be non-negative.")
+    if not isinstance(periods_per_year, int) or periods_per_year <= 0:
+        raise ValueError("periods_per_year must be a positive integer.")
+    if not isinstance(max_workers, int) or max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+
+    if isinstance(prices, pd.DataFrame):
+        values, index, symbols = prices.to_numpy(dtype=np.float64), prices.index, prices.columns
+    else:
+        values, index = np.asarray(prices, dtype=np.float64), None
+        symbols = pd.RangeIndex(values.shape[1])
+
+    run = partial(
+        _run_grid,
+        params=params,
+        cost=cost,
+        allow_short=allow_short,
+        periods_per_year=periods_per_year,
+        keep_equity=keep_equity,
+    )
+    if max_workers == 1 or values.shape[1] == 1:
+        stats, equity = run(values)
+    else:
+        stats, equity = _run_parallel(values, index, run, max_workers)
+
+    n_params, n_symbols = len(params), values.shape[1]
+    keys = pd.MultiIndex.from_arrays(
+        [
+            np.repeat([f for f, _ in params], n_symbols),
+            np.repeat([s for _, s in params], n_symbols),
+            np.tile(symbols, n_params),
+        ],
+        names=["fast", "slow", "symbol"],
+    )
+    stats = pd.DataFrame(stats.reshape(n_params * n_symbols, -1), index=keys, columns=list(BACKTEST_STATS))
+    stats["trades"] = stats["trades"].astype(np.int64)
+    return BacktestResult(params=params, stats=stats, equity=equity, index=index, symbols=symbols)
+
+"""
+Evaluate every window pair on a (dates x symbols) price array.
+-Returns (stats, equity): arrays of shape (pairs, symbols, stats) and
+ (pairs, dates, symbols) (None unless keep_equity).
+"""
+def _run_grid(
+    values: np.ndarray,
+    params: list[tuple[int, int]],
+    cost: float,
+    allow_short: bool,
+    periods_per_year: int,
+    keep_equity: bool,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    n_dates, n_symbols = values.shape
+    means = _rolling_means(values, sorted({w for pair in params for w in pair}))
+    returns = np.zeros_like(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(values[1:], values[:-1], out=returns[1:])
+    returns[1:] -= 1.0
+    returns[~np.isfinite(returns)] = 0.0
+
+    stats = np.empty((len(params), n_symbols, len(BACKTEST_STATS)))
+    equity = np.empty((len(params), n_dates, n_symbols)) if keep_equity else None
+    group = max(1, _BLOCK_ELEMENTS // max(n_dates * n_symbols, 1))
+    periods = n_dates - 1
+    for k0 in range(0, len(params), group):
+        pairs = params[k0:k0 + group]
+        # Position on bar t is the signal of bar t - 1; NaN MAs compare False (flat)
+        position = np.zeros((len(pairs), n_dates, n_symbols))
+        for j, (f, s) in enumerate(pairs):
+            fast, slow = means[f][:-1], means[s][:-1]
+            np.greater(fast, slow, out=position[j, 1:], casting="unsafe")
+            if allow_short:
+                position[j, 1:] -= np.less(fast, slow)
+
+        out = stats[k0:k0 + len(pairs)]
+        out[..., 6] = np.count_nonzero(position, axis=1) / n_dates
+
+        # Units traded on each bar (flat before the first bar), scaled into costs
+        traded = np.empty_like(position)
+        traded[:, 0] = np.abs(position[:, 0])
+        np.subtract(position[:, 1:], position[:, :-1], out=traded[:, 1:])
+        np.abs(traded, out=traded)
+        out[..., 5] = np.count_nonzero(traded, axis=1)
+        pnl = np.multiply(position, returns, out=position)
+        traded *= cost
+        pnl -= traded
+        curve = equity[k0:k0 + len(pairs)] if keep_equity else np.empty_like(pnl)
+        np.add(pnl, 1.0, out=curve)
+        np.cumprod(curve, axis=1, out=curve)
+
+        final = curve[:, -1]
+        out[..., 0] = final - 1.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[..., 1] = np.where(final > 0, final ** (periods_per_year / max(periods, 1)), 0.0) - 1.0
+            body = pnl[:, 1:]
+            mean = body.sum(axis=1) / periods
+            variance = (np.einsum("kij,kij->kj", body, body) - periods * mean * mean) / (periods - 1)
+            std = np.sqrt(np.maximum(variance, 0.0)) if periods > 1 else np.full(mean.shape, np.nan)
+            out[..., 2] = std * np.sqrt(periods_per_year)
+            out[..., 3] = np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.nan)
+            peak = np.maximum.accumulate(curve, axis=1, out=traded)
+            out[..., 4] = np.divide(curve, peak, out=peak).min(axis=1) - 1.0
+    return stats, equity
+
+
+def _grid_worker(frame: pd.DataFrame, run) -> tuple[np.ndarray, np.ndarray | None]:
+    return run(frame.to_numpy(dtype=np.float64))
+
+"""
+Run the grid on groups of symbols in worker processes with parallel_map.
+"""
+def _run_parallel(values, index, run, max_workers):
+    from .parallel import parallel_map
+
+    n_symbols = values.shape[1]
+    if not isinstance(index, pd.DatetimeIndex):
+        # Transport only: parallel_map ships frames with a DateTimeIndex
+        index = pd.date_range("1970-01-01", periods=len(values), freq="D")
+    bounds = np.linspace(0, n_symbols, min(n_symbols, max_workers) + 1).astype(int)
+    chunks = {
+        str(i): pd.DataFrame(values[:, lo:hi], index=index)
+        for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]))
+    }
+    results = list(parallel_map(chunks, partial(_grid_worker, run=run), max_workers=max_workers, chunk_size=1).values())
+    stats = np.concatenate([r[0] for r in results], axis=1)
+    equity = None if results[0][1] is None else np.concatenate([r[1] for r in results], axis=2)
+    return stats, equity
@@ -0,0 +1,229 @@
+"""
+buffer.py
+Growable OHLCV buffer for appending new bars without copying the whole history.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .validation import validate_price_dataframe
+
+"""
+Append-only price buffer backed by NumPy arrays that grow geometrically, so
+appending k bars costs O(k) amortized instead of a full pd.concat copy.
+-Parameters
+--columns: pd.Index
+  Column labels of the stored frame.
+--dtypes: list of numpy dtypes, one per column.
+--unit: str, default "ns"
+  Resolution of the DateTimeIndex.
+--tz: str, optional
+  Time zone of the DateTimeIndex.
+--capacity: int, default 256
+  Initial number of rows allocated.
+"""
+class PriceBuffer:
+    def __init__(
+        self,
+        columns: pd.Index,
+        dtypes: list,
+        unit: str = "ns",
+        tz: str | None = None,
+        capacity: int = 256,
+    ) -> None:
+        self.columns = pd.Index(columns)
+        self.unit = unit
+        self.tz = tz
+        self._size = 0
+        capacity = max(int(capacity), 1)
+        self._index = np.empty(capacity, dtype=np.int64)
+        self._values = [np.empty(capacity, dtype=dt) for dt in dtypes]
+
+    """
+    Create a buffer holding a copy of an existing price frame.
+    -Parameters
+    --df: pd.DataFrame
+      Frame with a DateTimeIndex sorted in ascending order.
+    --capacity: int, optional
+      Initial capacity, at least len(df). Defaults to twice len(df).
+    """
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, capacity: int | None = None) -> "PriceBuffer":
+        validate_price_dataframe(df)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        index = df.index
+        buffer = cls(
+            df.columns,
+            [df.iloc[:, i].dtype for i in range(df.shape[1])],
+            unit=index.unit,
+            tz=str(index.tz) if index.tz is not None else None,
+            capacity=max(capacity or 2 * len(df), len(df)),
+        )
+        buffer._write(0, index.asi8, [df.iloc[:, i].to_numpy() for i in range(df.shape[1])])
+        buffer._size = len(df)
+        return buffer
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._index)
+
+    """
+    Timestamp of the last stored bar, or None if the buffer is empty.
+    """
+    @property
+    def last_timestamp(self) -> pd.Timestamp | None:
+        if self._size == 0:
+            return None
+        return self._make_index(self._index[self._size - 1:self._size])[0]
+
+    """
+    The stored bars as a DataFrame. Columns are views on the buffer, so bars
+    replaced by later appends are visible in frames returned earlier.
+    """
+    @property
+    def frame(self) -> pd.DataFrame:
+        n = self._size
+        df = pd.DataFrame(
+            {i: values[:n] for i, values in enumerate(self._values)},
+            index=self._make_index(self._index[:n]),
+            copy=False,
+        )
+        df.columns = self.columns
+        return df
+
+    """
+    Append new bars, replacing stored bars that have the same timestamp.
+    Bars older than the last stored bar that are not already stored are ignored.
+    -Parameters
+    --new: pd.DataFrame
+      Bars with a DateTimeIndex and the same columns as the buffer.
+    -Returns (first_changed, appended, replaced): position of the first bar whose
+     values changed (None if nothing changed), number of appended bars and
+     number of replaced bars.
+    """
+    def append(self, new: pd.DataFrame) -> tuple[int | None, int, int]:
+        if new is None or new.empty:
+            return None, 0, 0
+        if not isinstance(new.index, pd.DatetimeIndex):
+            new = new.set_axis(pd.to_datetime(new.index))
+        if not new.index.is_monotonic_increasing:
+            new = new.sort_index()
+        new = new[~new.index.duplicated(keep="last")].reindex(columns=self.columns)
+
+        index = new.index
+        if self.tz is not None:
+            index = index.tz_convert(self.tz) if index.tz is not None else index.tz_localize(self.tz)
+        new_ts = index.as_unit(self.unit).asi8
+        new_values = [new.iloc[:, i].to_numpy() for i in range(new.shape[1])]
+
+        # Split into overlapping bars (<= last stored) and genuinely new bars
+        n = self._size
+        last = self._index[n - 1] if n else None
+        split = int(np.searchsorted(new_ts, last, side="right")) if n else 0
+
+        first_changed = None
+        replaced = 0
+        if split:
+            stored_ts = self._index[:n]
+            pos = np.searchsorted(stored_ts, new_ts[:split])
+            exists = stored_ts[np.minimum(pos, n - 1)] == new_ts[:split]
+            for p, row in zip(pos[exists], np.flatnonzero(exists)):
+                changed = False
+                for col, values in enumerate(self._values):
+                    value = new_values[col][row]
+                    if not _same(values[p], value):
+                        self._ensure_dtype(col, np.asarray([value]))
+                        self._values[col][p] = value
+                        changed = True
+                if changed:
+                    replaced += 1
+                    if first_changed is None:
+                        first_changed = int(p)
+
+        appended = len(new_ts) - split
+        if appended:
+            self._reserve(n + appended)
+            self._write(n, new_ts[split:], [v[split:] for v in new_values])
+            self._size = n + appended
+            if first_changed is None:
+                first_changed = n
+        return first_changed, appended, replaced
+
+    def _make_index(self, raw: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(raw.view(f"datetime64[{self.unit}]"))
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return index
+
+    def _reserve(self, rows: int) -> None:
+        if rows <= self.capacity:
+            return
+        capacity = max(rows, 2 * self.capacity)
+        n = self._size
+        index = np.empty(capacity, dtype=np.int64)
+        index[:n] = self._index[:n]
+        self._index = index
+        for col, values in enumerate(self._values):
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:n] = values[:n]
+            self._values[col] = grown
+
+    def _write(self, start: int, timestamps: np.ndarray, columns: list[np.ndarray]) -> None:
+        stop = start + len(timestamps)
+        self._index[start:stop] = timestamps
+        for col, values in enumerate(columns):
+            self._ensure_dtype(col, values)
+            self._values[col][start:stop] = values
+
+    def _ensure_dtype(self, col: int, values: np.ndarray) -> None:
+        # Integer columns (e.g. Volume) become float if new bars carry NaN, and
+        # compact integer columns are widened when new values do not fit
+        current = self._values[col]
+        if current.dtype.kind not in "iu" or len(values) == 0:
+            return
+        if values.dtype.kind == "f" and np.isnan(values).any():
+            self._values[col] = current.astype(np.float64)
+        elif values.dtype.kind in "iuf":
+            info = np.iinfo(current.dtype)
+            if values.min() < info.min or values.max() > info.max:
+                self._values[col] = current.astype(np.int64)
+
+
+def _same(a, b) -> bool:
+    return a == b or (a != a and b != b)
+
+
+"""
+Result of update_price_data.
+--data: the updated price frame.
+--new_rows: number of bars appended.
+--replaced_rows: number of existing bars whose values changed.
+--recompute_from: position of the first changed bar. Indicator values at this
+  position and later are stale; None if nothing changed.
+"""
+@dataclass
+class PriceUpdate:
+    data: pd.DataFrame
+    new_rows: int
+    replaced_rows: int
+    recompute_from: int | None
+
+    """
+    First input position needed to recompute stale indicator values.
+    -Parameters
+    --lookback: int
+      Number of bars each indicator value depends on, e.g. window for
+      moving_average, 2 for compute_returns, window + 1 for rolling_volatility
+      of returns.
+    -Returns int, or None if nothing needs recomputation.
+    """
+    def input_start(self, lookback: int) -> int | None:
+        if self.recompute_from is None:
+            return None
+        return max(0, self.recompute_from - lookback + 1)
@@ -0,0 +1,227 @@
+"""
+cache.py
+Persistent on-disk price cache for stocktoolkit.
+Stored frames are kept per symbol and interval as columnar .npy files, together
+with the date range they cover, so only missing head/tail gaps are downloaded.
+"""
+
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import pandas as pd
+
+from ._columnar import directory_size, read_frame, read_meta, write_frame, META_FILE
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "stocktoolkit")
+
+"""
+Slice a frame to the half-open date range [start_date, end_date).
+"""
+def _slice_dates(df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    lo = pd.Timestamp(start_date)
+    hi = pd.Timestamp(end_date)
+    if df.index.tz is not None:
+        lo = lo.tz_localize(df.index.tz)
+        hi = hi.tz_localize(df.index.tz)
+    return df.iloc[df.index.searchsorted(lo):df.index.searchsorted(hi)]
+
+"""
+Merge price frames, keeping the most recently fetched bar on duplicate timestamps.
+"""
+def _merge_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames)
+    if not isinstance(merged.index, pd.DatetimeIndex):
+        merged.index = pd.to_datetime(merged.index)
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+"""
+On-disk cache of OHLCV frames, keyed by symbol and interval.
+-Parameters
+--cache_dir: str, optional
+  Root directory. Defaults to $STOCKTOOLKIT_CACHE_DIR or ~/.cache/stocktoolkit.
+--ttl: float, default 3600.0
+  Seconds after a download during which the most recent bars are trusted.
+--recent_days: int, default 2
+  Bars newer than (download date - recent_days) are considered provisional and
+  are downloaded again once the ttl has expired.
+--max_bytes: int, optional
+  Upper bound on the total cache size. Least recently used entries are evicted.
+"""
+class PriceCache:
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        ttl: float = 3600.0,
+        recent_days: int = 2,
+        max_bytes: int | None = None,
+    ) -> None:
+        if ttl < 0:
+            raise ValueError("ttl must be non-negative.")
+        if recent_days < 0:
+            raise ValueError("recent_days must be non-negative.")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+
+        self.cache_dir = cache_dir or os.environ.get("STOCKTOOLKIT_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.recent_days = recent_days
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, symbol: str, interval: str) -> str:
+        safe_symbol = symbol.strip().upper().replace(os.sep, "_")
+        return os.path.join(self.cache_dir, safe_symbol, interval.strip().lower())
+
+    """
+    Return the (start, end) date range that can be served without downloading,
+    or None if nothing is stored. Provisional bars are excluded once stale.
+    """
+    def coverage(self, symbol: str, interval: str = "1d") -> tuple[str, str] | None:
+        meta = read_meta(self._entry_path(symbol, interval))
+        if meta is None:
+            return None
+        extra = meta["extra"]
+        start, end = extra["start"], extra["end"]
+
+        if time.time() - extra["fetched_at"] > self.ttl:
+            fetched_day = datetime.fromtimestamp(extra["fetched_at"]).date()
+            settled = (fetched_day - timedelta(days=self.recent_days)).isoformat()
+            end = min(end, settled)
+        if end < start:
+            end = start
+        return start, end
+
+    """
+    Return price data for [start_date, end_date), downloading only the parts
+    that are not already cached.
+    -Parameters
+    --symbol: str
+    --start_date: str
+      Start date in YYYY-MM-DD format.
+    --end_date: str
+      End date in YYYY-MM-DD format (exclusive, as in yfinance).
+    --interval: str
+    --fetcher: callable
+      fetcher(symbol, start_date, end_date, interval) -> pd.DataFrame
+    -Returns pd.DataFrame, possibly empty if no data exists for the range.
+    """
+    def get(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        fetcher: Callable[[str, str, str, str], pd.DataFrame],
+    ) -> pd.DataFrame:
+        path = self._entry_path(symbol, interval)
+        covered = self.coverage(symbol, interval)
+
+        if start_date >= end_date:
+            return pd.DataFrame()
+
+        stored = read_frame(path) if covered is not None else None
+        if stored is None:
+            gaps = [(start_date, end_date)]
+            new_start, new_end = start_date, end_date
+        else:
+            cov_start, cov_end = covered
+            gaps = []
+            # Keep the stored range contiguous: a disjoint request also fills the hole.
+            if start_date < cov_start:
+                gaps.append((start_date, cov_start))
+            if end_date > cov_end:
+                gaps.append((cov_end, end_date))
+            new_start, new_end = min(start_date, cov_start), max(end_date, cov_end)
+
+        if not gaps:
+            os.utime(os.path.join(path, META_FILE))
+            return _slice_dates(stored, start_date, end_date)
+
+        meta = read_meta(path)
+        fetched_at = meta["extra"]["fetched_at"] if meta else time.time()
+        frames = [stored]
+        for gap_start, gap_end in gaps:
+            is_tail = covered is None or gap_end > covered[1]
+            if is_tail:
+                # The tail gap replaces provisional bars and refreshes fetched_at.
+                if stored is not None:
+                    frames[0] = _slice_dates(stored, new_start, gap_start)
+                fetched_at = time.time()
+            frames.append(fetcher(symbol, gap_start, gap_end, interval))
+
+        merged = _merge_frames(frames)
+        if merged.empty:
+            return merged
+
+        write_frame(path, merged, extra={"start": new_start, "end": new_end, "fetched_at": fetched_at})
+        self._evict(keep=path)
+        return _slice_dates(merged, start_date, end_date)
+
+    """
+    Remove cached data for one symbol (all intervals if interval is None).
+    """
+    def invalidate(self, symbol: str, interval: str | None = None) -> None:
+        if interval is None:
+            target = os.path.dirname(self._entry_path(symbol, "_"))
+        else:
+            target = self._entry_path(symbol, interval)
+        _remove_tree(target)
+
+    """
+    Remove every cached entry.
+    """
+    def clear(self) -> None:
+        for entry in self._entries():
+            _remove_tree(entry)
+
+    """
+    Total size in bytes of all cached entries.
+    """
+    def size(self) -> int:
+        return sum(directory_size(e) for e in self._entries())
+
+    def _entries(self) -> list[str]:
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for symbol_dir in os.scandir(self.cache_dir):
+            if not symbol_dir.is_dir():
+                continue
+            for interval_dir in os.scandir(symbol_dir.path):
+                if interval_dir.is_dir() and not interval_dir.name.endswith(".tmp"):
+                    entries.append(interval_dir.path)
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    last_used = os.path.getmtime(os.path.join(entry, META_FILE))
+                except FileNotFoundError:
+                    continue
+                entries.append((last_used, entry, directory_size(entry)))
+
+            total = sum(size for _, _, size in entries)
+            for _, entry, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if entry == keep:
+                    continue
+                _remove_tree(entry)
+                total -= size
+
+
+def _remove_tree(path: str) -> None:
+    shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,173 @@
+"""
+concurrency.py
+Bounded-concurrency fetch engine used by the multi-symbol download functions.
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+"""
+Thread-safe limiter that spaces calls to at most `rate` per second.
+-Parameters
+--rate: float
+  Maximum number of acquire() calls per second.
+-Raise ValueError if rate is not positive.
+"""
+class RateLimiter:
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    """
+    Block until the next call slot is available.
+    """
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+"""
+Final failure of one symbol after all attempts.
+"""
+@dataclass
+class FetchFailure:
+    symbol: str
+    error: BaseException
+    attempts: int
+
+
+"""
+Outcome of a multi-symbol download (or of a parallel_map computation).
+--succeeded: symbols that returned valid data, in input order.
+--failed: mapping symbol -> FetchFailure for the symbols that did not.
+--attempts: mapping symbol -> number of attempts made.
+--elapsed: wall time of the whole batch in seconds.
+"""
+@dataclass
+class DownloadReport:
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, FetchFailure] = field(default_factory=dict)
+    attempts: dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+"""
+Run fetch_one(symbol) for every symbol on a thread pool.
+-Parameters
+--symbols: list[str]
+--fetch_one: callable
+  fetch_one(symbol) -> result. Any exception counts as a failed attempt.
+--max_workers: int, default 8
+  Maximum number of fetches in flight.
+--timeout: float, optional
+  Seconds allowed per attempt. A timed-out call cannot be interrupted; it is
+  abandoned and its thread is not reused until it returns.
+--retries: int, default 0
+  Extra attempts after a failure or timeout.
+--backoff: float, default 0.5
+  Delay before retry k is backoff * 2 ** (k - 1) seconds.
+--rate_limit: float, optional
+  Maximum number of attempts started per second.
+-Returns (results, report): dict symbol -> result in input order, and a DownloadReport.
+"""
+def fetch_concurrently(
+    symbols: list[str],
+    fetch_one: Callable[[str], Any],
+    max_workers: int = 8,
+    timeout: float | None = None,
+    retries: int = 0,
+    backoff: float = 0.5,
+    rate_limit: float | None = None,
+) -> tuple[dict[str, Any], DownloadReport]:
+    if not isinstance(max_workers, int) or max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive.")
+    if not isinstance(retries, int) or retries < 0:
+        raise ValueError("retries must be a non-negative integer.")
+    if backoff < 0:
+        raise ValueError("backoff must be non-negative.")
+
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    report = DownloadReport()
+    results: dict[str, Any] = {}
+    started = time.monotonic()
+
+    # (ready_time, order, symbol) of attempts waiting to be started
+    ready: list[tuple[float, int, str]] = [(started, i, s) for i, s in enumerate(symbols)]
+    heapq.heapify(ready)
+    order = {s: i for i, s in enumerate(symbols)}
+    pending: dict[Future, tuple[str, float | None]] = {}
+    abandoned: set[Future] = set()
+
+    def attempt_failed(sym: str, error: BaseException, now: float) -> None:
+        attempts = report.attempts[sym]
+        if attempts <= retries:
+            heapq.heappush(ready, (now + backoff * 2 ** (attempts - 1), order[sym], sym))
+        else:
+            report.failed[sym] = FetchFailure(sym, error, attempts)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stocktoolkit-fetch")
+    try:
+        while ready or pending:
+            now = time.monotonic()
+            abandoned = {f for f in abandoned if not f.done()}
+            while ready and ready[0][0] <= now and len(pending) + len(abandoned) < max_workers:
+                _, _, sym = heapq.heappop(ready)
+                if limiter is not None:
+                    limiter.acquire()
+                report.attempts[sym] = report.attempts.get(sym, 0) + 1
+                deadline = time.monotonic() + timeout if timeout is not None else None
+                pending[pool.submit(fetch_one, sym)] = (sym, deadline)
+
+            # Sleep until something finishes, times out, or becomes ready to retry
+            wake_times = [d for _, d in pending.values() if d is not None]
+            if ready and len(pending) + len(abandoned) < max_workers:
+                wake_times.append(ready[0][0])
+            wait_for = max(0.0, min(wake_times) - time.monotonic()) if wake_times else None
+            if pending:
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            else:
+                if abandoned and wait_for is None:
+                    wait(abandoned, return_when=FIRST_COMPLETED)
+                elif wait_for:
+                    time.sleep(wait_for)
+                done = set()
+
+            now = time.monotonic()
+            for fut in done:
+                sym, _ = pending.pop(fut)
+                error = fut.exception()
+                if error is None:
+                    results[sym] = fut.result()
+                else:
+                    attempt_failed(sym, error, now)
+
+            for fut, (sym, deadline) in list(pending.items()):
+                if deadline is not None and now >= deadline:
+                    del pending[fut]
+                    if not fut.cancel():
+                        abandoned.add(fut)
+                    attempt_failed(sym, TimeoutError(f"Download of {sym!r} timed out after {timeout}s."), now)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    report.succeeded = [s for s in symbols if s in results]
+    report.elapsed = time.monotonic() - started
+    return {s: results[s] for s in report.succeeded}, report
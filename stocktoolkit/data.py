@@ -2,10 +2,11 @@
 data.py
 Data downloading and basic preprocessing utilities for stocktoolkit package
 """
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Iterable
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
 
 from .validation import(
     validate_date_string,
@@ -13,6 +14,53 @@ from .validation import(
     validate_symbols,
 )
 
+from .buffer import PriceBuffer, PriceUpdate
+from .concurrency import DownloadReport, FetchFailure, fetch_concurrently
+from .profiling import instrument, traced
+from .providers import batch_fetcher_of, get_default_provider
+from .providers import yfinance_batch_fetcher, yfinance_fetcher  # noqa: F401 (kept importable from data)
+
+if TYPE_CHECKING:
+    from .cache import PriceCache
+
+# fetcher(symbol, start_date, end_date, interval) -> raw OHLCV DataFrame
+Fetcher = Callable[[str, str, str, str], pd.DataFrame]
+
+# batch_fetcher(symbols, start_date, end_date, interval) -> wide frame with
+# (symbol, field) MultiIndex columns
+BatchFetcher = Callable[[list[str], str, str, str], pd.DataFrame]
+
+"""
+Fetch one symbol (through the cache if any), validate it and normalize its index.
+"""
+def _fetch_price_frame(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    interval: str,
+    cache: "PriceCache | None",
+    fetcher: Fetcher,
+    compact: bool = False,
+) -> pd.DataFrame:
+    fetcher = traced(fetcher, "data.fetch", nbytes=True)
+    if cache is not None:
+        df = cache.get(symbol, start_date, end_date, interval, fetcher)
+    else:
+        df = fetcher(symbol, start_date, end_date, interval)
+    return _normalize_price_frame(df, symbol, compact)
+
+"""
+Validate a fetched frame and normalize its index (shared with the async downloads).
+"""
+def _normalize_price_frame(df: pd.DataFrame, symbol: str, compact: bool = False) -> pd.DataFrame:
+    # Validate data is not empty and index is date-like
+    validate_price_dataframe(df, symbol)
+
+    # Ensure index is a DateTimeIndex
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    return compact_price_frame(df) if compact else df
+
 """
 Download price data for a single symbol from yfinance
 -Parameters
@@ -24,14 +72,26 @@ Download price data for a single symbol from yfinance
   End date in YYYY-MM-DD format.
 --interval: str = "1d"
   Data interval, e.g. "1d", "1wk", "1mo".
+--cache: PriceCache, optional
+  If given, previously downloaded bars are read from disk and only the missing
+  date ranges are fetched.
+--fetcher: callable, optional
+  fetcher(symbol, start_date, end_date, interval) -> pd.DataFrame, e.g. a
+  provider from providers.py. Defaults to the default provider (yfinance).
+--compact: bool, default False
+  If True, return float32 prices and integer volumes (see compact_price_frame).
 -Return pd.DataFrame: OHLCV data with a DateTimeIndex.
 -Raise ValueError if the date format is invalid or no data is returned.
 """
+@instrument
 def download_price_data(
         symbol: str,
         start_date: str,
         end_date: str,
         interval: str = "1d",
+        cache: "PriceCache | None" = None,
+        fetcher: Fetcher | None = None,
+        compact: bool = False,
 ) -> pd.DataFrame:
     
     # Deal with uppercase/lowercase
@@ -42,17 +102,10 @@ def download_price_data(
     validate_date_string(start_date)
     validate_date_string(end_date)
 
-    # Download data with yfinance
-    df = yf.download(symbol, start=start_date, end=end_date, interval=interval, auto_adjust=True)
-
-    # Validate data is not empty and index is date-like
-    validate_price_dataframe(df, symbol)
-
-    # Ensure index is a DateTimeIndex
-    if not isinstance(df.index, pd.DatetimeIndex):
-        df.index = pd.to_datetime(df.index)
-    
-    return df
+    # Download data with yfinance (or the given fetcher), through the cache if any
+    return _fetch_price_frame(
+        symbol, start_date, end_date, interval, cache, fetcher or get_default_provider(), compact
+    )
 
 """
 Download price data for multiple symbols from yfinance
@@ -65,13 +118,50 @@ Download price data for multiple symbols from yfinance
   End date in YYYY-MM-DD format.
 --interval: str = "1d"
   Data interval, e.g. "1d", "1wk", "1mo".
+--cache: PriceCache, optional
+  Same as in download_price_data.
+--fetcher: callable, optional
+  Same as in download_price_data.
+--max_workers: int, default 1
+  Number of symbols downloaded concurrently. 1 keeps the serial behavior.
+--timeout: float, optional
+  Seconds allowed per download attempt.
+--retries: int, default 0
+  Extra attempts per symbol after a failure or timeout.
+--backoff: float, default 0.5
+  Delay before retry k is backoff * 2 ** (k - 1) seconds.
+--rate_limit: float, optional
+  Maximum number of downloads started per second.
+--report: DownloadReport, optional
+  If given, per-symbol failures are recorded in it and the other symbols are
+  still returned. Otherwise the first failure (in symbol order) is raised.
+--batch_size: int, optional
+  If given, symbols are downloaded in groups of batch_size with one request
+  per group (see download_price_panel) and split into per-symbol frames.
+--batch_fetcher: callable, optional
+  batch_fetcher(symbols, start_date, end_date, interval) -> wide pd.DataFrame.
+  Defaults to the batch method of fetcher, or of the default provider.
+--compact: bool, default False
+  Same as in download_price_data; each frame is downcast as soon as it arrives.
 -Returns dict[str, pd.DataFrame]: Mapping from symbol -> price DataFrame.
 """
+@instrument
 def download_multiple_price_data(
     symbols: list[str] | tuple[str, ...],
     start_date: str,
     end_date: str,
     interval: str = "1d",
+    cache: "PriceCache | None" = None,
+    fetcher: Fetcher | None = None,
+    max_workers: int = 1,
+    timeout: float | None = None,
+    retries: int = 0,
+    backoff: float = 0.5,
+    rate_limit: float | None = None,
+    report: DownloadReport | None = None,
+    batch_size: int | None = None,
+    batch_fetcher: BatchFetcher | None = None,
+    compact: bool = False,
 ) -> dict[str, pd.DataFrame]:
     
     # Validate data is not empty and index is date-like
@@ -84,17 +174,278 @@ def download_multiple_price_data(
     # Deal with uppercase/lowercase
     interval = interval.lower()
 
-    # Prepare results for return
+    # One request per group of batch_size symbols
+    if batch_size is not None:
+        if cache is not None:
+            raise ValueError("cache is not supported together with batch_size.")
+        result, batch_report = _download_batched(
+            valid_symbols, start_date, end_date, interval, batch_size,
+            batch_fetcher or batch_fetcher_of(fetcher or get_default_provider()),
+            compact=compact, max_workers=max_workers, timeout=timeout,
+            retries=retries, backoff=backoff, rate_limit=rate_limit,
+        )
+        return _apply_report(result, batch_report, valid_symbols, report)
+
+    fetcher = fetcher or get_default_provider()
+
+    # Plain serial loop, aborting on the first failure
+    engine_options = (timeout, rate_limit, report)
+    if max_workers == 1 and retries == 0 and all(o is None for o in engine_options):
+        result: dict[str, pd.DataFrame] = {}
+        for sym in valid_symbols:
+            result[sym] = _fetch_price_frame(sym, start_date, end_date, interval, cache, fetcher, compact)
+        return result
+
+    result, batch_report = fetch_concurrently(
+        valid_symbols,
+        lambda sym: _fetch_price_frame(sym, start_date, end_date, interval, cache, fetcher, compact),
+        max_workers=max_workers,
+        timeout=timeout,
+        retries=retries,
+        backoff=backoff,
+        rate_limit=rate_limit,
+    )
+    return _apply_report(result, batch_report, valid_symbols, report)
+
+"""
+Raise the first failure in symbol order, or copy the outcome into the caller's report.
+"""
+def _apply_report(
+    result: dict[str, pd.DataFrame],
+    batch_report: DownloadReport,
+    symbols: list[str],
+    report: DownloadReport | None,
+) -> dict[str, pd.DataFrame]:
+    if report is None:
+        for sym in symbols:
+            if sym in batch_report.failed:
+                raise batch_report.failed[sym].error
+    else:
+        report.succeeded = batch_report.succeeded
+        report.failed = batch_report.failed
+        report.attempts = batch_report.attempts
+        report.elapsed = batch_report.elapsed
+    return result
+
+"""
+Download groups of symbols with one batch_fetcher call per group and split the
+wide results into per-symbol frames.
+-Returns (result, report) like fetch_concurrently, at symbol level.
+"""
+def _download_batched(
+    symbols: list[str],
+    start_date: str,
+    end_date: str,
+    interval: str,
+    batch_size: int,
+    batch_fetcher: BatchFetcher,
+    compact: bool = False,
+    **engine_options,
+) -> tuple[dict[str, pd.DataFrame], DownloadReport]:
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer.")
+
+    batch_fetcher = traced(batch_fetcher, "data.fetch_batch", nbytes=True)
+    groups = {
+        str(n): symbols[i:i + batch_size]
+        for n, i in enumerate(range(0, len(symbols), batch_size))
+    }
+    wide_frames, group_report = fetch_concurrently(
+        list(groups),
+        lambda key: batch_fetcher(groups[key], start_date, end_date, interval),
+        **engine_options,
+    )
+
+    report = DownloadReport(elapsed=group_report.elapsed)
+    frames: dict[str, pd.DataFrame] = {}
+    for key, group in groups.items():
+        for sym in group:
+            report.attempts[sym] = group_report.attempts.get(key, 0)
+        if key in group_report.failed:
+            failure = group_report.failed[key]
+            for sym in group:
+                report.failed[sym] = FetchFailure(sym, failure.error, failure.attempts)
+            continue
+
+        split = split_price_panel(wide_frames[key], group, drop_missing=True)
+        for sym in group:
+            if sym in split:
+                frames[sym] = compact_price_frame(split[sym]) if compact else split[sym]
+            else:
+                error = ValueError(f"No data returned for symbol: {sym!r}.")
+                report.failed[sym] = FetchFailure(sym, error, report.attempts[sym])
+
+    report.succeeded = [s for s in symbols if s in frames]
+    return {s: frames[s] for s in report.succeeded}, report
+
+"""
+Download price data for many symbols as one wide panel, issuing one request
+per group of batch_size symbols.
+-Parameters
+--symbols: list[str] | tuple[str, ...]
+--start_date: str
+  Start date in YYYY-MM-DD format.
+--end_date: str
+  End date in YYYY-MM-DD format.
+--interval: str = "1d"
+--batch_size: int, default 100
+  Number of symbols per request.
+--batch_fetcher: callable, optional
+  batch_fetcher(symbols, start_date, end_date, interval) -> wide pd.DataFrame.
+  Defaults to the batch method of the default provider (yfinance).
+--max_workers: int, default 1
+  Number of groups downloaded concurrently.
+--compact: bool, default False
+  If True, each group is downcast as in compact_price_frame before joining.
+-Returns pd.DataFrame with (symbol, field) MultiIndex columns and a DateTimeIndex.
+-Raise ValueError if no data is returned for any symbol.
+"""
+@instrument
+def download_price_panel(
+    symbols: list[str] | tuple[str, ...],
+    start_date: str,
+    end_date: str,
+    interval: str = "1d",
+    batch_size: int = 100,
+    batch_fetcher: BatchFetcher | None = None,
+    max_workers: int = 1,
+    compact: bool = False,
+) -> pd.DataFrame:
+    valid_symbols = validate_symbols(symbols)
+    validate_date_string(start_date)
+    validate_date_string(end_date)
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer.")
+
+    batch_fetcher = batch_fetcher or batch_fetcher_of(get_default_provider())
+    batch_fetcher = traced(batch_fetcher, "data.fetch_batch", nbytes=True)
+    groups = [valid_symbols[i:i + batch_size] for i in range(0, len(valid_symbols), batch_size)]
+    wide_frames, group_report = fetch_concurrently(
+        [str(n) for n in range(len(groups))],
+        lambda key: batch_fetcher(groups[int(key)], start_date, end_date, interval.lower()),
+        max_workers=max_workers,
+    )
+    for failure in group_report.failed.values():
+        raise failure.error
+
+    frames = [f for f in wide_frames.values() if f is not None and not f.empty]
+    if not frames:
+        raise ValueError("No data returned.")
+    if compact:
+        frames = [compact_price_frame(f) for f in frames]
+    panel = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
+    validate_price_dataframe(panel)
+    return panel
+
+"""
+Split a wide (symbol, field) panel into per-symbol frames.
+Each frame is a column slice of the panel; rows are only dropped (and data
+copied) when a symbol has no bar on some dates of the shared calendar.
+-Parameters
+--panel: pd.DataFrame
+  Frame with (symbol, field) MultiIndex columns, e.g. from download_price_panel.
+--symbols: iterable of str, optional
+  Symbols to extract. Defaults to every symbol in the panel.
+--drop_missing: bool, default False
+  If True, symbols absent from the panel or with no data are skipped instead
+  of raising ValueError.
+-Returns dict[str, pd.DataFrame]: Mapping from symbol -> price DataFrame.
+"""
+def split_price_panel(
+    panel: pd.DataFrame,
+    symbols: list[str] | tuple[str, ...] | None = None,
+    drop_missing: bool = False,
+) -> dict[str, pd.DataFrame]:
+    if panel is None or panel.empty:
+        if drop_missing:
+            return {}
+        validate_price_dataframe(panel)
+    if not isinstance(panel.columns, pd.MultiIndex):
+        raise ValueError("panel must have (symbol, field) MultiIndex columns.")
+    if not isinstance(panel.index, pd.DatetimeIndex):
+        panel = panel.set_axis(pd.to_datetime(panel.index))
+
+    available = panel.columns.get_level_values(0).unique()
+    wanted = list(available) if symbols is None else validate_symbols(symbols)
+
     result: dict[str, pd.DataFrame] = {}
-    for sym in valid_symbols:
-        df = yf.download(sym, start=start_date, end=end_date, interval=interval, auto_adjust=True)
-        validate_price_dataframe(df, sym)
-        if not isinstance(df.index, pd.DatetimeIndex):
-            df.index = pd.to_datetime(df.index)
-        result[sym] = df
+    for sym in wanted:
+        if sym not in available:
+            if drop_missing:
+                continue
+            raise ValueError(f"No data returned for symbol: {sym!r}.")
+        df = panel.xs(sym, axis=1, level=0)
 
+        # Drop dates on which this symbol has no bar at all
+        has_bar = df.notna().to_numpy().any(axis=1)
+        if not has_bar.all():
+            df = df[has_bar]
+        if df.empty:
+            if drop_missing:
+                continue
+            raise ValueError(f"No data returned for symbol: {sym!r}.")
+        result[sym] = df
     return result
 
+"""
+Fetch only the bars newer than the last bar of an existing price frame and
+append them. The last stored bar is fetched again and replaced if it changed
+(e.g. a still-forming intraday or daily bar).
+-Parameters
+--data: pd.DataFrame or PriceBuffer
+  Existing price data for the symbol. A PriceBuffer is updated in place with
+  amortized O(new bars) cost; a DataFrame is copied once into a new frame.
+--symbol: str
+--interval: str = "1d"
+--end_date: str, optional
+  End date in YYYY-MM-DD format (exclusive). Defaults to tomorrow.
+--fetcher: callable, optional
+  Same as in download_price_data.
+-Returns PriceUpdate with the updated frame, the number of new and replaced
+ bars, and the position from which derived indicators must be recomputed.
+-Raise ValueError if data is empty or end_date is invalid.
+"""
+@instrument
+def update_price_data(
+    data: pd.DataFrame | PriceBuffer,
+    symbol: str,
+    interval: str = "1d",
+    end_date: str | None = None,
+    fetcher: Fetcher | None = None,
+) -> PriceUpdate:
+    symbol = symbol.strip().upper()
+    interval = interval.strip().lower()
+    fetcher = fetcher or get_default_provider()
+
+    if isinstance(data, PriceBuffer):
+        if len(data) == 0:
+            raise ValueError(f"No existing data for symbol: {symbol!r}.")
+        buffer = data
+        last = data.last_timestamp
+    else:
+        validate_price_dataframe(data, symbol)
+        buffer = None
+        last = data.index.max()
+
+    if end_date is None:
+        end_date = (datetime.now().date() + timedelta(days=1)).isoformat()
+    validate_date_string(end_date)
+    start_date = last.strftime("%Y-%m-%d")
+
+    unchanged = PriceUpdate(data.frame if buffer is not None else data, 0, 0, None)
+    if start_date >= end_date:
+        return unchanged
+    new = traced(fetcher, "data.fetch", nbytes=True)(symbol, start_date, end_date, interval)
+    if new is None or new.empty:
+        return unchanged
+
+    if buffer is None:
+        buffer = PriceBuffer.from_frame(data, capacity=len(data) + len(new))
+    first_changed, appended, replaced = buffer.append(new)
+    if first_changed is None and not isinstance(data, PriceBuffer):
+        return unchanged
+    return PriceUpdate(buffer.frame, appended, replaced, first_changed)
+
 """
 Extract a clean close-price series from a price dataframe.
 -Parameters
@@ -106,26 +457,32 @@ Extract a clean close-price series from a price dataframe.
 --pd.Series: close price series with DateTimeIndex.
 -Raises ValueError if neither 'Adj Close' nor 'Close' is available.
 """
+@instrument
 def get_close_price(df: pd.DataFrame, use_adjusted: bool = True) -> pd.Series:
     
     validate_price_dataframe(df)
 
-    # Handle MultiIndex columns from yfinance (when downloading single symbol)
+    # Handle MultiIndex columns from yfinance (when downloading single symbol):
+    # the first level holds the price name, select it without copying the frame
     if isinstance(df.columns, pd.MultiIndex):
-        # Flatten the columns by taking the first level (Price name)
-        df_flat = df.copy()
-        df_flat.columns = df_flat.columns.get_level_values(0)
-        df = df_flat
-    
+        fields = df.columns.get_level_values(0)
+    else:
+        fields = df.columns
+
     # Try to get Adjusted Close or Close
-    if use_adjusted and "Adj Close" in df.columns:
-        series = df["Adj Close"]
-    elif "Close" in df.columns:
-        series = df["Close"]
+    if use_adjusted and "Adj Close" in fields:
+        column = "Adj Close"
+    elif "Close" in fields:
+        column = "Close"
     else:
         raise ValueError(
             "DataFrame must contain either 'Adj Close' or 'Close' column."
         )
+
+    if isinstance(df.columns, pd.MultiIndex):
+        series = df.iloc[:, list(fields).index(column)]
+    else:
+        series = df[column]
     
     # Ensure it's a proper series with DateTimeIndex
     if not isinstance(series.index, pd.DatetimeIndex):
@@ -136,6 +493,158 @@ def get_close_price(df: pd.DataFrame, use_adjusted: bool = True) -> pd.Series:
 
     return series
 
+"""
+Downcast a price frame to a compact representation: float32 prices and the
+smallest integer type (int32, uint32 or int64) that holds the volumes. The
+DateTimeIndex is kept as is. Works on flat OHLCV frames and on panels with
+(symbol, field) or (field, ticker) MultiIndex columns.
+Precision: float32 keeps about 7 significant digits, i.e. a relative rounding
+error of at most 6e-8 (0.006 cents on a $1,000 price), well below a price tick.
+Returns computed from compact prices carry an absolute error of about 1e-7,
+which is negligible for daily returns but leaves only ~3 significant digits
+in minute returns of ~1e-4; compute_returns and the indicators still work in
+float64. Volumes containing NaN are kept as float64 so they stay exact.
+-Parameters
+--df: pd.DataFrame
+-Returns pd.DataFrame with the same index and columns (df is not modified).
+"""
+@instrument
+def compact_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+    validate_price_dataframe(df)
+
+    columns = {
+        i: _compact_values(field, df.iloc[:, i].to_numpy())
+        for i, field in enumerate(_column_fields(df.columns))
+    }
+    compact = pd.DataFrame(columns, index=df.index, copy=False)
+    compact.columns = df.columns
+    return compact
+
+
+def _compact_values(field, values: np.ndarray) -> np.ndarray:
+    if str(field).lower() == "volume":
+        return _compact_volume(values)
+    if values.dtype.kind == "f" and values.dtype.itemsize > 4:
+        return values.astype(np.float32)
+    return values
+
+
+def _compact_volume(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == "f":
+        if len(values) == 0 or not np.isfinite(values).all() or (values != np.round(values)).any():
+            return values
+    elif values.dtype.kind not in "iu":
+        return values
+    if len(values) == 0:
+        return values.astype(np.int32)
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int32, np.uint32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return values.astype(dtype)
+    return values
+
+"""
+Build a wide close-price panel (dates x symbols) from per-symbol price frames,
+e.g. the dict returned by download_multiple_price_data.
+-Parameters
+--data: dict[str, pd.DataFrame]
+  Mapping from symbol -> OHLCV DataFrame.
+--how: str, default "outer"
+  Calendar alignment: "outer" keeps every date seen for any symbol (missing
+  prices are NaN), "inner" keeps only the dates shared by all symbols.
+--use_adjusted: bool, default True
+  Passed to get_close_price.
+--ffill: bool, default False
+  If True, forward-fill missing prices after alignment.
+-Returns pd.DataFrame with one column per symbol and a sorted DateTimeIndex.
+-Raise ValueError if data is empty or how is not supported.
+"""
+@instrument
+def build_close_panel(
+    data: dict[str, pd.DataFrame],
+    how: str = "outer",
+    use_adjusted: bool = True,
+    ffill: bool = False,
+) -> pd.DataFrame:
+    if not data:
+        raise ValueError("At least one price DataFrame must be provided.")
+    how = how.strip().lower()
+    if how not in ("outer", "inner"):
+        raise ValueError(f"Unsupported 'how' value: {how!r}. Use 'outer' or 'inner'.")
+
+    closes = [get_close_price(df, use_adjusted=use_adjusted) for df in data.values()]
+    panel = pd.concat(closes, axis=1, join=how, keys=list(data), sort=True)
+    if ffill:
+        panel = panel.ffill()
+    return panel
+
+"""
+Stack per-symbol price frames into one long frame with Date and Symbol columns
+followed by one column per field (the union of the fields of all frames).
+-Parameters
+--data: dict[str, pd.DataFrame]
+  Mapping symbol -> price DataFrame, e.g. from download_multiple_price_data.
+--categorical: bool, default True
+  Store Symbol as a pandas Categorical: one small integer code per row
+  instead of a Python string object.
+--compact: bool, default False
+  Also downcast the fields as compact_price_frame does.
+-Returns pd.DataFrame with a RangeIndex.
+"""
+@instrument
+def to_long_format(
+    data: dict[str, pd.DataFrame],
+    categorical: bool = True,
+    compact: bool = False,
+) -> pd.DataFrame:
+    if not data:
+        raise ValueError("At least one price DataFrame must be provided.")
+    for symbol, df in data.items():
+        validate_price_dataframe(df, symbol)
+
+    # Field label -> column position, per symbol
+    positions = [
+        {field: i for i, field in enumerate(_column_fields(df.columns))}
+        for df in data.values()
+    ]
+    fields = list(dict.fromkeys(f for pos in positions for f in pos))
+    lengths = np.array([len(df) for df in data.values()])
+
+    frames = list(data.values())
+    dates = frames[0].index.append([df.index for df in frames[1:]])
+    codes = np.repeat(np.arange(len(data)), lengths)
+    if categorical:
+        symbols = pd.Categorical.from_codes(codes, categories=list(data))
+    else:
+        symbols = np.asarray(list(data), dtype=object)[codes]
+
+    columns = {"Date": dates, "Symbol": symbols}
+    for field in fields:
+        parts = [
+            df.iloc[:, pos[field]].to_numpy() if field in pos else np.full(len(df), np.nan)
+            for df, pos in zip(frames, positions)
+        ]
+        values = np.concatenate(parts)
+        columns[field] = _compact_values(field, values) if compact else values
+
+    return pd.DataFrame(columns)
+
+"""
+Split a long frame from to_long_format back into per-symbol frames indexed by Date.
+-Returns dict[str, pd.DataFrame] in order of first appearance.
+"""
+@instrument
+def from_long_format(long: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    if not {"Date", "Symbol"} <= set(long.columns):
+        raise ValueError("Long price frame must contain 'Date' and 'Symbol' columns.")
+    result = {}
+    for symbol, group in long.groupby("Symbol", sort=False, observed=True):
+        df = group.drop(columns="Symbol").set_index("Date")
+        df.index.name = "Date"
+        result[str(symbol)] = df
+    return result
+
 """
 Resample
 -Parameters
@@ -145,9 +654,13 @@ Resample
   Resample frequency, e.g. "W" (weekly), "M" (month-end).
 --how: str
   Default value: "last"
-  Options: "last", "first", "mean"
+  Options: "last", "first", "mean", "ohlc"
+  "ohlc" builds proper bars: Open first, High max, Low min, Close / Adj Close
+  last and Volume sum (other columns last), in one grouping pass. Works on
+  flat columns and on (symbol, field) or (field, ticker) panels.
 -Returns resampled
 """
+@instrument
 def resample_price(
     df: pd.DataFrame,
     freq: str = "W",
@@ -157,10 +670,14 @@ def resample_price(
     validate_price_dataframe(df)
 
     # Deal with uppercase/lowercase
-    freq = freq.strip().upper()
+    freq = _normalize_freq(freq)
     how = how.strip().lower()
 
-    if how == "last":
+    if how == "ohlc":
+        df = _sorted(df)
+        labels, counts = _bin_counts(df.index, freq)
+        resampled = _resample_bars(df, labels, counts, _bar_rules(df.columns))
+    elif how == "last":
         resampled = df.resample(freq).last()
     elif how =="first":
         resampled = df.resample(freq).first()
@@ -168,8 +685,198 @@ def resample_price(
         resampled = df.resample(freq).mean()
     else:
         raise ValueError(
-            f"Unsupported 'how' value: {how!r}. Use 'last', 'first', or 'mean'."
+            f"Unsupported 'how' value: {how!r}. Use 'last', 'first', 'mean' or 'ohlc'."
         )
 
     return resampled
-    
\ No newline at end of file
+
+"""
+Resample to several frequencies at once. The data columns are grouped only
+once: each coarser frequency is built from the finest result already computed
+whose bars nest inside its bars (e.g. quarters from months), falling back to
+the original data otherwise (e.g. months from weeks).
+-Parameters
+--df: pd.DataFrame
+  Single-symbol OHLCV frame or a panel such as download_price_panel returns.
+--freqs: iterable of str, default ("W", "ME", "QE")
+--how: str, default "ohlc"
+  Same options as resample_price. "mean" cannot be composed and is computed
+  from df for every frequency.
+-Returns dict[str, pd.DataFrame] keyed by the frequencies as given.
+"""
+@instrument
+def resample_price_multi(
+    df: pd.DataFrame,
+    freqs: Iterable[str] = ("W", "ME", "QE"),
+    how: str = "ohlc",
+) -> dict[str, pd.DataFrame]:
+    validate_price_dataframe(df)
+    freqs = list(dict.fromkeys(freqs))
+    if not freqs:
+        raise ValueError("At least one frequency must be provided.")
+    how = how.strip().lower()
+    if how == "mean":
+        return {f: resample_price(df, f, how) for f in freqs}
+    if how == "ohlc":
+        rules = _bar_rules(df.columns)
+    elif how in ("first", "last"):
+        rules = [how] * df.shape[1]
+    else:
+        raise ValueError(
+            f"Unsupported 'how' value: {how!r}. Use 'last', 'first', 'mean' or 'ohlc'."
+        )
+
+    df = _sorted(df)
+    # Bin boundaries only need the timestamps; finest frequency first
+    bins = {f: _bin_counts(df.index, _normalize_freq(f)) for f in freqs}
+    order = sorted(freqs, key=lambda f: -len(bins[f][0]))
+
+    results: dict[str, pd.DataFrame] = {}
+    for i, f in enumerate(order):
+        labels, counts = bins[f]
+        ends = np.cumsum(counts)
+        source, source_counts = df, counts
+        for finer in reversed(order[:i]):
+            finer_counts = bins[finer][1]
+            finer_ends = np.cumsum(finer_counts)[finer_counts > 0]
+            # Nested iff every target boundary is also a boundary of the finer bars
+            if np.isin(ends[ends > 0], finer_ends).all():
+                bars_before = np.searchsorted(finer_ends, ends, side="right")
+                source = results[finer][finer_counts > 0]
+                source_counts = np.diff(bars_before, prepend=0)
+                break
+        results[f] = _resample_bars(source, labels, source_counts, rules)
+
+    return {f: results[f] for f in freqs}
+
+# Column field -> aggregation used for OHLCV bars; other columns use "last"
+_BAR_FIELD_RULES = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "adj close": "last",
+    "volume": "sum",
+}
+
+
+def _bar_rules(columns: pd.Index) -> list[str]:
+    return [_BAR_FIELD_RULES.get(str(f).lower(), "last") for f in _column_fields(columns)]
+
+
+# Field label (Open, Close, Volume, ...) of each column; for MultiIndex columns
+# the first level holding known field names, as in (symbol, field) or (field, ticker)
+def _column_fields(columns: pd.Index) -> pd.Index:
+    if isinstance(columns, pd.MultiIndex):
+        for level in range(columns.nlevels):
+            values = columns.get_level_values(level)
+            if any(str(v).lower() in _BAR_FIELD_RULES for v in values.unique()):
+                return values
+        return columns.get_level_values(-1)
+    return columns
+
+
+# Upper-case aliases ("w", "me") as before, but keep lower-case-only ones ("h", "min")
+def _normalize_freq(freq: str) -> str:
+    freq = freq.strip()
+    try:
+        pd.tseries.frequencies.to_offset(freq.upper())
+        return freq.upper()
+    except ValueError:
+        return freq
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df if df.index.is_monotonic_increasing else df.sort_index(kind="stable")
+
+
+# Bin labels (empty bins included) and number of rows in each bin, for a sorted index
+def _bin_counts(index: pd.DatetimeIndex, freq: str) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    counts = pd.Series(np.ones(len(index), dtype=np.int64), index=index).resample(freq).sum()
+    return counts.index, counts.to_numpy()
+
+"""
+Aggregate consecutive rows of a sorted frame into bins, one vectorized
+reduction per rule over all columns sharing it. NaN values are skipped, as in
+pandas groupby; empty bins give NaN (0 for "sum").
+-Parameters
+--df: pd.DataFrame
+--labels: pd.DatetimeIndex
+  Index of the result, one label per bin.
+--counts: np.ndarray
+  Number of rows of df in each bin; sums to len(df).
+--rules: list of "first", "last", "max", "min" or "sum", one per column.
+"""
+def _resample_bars(
+    df: pd.DataFrame,
+    labels: pd.DatetimeIndex,
+    counts: np.ndarray,
+    rules: list[str],
+) -> pd.DataFrame:
+    nonempty = counts > 0
+    ends = np.cumsum(counts[nonempty])
+    starts = ends - counts[nonempty]
+
+    columns: dict[int, np.ndarray] = {}
+    # Columns sharing a rule and a dtype are reduced together as one 2-D block
+    groups: dict[tuple, list[int]] = {}
+    for i, (rule, dtype) in enumerate(zip(rules, df.dtypes)):
+        groups.setdefault((rule, dtype), []).append(i)
+    for (rule, _), positions in groups.items():
+        reduced = _reduce_bins(df.iloc[:, positions].to_numpy(), starts, ends, rule)
+        if nonempty.all():
+            out = reduced
+        elif rule == "sum":
+            out = np.zeros((len(labels), len(positions)), dtype=reduced.dtype)
+            out[nonempty] = reduced
+        else:
+            dtype = reduced.dtype if reduced.dtype.kind in "fcO" else np.float64
+            out = np.full((len(labels), len(positions)), np.nan, dtype=dtype)
+            out[nonempty] = reduced
+        for j, col in enumerate(positions):
+            columns[col] = out[:, j]
+
+    result = pd.DataFrame(
+        {col: columns[col] for col in range(df.shape[1])},
+        index=labels,
+        copy=False,
+    )
+    result.columns = df.columns
+    return result
+
+
+# One row per non-empty bin [starts[i], ends[i]) of a 2-D block
+def _reduce_bins(block: np.ndarray, starts: np.ndarray, ends: np.ndarray, rule: str) -> np.ndarray:
+    if block.dtype.kind in "iub":
+        # Integers cannot be missing
+        if rule == "sum":
+            return np.add.reduceat(block, starts, axis=0)
+        if rule == "max":
+            return np.maximum.reduceat(block, starts, axis=0)
+        if rule == "min":
+            return np.minimum.reduceat(block, starts, axis=0)
+        return block[starts if rule == "first" else ends - 1]
+
+    if rule == "sum":
+        return np.add.reduceat(np.where(pd.isna(block), 0, block), starts, axis=0)
+    if rule == "max":
+        return np.fmax.reduceat(block, starts, axis=0)
+    if rule == "min":
+        return np.fmin.reduceat(block, starts, axis=0)
+
+    # first / last valid value: propagate the position of the nearest valid
+    # row forwards (last) or backwards (first), then read it at the bin edge
+    n = len(block)
+    rows = np.arange(n)[:, None]
+    valid = ~pd.isna(block)
+    if rule == "last":
+        pos = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)[ends - 1]
+        found = pos >= starts[:, None]
+    else:
+        pos = np.minimum.accumulate(np.where(valid, rows, n)[::-1], axis=0)[::-1][starts]
+        found = pos < ends[:, None]
+    values = np.take_along_axis(block, np.clip(pos, 0, n - 1), axis=0)
+    if not found.all():
+        values = values.astype(np.result_type(values.dtype, np.float64), copy=False)
+        values[~found] = np.nan
+    return values
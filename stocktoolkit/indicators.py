@@ -1,12 +1,22 @@
 """
 indicators.py
 Return and technical indicator calculations for stocktoolkit.
+Results are reused for repeated calls while memoization is enabled (see memo.py).
 """
 
+from typing import Iterable
+
 import numpy as np
 import pandas as pd
 
-from .validation import validate_price_series, validate_ma_window
+from .memo import memoize
+from .profiling import instrument
+from .validation import (
+    validate_price_series,
+    validate_ma_window,
+    validate_price_panel,
+    validate_price_dataframe,
+)
 
 """
 Compute simple or log returns from a price series.
@@ -17,6 +27,8 @@ Compute simple or log returns from a price series.
 -Returns pd.Series
  Return series aligned with the original index.
 """
+@instrument
+@memoize
 def compute_returns(price_series: pd.Series, method: str = "simple") -> pd.Series:
     validate_price_series(price_series)
     
@@ -36,6 +48,8 @@ Compute a simple moving average over a given window.
 --window : int
 -Returns pd.Series
 """
+@instrument
+@memoize
 def moving_average(price_series: pd.Series, window: int) -> pd.Series:
     validate_price_series(price_series)
     validate_ma_window(window)
@@ -52,6 +66,8 @@ Compute rolling volatility (standard deviation) of returns.
 -Returns
 --pd.Series
 """
+@instrument
+@memoize
 def rolling_volatility(return_series: pd.Series, window: int) -> pd.Series:
     validate_price_series(return_series)
     validate_ma_window(window)
@@ -59,4 +75,445 @@ def rolling_volatility(return_series: pd.Series, window: int) -> pd.Series:
     return return_series.rolling(window=window).std()
 
 
+# Prefix sums restart every _ANCHOR_BLOCK rows; block offsets are accumulated in
+# extended precision, so the rounding error of a window sum does not grow with
+# the length of the series.
+_ANCHOR_BLOCK = 4096
+
+"""
+Prefix sums of a 2-D array as a (high, low) pair of float64 arrays.
+The high part holds the block offsets (accumulated in extended precision and
+constant within a block), the low part the remainder and the in-block sums,
+whose magnitude is bounded by the block length.
+-Returns (high, low), both of shape (n + 1, m); high[k] + low[k] is the sum of rows [0, k).
+"""
+def _blocked_prefix_sums(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n, m = x.shape
+    low = np.zeros((n + 1, m))
+    n_blocks = n // _ANCHOR_BLOCK + 1
+    totals = np.zeros((n_blocks, m))
+    for b in range(n_blocks):
+        start = b * _ANCHOR_BLOCK
+        stop = min(start + _ANCHOR_BLOCK, n + 1)
+        # prefix position k covers rows [start, k); position start is 0 by construction
+        if stop - 1 > start:
+            np.cumsum(x[start:stop - 1], axis=0, out=low[start + 1:stop])
+        if b + 1 < n_blocks:
+            totals[b + 1] = low[stop - 1] + x[stop - 1]
+
+    offsets = np.cumsum(totals, axis=0, dtype=np.longdouble)
+    offsets_high = offsets.astype(np.float64)
+    offsets_low = (offsets - offsets_high).astype(np.float64)
+    repeats = np.full(n_blocks, _ANCHOR_BLOCK)
+    repeats[-1] = n + 1 - (n_blocks - 1) * _ANCHOR_BLOCK
+    high = np.repeat(offsets_high, repeats, axis=0)
+    low += np.repeat(offsets_low, repeats, axis=0)
+    return high, low
+
+"""
+Write the window sums S[i + window] - S[i] of blocked prefix sums into out.
+"""
+def _window_difference(prefix: tuple[np.ndarray, np.ndarray], window: int, out: np.ndarray) -> np.ndarray:
+    high, low = prefix
+    np.subtract(high[window:], high[:-window], out=out)
+    out += low[window:]
+    out -= low[:-window]
+    return out
+
+"""
+Shared precomputation for rolling statistics over several window lengths.
+Columns are centered on their mean first to limit cancellation error.
+-Returns (center, prefix, prefix_sq, missing_prefix): blocked prefix sums of
+ the centered values (and of their squares if squares=True, else None), and
+ prefix counts of missing values (None if nothing is missing).
+"""
+def _rolling_prefix(values: np.ndarray, squares: bool = False):
+    x = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(x)
+    if missing.any():
+        valid_count = (~missing).sum(axis=0)
+        center = np.where(missing, 0.0, x).sum(axis=0) / np.maximum(valid_count, 1)
+        centered = np.where(missing, 0.0, x - center)
+        missing_prefix = np.zeros((x.shape[0] + 1, x.shape[1]), dtype=np.int64)
+        np.cumsum(missing, axis=0, out=missing_prefix[1:])
+    else:
+        center = x.mean(axis=0)
+        centered = x - center
+        missing_prefix = None
+
+    prefix = _blocked_prefix_sums(centered)
+    prefix_sq = _blocked_prefix_sums(centered * centered) if squares else None
+    return center, prefix, prefix_sq, missing_prefix
+
+"""
+Set rows of out to NaN where the window contains a missing value.
+"""
+def _mask_missing(out: np.ndarray, missing_prefix: np.ndarray | None, window: int) -> None:
+    if missing_prefix is not None:
+        out[(missing_prefix[window:] - missing_prefix[:-window]) > 0] = np.nan
+
+"""
+Rolling means for several windows sharing one prefix-sum pass.
+-Returns dict window -> (n, m) array, NaN until a full window of non-missing values.
+"""
+def _rolling_means(values: np.ndarray, windows: list[int]) -> dict[int, np.ndarray]:
+    center, prefix, _, missing_prefix = _rolling_prefix(values)
+    n = values.shape[0]
+    result = {}
+    for window in windows:
+        out = np.full(values.shape, np.nan)
+        if window <= n:
+            body = _window_difference(prefix, window, out[window - 1:])
+            body /= window
+            body += center
+            _mask_missing(body, missing_prefix, window)
+        result[window] = out
+    return result
+
+"""
+Rolling standard deviations (ddof=1) for several windows sharing one prefix-sum
+pass. Variances are clipped at zero, and windows whose values are all equal
+give exactly zero instead of rounding noise.
+"""
+def _rolling_stds(values: np.ndarray, windows: list[int]) -> dict[int, np.ndarray]:
+    _, prefix, prefix_sq, missing_prefix = _rolling_prefix(values, squares=True)
+    n = values.shape[0]
+    result = {}
+    for window in windows:
+        out = np.full(values.shape, np.nan)
+        if 1 < window <= n:
+            sums = _window_difference(prefix, window, np.empty((n - window + 1, values.shape[1])))
+            body = _window_difference(prefix_sq, window, out[window - 1:])
+            # Relative noise floor of the sum-of-squares formula
+            noise = body * 1e-14
+            sums *= sums
+            sums /= window
+            body -= sums
+            body[body <= noise] = 0.0
+            body /= window - 1
+            np.sqrt(body, out=body)
+            _mask_missing(body, missing_prefix, window)
+        result[window] = out
+    return result
+
+"""
+Compute simple or log returns for every column of a price panel at once.
+-Parameters
+--panel : pd.DataFrame or np.ndarray
+  Prices as dates x symbols.
+--method : {"simple", "log"}, default "simple"
+-Returns the same type as the input, one row shorter (the first row has no
+ previous price). Values are NaN where the price or the previous price is missing.
+"""
+@instrument
+@memoize
+def compute_returns_panel(
+    panel: pd.DataFrame | np.ndarray,
+    method: str = "simple",
+) -> pd.DataFrame | np.ndarray:
+    validate_price_panel(panel)
+    if method not in ("simple", "log"):
+        raise ValueError(f"Unsupported method: {method!r}. Use 'simple' or 'log'.")
+
+    values = np.asarray(panel, dtype=np.float64)
+    ratio = values[1:] / values[:-1]
+    returns = ratio - 1.0 if method == "simple" else np.log(ratio)
+
+    if isinstance(panel, pd.DataFrame):
+        return pd.DataFrame(returns, index=panel.index[1:], columns=panel.columns)
+    return returns
+
+"""
+Compute a simple moving average for every column of a price panel at once.
+-Parameters
+--panel : pd.DataFrame or np.ndarray
+  Prices as dates x symbols.
+--window : int
+-Returns the same type and shape as the input; NaN until a full window of
+ non-missing values is available.
+"""
+@instrument
+@memoize
+def moving_average_panel(
+    panel: pd.DataFrame | np.ndarray,
+    window: int,
+) -> pd.DataFrame | np.ndarray:
+    validate_price_panel(panel)
+    validate_ma_window(window)
+
+    if isinstance(panel, pd.DataFrame):
+        return panel.rolling(window=window).mean()
+
+    return _rolling_means(panel, [window])[window]
+
+"""
+Compute rolling volatility (standard deviation) for every column of a return panel at once.
+-Parameters
+--panel : pd.DataFrame or np.ndarray
+  Returns as dates x symbols.
+--window : int
+-Returns the same type and shape as the input; NaN until a full window of
+ non-missing values is available.
+"""
+@instrument
+@memoize
+def rolling_volatility_panel(
+    panel: pd.DataFrame | np.ndarray,
+    window: int,
+) -> pd.DataFrame | np.ndarray:
+    validate_price_panel(panel)
+    validate_ma_window(window)
+
+    if isinstance(panel, pd.DataFrame):
+        return panel.rolling(window=window).std()
+
+    return _rolling_stds(panel, [window])[window]
+
+"""
+Validate a list of windows and drop duplicates, keeping their order.
+"""
+def _unique_windows(windows: Iterable[int]) -> list[int]:
+    result = []
+    for window in windows:
+        validate_ma_window(window)
+        if window not in result:
+            result.append(window)
+    if not result:
+        raise ValueError("At least one window must be provided.")
+    return result
+
+"""
+Compute simple moving averages for several windows in one pass.
+All windows share a single cumulative-sum precomputation, so the cost is
+roughly O(n) regardless of the number of windows.
+-Parameters
+--price_series : pd.Series
+--windows : iterable of int
+-Returns pd.DataFrame
+ One column per window (labelled by the window length), aligned with the input index.
+"""
+@instrument
+@memoize
+def moving_averages(price_series: pd.Series, windows: Iterable[int]) -> pd.DataFrame:
+    validate_price_series(price_series)
+    windows = _unique_windows(windows)
+
+    values = price_series.to_numpy(dtype=np.float64).reshape(-1, 1)
+    means = _rolling_means(values, windows)
+    return pd.DataFrame({w: means[w][:, 0] for w in windows}, index=price_series.index)
+
+"""
+Compute rolling volatility (standard deviation) of returns for several windows in one pass.
+-Parameters
+--return_series : pd.Series
+--windows : iterable of int
+-Returns pd.DataFrame
+ One column per window (labelled by the window length), aligned with the input index.
+"""
+@instrument
+@memoize
+def rolling_volatilities(return_series: pd.Series, windows: Iterable[int]) -> pd.DataFrame:
+    validate_price_series(return_series)
+    windows = _unique_windows(windows)
+
+    values = return_series.to_numpy(dtype=np.float64).reshape(-1, 1)
+    stds = _rolling_stds(values, windows)
+    return pd.DataFrame({w: stds[w][:, 0] for w in windows}, index=return_series.index)
+
+"""
+Validate a single price series or a wide (dates x symbols) price DataFrame.
+"""
+def _validate_series_or_panel(prices: pd.Series | pd.DataFrame) -> None:
+    if isinstance(prices, pd.Series):
+        validate_price_series(prices)
+    elif isinstance(prices, pd.DataFrame):
+        validate_price_panel(prices)
+    else:
+        raise TypeError(
+            f"prices must be a pandas Series or DataFrame, got {type(prices)} instead."
+        )
+
+"""
+Combine named components into one DataFrame: plain columns for a Series input,
+(component, symbol) MultiIndex columns for a panel input. In both cases
+result[name] returns the component.
+"""
+def _combine_components(components: dict, prices: pd.Series | pd.DataFrame) -> pd.DataFrame:
+    if isinstance(prices, pd.Series):
+        return pd.DataFrame(components, index=prices.index)
+    return pd.concat(components, axis=1)
+
+"""
+Select one OHLCV field from a price DataFrame.
+Supports flat columns, yfinance (field, ticker) columns and (symbol, field)
+panel columns. A single ticker gives a Series, several give a dates x symbols DataFrame.
+-Raise ValueError if the field is missing.
+"""
+def _ohlcv_field(df: pd.DataFrame, field: str) -> pd.Series | pd.DataFrame:
+    if not isinstance(df.columns, pd.MultiIndex):
+        if field not in df.columns:
+            raise ValueError(f"DataFrame must contain a {field!r} column.")
+        return df[field]
+
+    for level in range(df.columns.nlevels):
+        if field in df.columns.get_level_values(level):
+            selected = df.xs(field, axis=1, level=level)
+            return selected.iloc[:, 0] if selected.shape[1] == 1 else selected
+    raise ValueError(f"DataFrame must contain a {field!r} column.")
+
+"""
+Compute an exponential moving average (recursive filter, adjust=False).
+-Parameters
+--prices : pd.Series or pd.DataFrame
+  Single price series or a dates x symbols panel.
+--span : int
+  Smoothing span; alpha = 2 / (span + 1).
+-Returns the same type and shape as the input.
+"""
+@instrument
+@memoize
+def ema(prices: pd.Series | pd.DataFrame, span: int) -> pd.Series | pd.DataFrame:
+    _validate_series_or_panel(prices)
+    validate_ma_window(span)
+
+    return prices.ewm(span=span, adjust=False).mean()
+
+"""
+Compute the Relative Strength Index with Wilder smoothing.
+-Parameters
+--prices : pd.Series or pd.DataFrame
+--window : int, default 14
+-Returns the same type and shape as the input, values in [0, 100]; NaN for the
+ first `window` rows.
+"""
+@instrument
+@memoize
+def rsi(prices: pd.Series | pd.DataFrame, window: int = 14) -> pd.Series | pd.DataFrame:
+    _validate_series_or_panel(prices)
+    validate_ma_window(window)
+
+    delta = prices.diff()
+    gain = delta.clip(lower=0.0)
+    loss = -delta.clip(upper=0.0)
+    avg_gain = gain.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+    avg_loss = loss.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+    # 100 - 100 / (1 + RS), written without dividing by a zero average loss
+    return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+"""
+Compute the MACD line, its signal line and the histogram.
+-Parameters
+--prices : pd.Series or pd.DataFrame
+--fast : int, default 12
+--slow : int, default 26
+--signal : int, default 9
+-Returns pd.DataFrame with "MACD", "Signal" and "Histogram" components.
+-Raise ValueError if fast >= slow.
+"""
+@instrument
+@memoize
+def macd(
+    prices: pd.Series | pd.DataFrame,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> pd.DataFrame:
+    _validate_series_or_panel(prices)
+    for window in (fast, slow, signal):
+        validate_ma_window(window)
+    if fast >= slow:
+        raise ValueError("fast span must be smaller than slow span.")
+
+    line = ema(prices, fast) - ema(prices, slow)
+    signal_line = line.ewm(span=signal, adjust=False).mean()
+    return _combine_components(
+        {"MACD": line, "Signal": signal_line, "Histogram": line - signal_line}, prices
+    )
+
+"""
+Compute Bollinger Bands: a moving average with bands num_std population
+standard deviations above and below.
+-Parameters
+--prices : pd.Series or pd.DataFrame
+--window : int, default 20
+--num_std : float, default 2.0
+-Returns pd.DataFrame with "Middle", "Upper" and "Lower" components.
+"""
+@instrument
+@memoize
+def bollinger_bands(
+    prices: pd.Series | pd.DataFrame,
+    window: int = 20,
+    num_std: float = 2.0,
+) -> pd.DataFrame:
+    _validate_series_or_panel(prices)
+    validate_ma_window(window)
+    if num_std < 0:
+        raise ValueError("num_std must be non-negative.")
+
+    rolling = prices.rolling(window=window)
+    middle = rolling.mean()
+    width = num_std * rolling.std(ddof=0)
+    return _combine_components(
+        {"Middle": middle, "Upper": middle + width, "Lower": middle - width}, prices
+    )
+
+"""
+Compute the Average True Range with Wilder smoothing.
+-Parameters
+--df : pd.DataFrame
+  OHLCV data with 'High', 'Low' and 'Close' columns, e.g. from
+  download_price_data, or a (symbol, field) panel from download_price_panel.
+--window : int, default 14
+-Returns pd.Series for a single symbol, or a dates x symbols DataFrame.
+-Raise ValueError if a required column is missing.
+"""
+@instrument
+@memoize
+def atr(df: pd.DataFrame, window: int = 14) -> pd.Series | pd.DataFrame:
+    validate_price_dataframe(df)
+    validate_ma_window(window)
+
+    high = _ohlcv_field(df, "High")
+    low = _ohlcv_field(df, "Low")
+    prev_close = _ohlcv_field(df, "Close").shift(1)
+
+    true_range = np.maximum(high - low, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+    # The first bar has no previous close: its range is High - Low
+    true_range.iloc[0] = (high - low).iloc[0]
+    return true_range.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+
+"""
+Compute the volume-weighted average price of the typical price (High + Low + Close) / 3.
+-Parameters
+--df : pd.DataFrame
+  OHLCV data with 'High', 'Low', 'Close' and 'Volume' columns, or a (symbol, field) panel.
+--window : int, optional
+  If given, a rolling VWAP over the last `window` bars.
+--anchor : str, optional
+  Pandas frequency (e.g. "D") at which the cumulative VWAP restarts, e.g. per
+  trading session for intraday bars. Ignored when window is given.
+-Returns pd.Series for a single symbol, or a dates x symbols DataFrame.
+-Raise ValueError if a required column is missing.
+"""
+@instrument
+@memoize
+def vwap(
+    df: pd.DataFrame,
+    window: int | None = None,
+    anchor: str | None = None,
+) -> pd.Series | pd.DataFrame:
+    validate_price_dataframe(df)
+    if window is not None:
+        validate_ma_window(window)
+
+    typical = (_ohlcv_field(df, "High") + _ohlcv_field(df, "Low") + _ohlcv_field(df, "Close")) / 3.0
+    volume = _ohlcv_field(df, "Volume").astype(np.float64)
+    traded = typical * volume
 
+    if window is not None:
+        return traded.rolling(window=window).sum() / volume.rolling(window=window).sum()
+    if anchor is not None:
+        sessions = df.index.to_period(anchor)
+        return traded.groupby(sessions).cumsum() / volume.groupby(sessions).cumsum()
+    return traded.cumsum() / volume.cumsum()
@@ -0,0 +1,304 @@
+"""
+memo.py
+Opt-in LRU memoization of the indicator functions. Results are keyed by the
+function, its parameters and a cheap content fingerprint of the input (length,
+index labels and a CRC-32 of the values), so a series that is modified in
+place, appended to or relabelled never gets a stale result back. Disabled by
+default; a memoized function then costs one global lookup per call.
+"""
+
+import functools
+import inspect
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .profiling import _nbytes
+
+# Memo receiving the results, or None when memoization is disabled
+_active: "IndicatorMemo | None" = None
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Copy-on-write is always on from pandas 3; on pandas 2 it is an option
+_PANDAS_3 = int(pd.__version__.split(".", 1)[0]) >= 3
+
+"""
+Counters of an IndicatorMemo.
+--hits, misses: lookups answered from the memo / computed.
+--evictions: entries dropped to respect max_bytes.
+--superseded: entries dropped because a longer or modified version of their
+  input was computed (e.g. a series that was appended to).
+--entries, nbytes: current number of entries and their size in bytes.
+--max_bytes: size cap.
+"""
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    superseded: int = 0
+    entries: int = 0
+    nbytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+"""
+Content fingerprint of an indicator input, split into its origin (dtype,
+name or columns, index dtype and first label), which a series keeps when bars
+are appended, and its state (length, last index label, the labels in between
+as in _index_key, CRC-32 of the values).
+-Returns (origin, state), or None for inputs that are not memoized
+ (non-pandas, empty or non-numeric data, or an index of objects).
+"""
+def _fingerprint(data) -> tuple[tuple, tuple] | None:
+    if not isinstance(data, (pd.Series, pd.DataFrame)) or data.empty:
+        return None
+    values = data.to_numpy()
+    if values.dtype.kind not in "fiub":
+        return None
+    index = data.index
+    labels = _index_key(index)
+    if labels is None:
+        return None
+    if values.ndim == 2 and values.flags.f_contiguous:
+        values = values.T  # a single-block frame: C-contiguous view, no copy
+    label = data.name if isinstance(data, pd.Series) else tuple(data.columns)
+    origin = (type(data).__name__, values.dtype.str, label, str(index.dtype), index[0])
+    state = (len(data), index[-1], labels, _crc32(values))
+    return origin, state
+
+# The labels between the first and the last one: implied by the frequency of a
+# regular index or the step of a RangeIndex, otherwise a CRC-32 of the labels
+def _index_key(index: pd.Index):
+    if isinstance(index, pd.RangeIndex):
+        return "step", index.step
+    if isinstance(index, (pd.DatetimeIndex, pd.TimedeltaIndex, pd.PeriodIndex)):
+        if index.freq is not None:
+            return "freq", index.freqstr
+        return "crc", _crc32(index.asi8)  # also for tz-aware timestamps, whose to_numpy holds objects
+    labels = index.to_numpy()
+    if labels.dtype.kind not in "fiub":
+        return None
+    return "crc", _crc32(labels)
+
+
+def _crc32(values: np.ndarray) -> int:
+    return zlib.crc32(memoryview(np.ascontiguousarray(values)).cast("B"))
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+"""
+LRU store of indicator results, capped in bytes. Thread-safe.
+Each (function, parameters, input origin) keeps a single entry: computing it
+on a longer or modified version of the input replaces the older result, so
+a series that grows bar by bar does not fill the memo with dead entries.
+-Parameters
+--max_bytes: int, default 256 MiB
+  Upper bound on the total size of the stored results; least recently used
+  entries are evicted. Results larger than this are not stored.
+-Raise ValueError if max_bytes is not a positive integer.
+"""
+class IndicatorMemo:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+        self.max_bytes = max_bytes
+        # (function, params, origin) -> (state, result, nbytes)
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._nbytes = 0
+        self._stats = MemoStats(max_bytes=max_bytes)
+        self._lock = threading.Lock()
+
+    """
+    Return func(*args, **kwargs), from the memo when it holds a result for the
+    same function, parameters and input content. The first argument is the
+    fingerprinted input; calls that cannot be keyed run unmemoized.
+    """
+    def call(self, name: str, signature: inspect.Signature, func: Callable, args: tuple, kwargs: dict):
+        key = self._key(name, signature, args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+        slot, state = key
+
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == state:
+                self._entries.move_to_end(slot)
+                self._stats.hits += 1
+                return _shared(entry[1])
+            self._stats.misses += 1
+
+        result = func(*args, **kwargs)
+        self._store(slot, state, _shared(result))
+        return result
+
+    def _key(self, name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> tuple | None:
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            return None
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())
+        if not arguments:
+            return None
+        fingerprint = _fingerprint(arguments[0][1])
+        if fingerprint is None:
+            return None
+        origin, state = fingerprint
+        slot = (name, tuple((k, _freeze(v)) for k, v in arguments[1:]), origin)
+        try:
+            hash(slot)
+        except TypeError:
+            return None
+        return slot, state
+
+    def _store(self, slot: tuple, state: tuple, result) -> None:
+        nbytes = _nbytes(result)
+        with self._lock:
+            previous = self._entries.pop(slot, None)
+            if previous is not None:
+                self._nbytes -= previous[2]
+                # Only a shorter (or equally long, modified) input is superseded
+                if state[0] >= previous[0][0]:
+                    self._stats.superseded += 1
+                else:
+                    self._entries[slot] = previous
+                    self._nbytes += previous[2]
+                    return
+            if nbytes > self.max_bytes:
+                return
+            self._entries[slot] = (state, result, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, (_, _, size) = self._entries.popitem(last=False)
+                self._nbytes -= size
+                self._stats.evictions += 1
+
+    """
+    Current counters and size.
+    -Returns MemoStats
+    """
+    def stats(self) -> MemoStats:
+        with self._lock:
+            return MemoStats(**{**vars(self._stats), "entries": len(self._entries), "nbytes": self._nbytes})
+
+    """
+    Drop stored results.
+    -Parameters
+    --data: pd.Series or pd.DataFrame, optional
+      Drop only the results computed from this input, in any version (before
+      or after bars were appended to it). Default: drop everything.
+    -Returns int: number of entries dropped.
+    """
+    def invalidate(self, data: pd.Series | pd.DataFrame | None = None) -> int:
+        with self._lock:
+            if data is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._nbytes = 0
+                return dropped
+            fingerprint = _fingerprint(data)
+            if fingerprint is None:
+                return 0
+            slots = [slot for slot in self._entries if slot[2] == fingerprint[0]]
+            for slot in slots:
+                self._nbytes -= self._entries.pop(slot)[2]
+            return len(slots)
+
+    """
+    Drop every stored result and reset the counters.
+    """
+    def clear(self) -> None:
+        self.invalidate()
+        with self._lock:
+            self._stats = MemoStats(max_bytes=self.max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Copy isolating the stored result from the caller's: a shallow copy sharing
+# the data under copy-on-write, a deep copy when pandas 2 runs without it
+def _shared(result):
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.copy(deep=not (_PANDAS_3 or pd.options.mode.copy_on_write is True))
+    return result
+
+"""
+Decorator memoizing an indicator function while memoization is enabled. The
+first parameter is the fingerprinted input; the others must be hashable (lists
+are compared as tuples) and are matched after binding the defaults, so
+f(s, 20) and f(s, window=20) share an entry.
+"""
+def memoize(func: Callable) -> Callable:
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = _active
+        if memo is None:
+            return func(*args, **kwargs)
+        return memo.call(name, signature, func, args, kwargs)
+
+    return wrapper
+
+"""
+Start memoizing the indicator functions, process-wide.
+-Parameters
+--max_bytes: int, default 256 MiB
+-Returns the new active IndicatorMemo.
+"""
+def enable_memoization(max_bytes: int = DEFAULT_MAX_BYTES) -> IndicatorMemo:
+    global _active
+    _active = IndicatorMemo(max_bytes)
+    return _active
+
+"""
+Stop memoizing and drop the reference to the stored results.
+-Returns the IndicatorMemo that was active (None if memoization was disabled).
+"""
+def disable_memoization() -> IndicatorMemo | None:
+    global _active
+    memo, _active = _active, None
+    return memo
+
+"""
+The active IndicatorMemo, or None if memoization is disabled.
+"""
+def get_memo() -> IndicatorMemo | None:
+    return _active
+
+"""
+Memoize the indicator calls made inside the block in a new IndicatorMemo;
+the previous setting is restored on exit.
+
+with memoization(max_bytes=64 * 1024 * 1024) as memo:
+    mas = moving_averages(close, [20, 60])
+    plot_price(close, ma_windows=[20, 60])  # reuses the moving averages
+print(memo.stats())
+"""
+@contextmanager
+def memoization(max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[IndicatorMemo]:
+    global _active
+    previous = _active
+    memo = IndicatorMemo(max_bytes)
+    _active = memo
+    try:
+        yield memo
+    finally:
+        _active = previous
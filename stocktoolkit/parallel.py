@@ -0,0 +1,289 @@
+"""
+parallel.py
+Run per-symbol indicator pipelines on a process pool. Price arrays are handed
+to the workers through shared memory instead of being pickled.
+"""
+
+import math
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .concurrency import DownloadReport, FetchFailure
+from .data import split_price_panel
+from .profiling import instrument
+from .validation import validate_price_dataframe, validate_price_series
+
+# Offsets inside a shared block are aligned to this many bytes
+_ALIGN = 64
+
+"""
+Location of one symbol's arrays inside a shared memory block.
+"""
+@dataclass
+class _SymbolLayout:
+    symbol: str
+    rows: int
+    index_offset: int
+    unit: str
+    tz: str | None
+    freq: str | None
+    index_name: Any
+    # (offset, dtype str) per column
+    columns: list[tuple[int, str]]
+    # Column labels for a frame, or the series name for a Series
+    labels: Any
+    is_series: bool
+    # Data that cannot be laid out in shared memory, pickled with the task instead
+    pickled: pd.DataFrame | pd.Series | None = None
+
+
+"""
+Apply a pipeline of steps to every symbol on a process pool.
+-Parameters
+--data: dict[str, pd.DataFrame | pd.Series] or pd.DataFrame
+  Mapping symbol -> price frame (e.g. from download_multiple_price_data), a
+  (symbol, field) panel (e.g. from download_price_panel) or a dates x symbols
+  panel of prices, whose columns are passed to the pipeline as Series.
+  Symbols with object columns (e.g. strings) are pickled to the workers.
+--pipeline: callable or sequence of callables
+  Steps applied in order, each to the previous step's output, e.g.
+  [get_close_price, compute_returns, partial(rolling_volatility, window=20)].
+  Steps run in worker processes and must be picklable: module-level functions
+  or functools.partial objects, not lambdas.
+--max_workers: int, optional
+  Number of processes. Defaults to the number of usable CPUs; 1 runs in
+  this process.
+--chunk_size: int, optional
+  Symbols per task. Defaults to spreading the symbols over about four tasks
+  per worker.
+--report: DownloadReport, optional
+  If given, per-symbol exceptions are recorded in it and the other results are
+  still returned. Otherwise the first failure (in symbol order) is raised.
+--pass_symbol: bool, default False
+  If True, the first step is called as step(symbol, data).
+-Returns dict[str, Any]: Mapping from symbol -> pipeline output, in input order.
+"""
+@instrument
+def parallel_map(
+    data: dict[str, pd.DataFrame | pd.Series] | pd.DataFrame,
+    pipeline: Callable | Sequence[Callable],
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+    report: DownloadReport | None = None,
+    pass_symbol: bool = False,
+) -> dict[str, Any]:
+    items = _as_items(data)
+    steps = [pipeline] if callable(pipeline) else list(pipeline)
+    if not steps or not all(callable(step) for step in steps):
+        raise ValueError("pipeline must be a callable or a non-empty sequence of callables.")
+    if max_workers is None:
+        max_workers = _available_cpus()
+    if not isinstance(max_workers, int) or max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(items) / (4 * max_workers)))
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    started = time.monotonic()
+    outcomes: dict[str, tuple[bool, Any]] = {}
+    if max_workers == 1:
+        for symbol, obj in items:
+            outcomes[symbol] = _run_steps(steps, obj, symbol if pass_symbol else None)
+    else:
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        blocks = []
+        try:
+            tasks = []
+            for chunk in chunks:
+                block, layouts = _pack(chunk)
+                blocks.append(block)
+                tasks.append((block.name, layouts))
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                futures = [
+                    pool.submit(_run_chunk, name, layouts, steps, pass_symbol)
+                    for name, layouts in tasks
+                ]
+                for future in futures:
+                    outcomes.update(future.result())
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    symbols = [symbol for symbol, _ in items]
+    failed = {s: FetchFailure(s, outcomes[s][1], 1) for s in symbols if not outcomes[s][0]}
+    if report is None:
+        for failure in failed.values():
+            raise failure.error
+    else:
+        report.succeeded = [s for s in symbols if s not in failed]
+        report.failed = failed
+        report.attempts = {s: 1 for s in symbols}
+        report.elapsed = time.monotonic() - started
+    return {s: outcomes[s][1] for s in symbols if s not in failed}
+
+
+def _available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _as_items(data) -> list[tuple[str, pd.DataFrame | pd.Series]]:
+    if isinstance(data, pd.DataFrame):
+        validate_price_dataframe(data)
+        if isinstance(data.columns, pd.MultiIndex):
+            return list(split_price_panel(data).items())
+        return [(str(label), data.iloc[:, i]) for i, label in enumerate(data.columns)]
+    if not isinstance(data, dict) or not data:
+        raise ValueError("data must be a non-empty dict of price frames or a price panel.")
+    for symbol, obj in data.items():
+        if isinstance(obj, pd.Series):
+            validate_price_series(obj)
+        else:
+            validate_price_dataframe(obj, symbol)
+    return list(data.items())
+
+
+def _run_steps(steps: list[Callable], obj, symbol: str | None = None) -> tuple[bool, Any]:
+    try:
+        for i, step in enumerate(steps):
+            obj = step(symbol, obj) if i == 0 and symbol is not None else step(obj)
+        return True, obj
+    except Exception as exc:
+        return False, exc
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+# Copy the index and columns of a chunk of symbols into one shared memory block.
+# Symbols with object columns have no fixed-size layout and are pickled instead.
+def _pack(chunk) -> tuple[shared_memory.SharedMemory, list[_SymbolLayout]]:
+    arrays = []
+    for symbol, obj in chunk:
+        frame = obj.to_frame() if isinstance(obj, pd.Series) else obj
+        columns = [frame.iloc[:, i].to_numpy() for i in range(frame.shape[1])]
+        if any(values.dtype == object for values in columns):
+            columns = None
+        arrays.append((symbol, obj, pd.DatetimeIndex(frame.index), columns))
+
+    size = sum(
+        _aligned(index.asi8.nbytes) + sum(_aligned(c.nbytes) for c in columns)
+        for _, _, index, columns in arrays
+        if columns is not None
+    )
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    layouts = []
+    offset = 0
+
+    def put(values: np.ndarray) -> int:
+        nonlocal offset
+        start = offset
+        np.ndarray(values.shape, values.dtype, buffer=block.buf, offset=start)[:] = values
+        offset += _aligned(values.nbytes)
+        return start
+
+    for symbol, obj, index, columns in arrays:
+        is_series = isinstance(obj, pd.Series)
+        if columns is None:
+            layouts.append(_SymbolLayout(
+                symbol=symbol, rows=len(index), index_offset=0, unit=index.unit, tz=None, freq=None,
+                index_name=index.name, columns=[], labels=None, is_series=is_series, pickled=obj,
+            ))
+            continue
+        layouts.append(_SymbolLayout(
+            symbol=symbol,
+            rows=len(index),
+            index_offset=put(index.asi8),
+            unit=index.unit,
+            tz=str(index.tz) if index.tz is not None else None,
+            freq=index.freqstr,
+            index_name=index.name,
+            columns=[(put(values), values.dtype.str) for values in columns],
+            labels=obj.name if is_series else obj.columns,
+            is_series=is_series,
+        ))
+    return block, layouts
+
+
+# Worker: rebuild each symbol's data as views on the shared block and run the steps
+def _run_chunk(
+    name: str,
+    layouts: list[_SymbolLayout],
+    steps: list[Callable],
+    pass_symbol: bool = False,
+) -> dict[str, tuple[bool, Any]]:
+    block = shared_memory.SharedMemory(name=name)
+    buffer = np.ndarray(block.size, np.uint8, buffer=block.buf)
+    outcomes = {}
+    try:
+        for layout in layouts:
+            obj = _unpack(block, layout)
+            ok, value = _run_steps(steps, obj, layout.symbol if pass_symbol else None)
+            del obj
+            outcomes[layout.symbol] = (ok, _detach(value, buffer) if ok else _picklable(value))
+    finally:
+        del buffer
+        try:
+            block.close()
+        except BufferError:
+            pass  # a result still references the block; it is unmapped when collected
+    return outcomes
+
+
+def _unpack(block: shared_memory.SharedMemory, layout: _SymbolLayout) -> pd.DataFrame | pd.Series:
+    if layout.pickled is not None:
+        return layout.pickled
+    raw = np.ndarray(layout.rows, np.int64, buffer=block.buf, offset=layout.index_offset)
+    # The index is small and is copied, so results may keep it after the block closes
+    index = pd.DatetimeIndex(raw.view(f"datetime64[{layout.unit}]"), name=layout.index_name)
+    if layout.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(layout.tz)
+    if layout.freq is not None:
+        index.freq = layout.freq
+    columns = {
+        i: np.ndarray(layout.rows, np.dtype(dtype), buffer=block.buf, offset=offset)
+        for i, (offset, dtype) in enumerate(layout.columns)
+    }
+    if layout.is_series:
+        return pd.Series(columns[0], index=index, name=layout.labels, copy=False)
+    df = pd.DataFrame(columns, index=index, copy=False)
+    df.columns = layout.labels
+    return df
+
+
+# Copy results that still view the shared block, which is released after the chunk
+def _detach(value, buffer: np.ndarray):
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        arrays = [value.to_numpy()] if isinstance(value, pd.Series) else [
+            value.iloc[:, i].to_numpy() for i in range(value.shape[1])
+        ]
+        if any(np.may_share_memory(a, buffer) for a in arrays):
+            return value.copy(deep=True)
+        return value
+    if isinstance(value, np.ndarray):
+        return value.copy() if np.may_share_memory(value, buffer) else value
+    if isinstance(value, dict):
+        return {k: _detach(v, buffer) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_detach(v, buffer) for v in value)
+    return value
+
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
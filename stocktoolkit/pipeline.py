@@ -0,0 +1,483 @@
+"""
+pipeline.py
+Batch pipeline for universe-scale runs, also available as `python -m stocktoolkit`.
+Symbols stream through download -> close extraction -> indicators -> resample
+-> output files in chunks: the next chunk is downloaded while the current one
+is processed, completed symbols are appended to a checkpoint file so an
+interrupted run can be resumed, and throughput is reported at the end.
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from .concurrency import DownloadReport, FetchFailure
+from .data import download_multiple_price_data, get_close_price, resample_price
+from .indicators import _rolling_means, _rolling_stds, _unique_windows
+from .profiling import instrument, profile
+from .validation import validate_date_string, validate_symbols
+
+PIPELINE_FORMATS = ("csv", "parquet")
+
+# Completed symbols, one per line, in the output directory
+CHECKPOINT_FILE = "_checkpoint.txt"
+
+"""
+Outcome of run_pipeline, updated after every chunk (see its progress argument).
+--total: number of symbols requested.
+--succeeded: symbols whose output file was written, in completion order.
+--failed: mapping symbol -> FetchFailure for the symbols that failed in any stage.
+--skipped: symbols already completed according to the checkpoint file.
+--rows: rows written over all output files.
+--bytes_written: size of the output files (charts excluded).
+--elapsed: wall time of the run in seconds.
+--download_s, process_s: time spent downloading and processing chunks; they
+  overlap, so their sum exceeds elapsed when pipelining pays off.
+"""
+@dataclass
+class PipelineReport:
+    total: int = 0
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, FetchFailure] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    rows: int = 0
+    bytes_written: int = 0
+    elapsed: float = 0.0
+    download_s: float = 0.0
+    process_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def done(self) -> int:
+        return len(self.succeeded) + len(self.failed) + len(self.skipped)
+
+    @property
+    def symbols_per_second(self) -> float:
+        return (len(self.succeeded) + len(self.failed)) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    """
+    Text summary of the run: counts, throughput and the failed symbols.
+    """
+    def summary(self) -> str:
+        lines = [
+            f"symbols: {self.total:,} total, {len(self.succeeded):,} written, "
+            f"{len(self.failed):,} failed, {len(self.skipped):,} skipped (checkpoint)",
+            f"rows: {self.rows:,} ({self.rows_per_second:,.0f} rows/s)",
+            f"bytes written: {self.bytes_written:,}",
+            f"wall: {self.elapsed:.2f}s ({self.symbols_per_second:,.1f} symbols/s), "
+            f"download {self.download_s:.2f}s, processing {self.process_s:.2f}s",
+        ]
+        for symbol, failure in self.failed.items():
+            lines.append(f"failed {symbol}: {type(failure.error).__name__}: {failure.error}")
+        return "\n".join(lines)
+
+"""
+Read a symbol list file: symbols separated by newlines, commas or whitespace;
+text after '#' is a comment. Duplicates are dropped, keeping the first.
+-Returns list[str]: upper-case symbols in file order.
+-Raise ValueError if the file holds no symbol.
+"""
+@instrument
+def read_symbols(path: str) -> list[str]:
+    symbols = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            symbols += re.split(r"[\s,]+", line.split("#", 1)[0])
+    return list(dict.fromkeys(validate_symbols(symbols)))
+
+"""
+Simple or log returns of a price array, NaN on the first row.
+"""
+def _returns(values: np.ndarray, method: str) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    ratio = values[1:] / values[:-1]
+    out[1:] = ratio - 1.0 if method == "simple" else np.log(ratio)
+    return out
+
+"""
+Per-symbol output frame: Close, Return, MA_<w> and Vol_<w> columns, built
+from one pass of the shared rolling kernels per indicator family.
+Indicators are computed on the downloaded bars; with freq, the frame is then
+sampled at the end of each period and Return is recomputed between periods.
+"""
+def _indicator_frame(
+    df: pd.DataFrame,
+    ma_windows: tuple[int, ...],
+    vol_windows: tuple[int, ...],
+    method: str,
+    freq: str | None,
+) -> pd.DataFrame:
+    close = get_close_price(df)
+    values = close.to_numpy(dtype=np.float64)
+    columns = {"Close": values}
+    if ma_windows:
+        means = _rolling_means(values.reshape(-1, 1), list(ma_windows))
+        columns.update({f"MA_{w}": means[w][:, 0] for w in ma_windows})
+    if vol_windows:
+        returns = _returns(values, method)
+        stds = _rolling_stds(returns[1:].reshape(-1, 1), list(vol_windows))
+        columns.update({f"Vol_{w}": np.concatenate(([np.nan], stds[w][:, 0])) for w in vol_windows})
+    frame = pd.DataFrame(columns, index=close.index, copy=False)
+    if freq:
+        # Bar resampling takes the last valid value of every non-OHLCV column
+        frame = resample_price(frame, freq, "ohlc")
+        frame = frame[frame["Close"].notna()]
+    frame.insert(1, "Return", _returns(frame["Close"].to_numpy(), method))
+    frame.index.name = "Date"
+    return frame
+
+"""
+Write a frame to path through a temporary file, so an interrupted run never
+leaves a truncated output behind.
+-Returns int: size of the written file in bytes.
+"""
+def _write_frame(frame: pd.DataFrame, path: str, fmt: str) -> int:
+    tmp = f"{path}.tmp"
+    if fmt == "csv":
+        frame.to_csv(tmp)
+    else:
+        frame.to_parquet(tmp)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+"""
+Picklable per-symbol processing step for parallel_map: computes the output
+frame and writes it in the worker.
+-Returns (rows, bytes written).
+"""
+class _SymbolJob:
+    def __init__(
+        self,
+        out_dir: str,
+        fmt: str,
+        ma_windows: tuple[int, ...],
+        vol_windows: tuple[int, ...],
+        method: str,
+        freq: str | None,
+    ) -> None:
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.ma_windows = ma_windows
+        self.vol_windows = vol_windows
+        self.method = method
+        self.freq = freq
+
+    def __call__(self, symbol: str, df: pd.DataFrame) -> tuple[int, int]:
+        frame = _indicator_frame(df, self.ma_windows, self.vol_windows, self.method, self.freq)
+        path = os.path.join(self.out_dir, f"{symbol.replace(os.sep, '_')}.{self.fmt}")
+        return len(frame), _write_frame(frame, path, self.fmt)
+
+
+def _read_checkpoint(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as fh:
+        return {line.strip() for line in fh if line.strip()}
+
+"""
+Check the run_pipeline arguments other than the symbols and out_dir.
+-Returns (fmt, charts, ma_windows, vol_windows), normalized.
+-Raise ValueError or ImportError as run_pipeline does.
+"""
+def _check_arguments(
+    start_date: str,
+    end_date: str,
+    ma_windows: Iterable[int],
+    vol_windows: Iterable[int],
+    method: str,
+    freq: str | None,
+    fmt: str,
+    charts: str | None,
+    chunk_size: int,
+    max_workers: int,
+    processes: int,
+    retries: int,
+    timeout: float | None,
+    rate_limit: float | None,
+) -> tuple[str, str | None, tuple[int, ...], tuple[int, ...]]:
+    from .plotting import CHART_FORMATS
+
+    validate_date_string(start_date)
+    validate_date_string(end_date)
+    if start_date >= end_date:
+        raise ValueError(f"end_date {end_date!r} must be after start_date {start_date!r}.")
+    if freq is not None:
+        to_offset(freq)  # ValueError for an unknown frequency
+    fmt = fmt.strip().lower()
+    if fmt not in PIPELINE_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt!r}. Use one of {PIPELINE_FORMATS}.")
+    if fmt == "parquet" and not any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet")):
+        raise ImportError("Writing Parquet requires pyarrow or fastparquet.")
+    if charts is not None:
+        charts = charts.strip().lower()
+        if charts not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {charts!r}. Use one of {CHART_FORMATS}.")
+    if method not in ("simple", "log"):
+        raise ValueError(f"Unsupported method: {method!r}. Use 'simple' or 'log'.")
+    for name, value in (("chunk_size", chunk_size), ("max_workers", max_workers), ("processes", processes)):
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{name} must be a positive integer.")
+    if not isinstance(retries, int) or retries < 0:
+        raise ValueError("retries must be a non-negative integer.")
+    for name, value in (("timeout", timeout), ("rate_limit", rate_limit)):
+        if value is not None and value <= 0:
+            raise ValueError(f"{name} must be positive.")
+    ma_windows = tuple(_unique_windows(ma_windows)) if ma_windows else ()
+    vol_windows = tuple(_unique_windows(vol_windows)) if vol_windows else ()
+    return fmt, charts, ma_windows, vol_windows
+
+"""
+Run the batch pipeline over a universe of symbols and write one file per
+symbol (SYMBOL.csv or SYMBOL.parquet) to out_dir, with the columns Close,
+Return, MA_<w> and Vol_<w>.
+Symbols are handled in chunks of chunk_size: while one chunk is processed on
+up to `processes` processes (see parallel_map), the next one is downloaded on
+`max_workers` threads. Failures are recorded per symbol and do not stop the run.
+-Parameters
+--symbols: iterable of str
+--start_date, end_date: str
+  Date range in YYYY-MM-DD format.
+--out_dir: str
+  Output directory, created if missing.
+--interval: str, default "1d"
+--fetcher: callable, optional
+  As in download_price_data, e.g. a LocalFileProvider. Defaults to the default provider.
+--ma_windows: iterable of int, default (20, 50)
+--vol_windows: iterable of int, default (20,)
+  Rolling volatility windows, over the returns of the downloaded bars. Both
+  indicators are NaN for windows containing a missing value; pass an empty
+  list to leave a family out.
+--method: {"simple", "log"}, default "simple"
+--freq: str, optional
+  Resample frequency of the output, e.g. "W" or "ME"; None keeps the downloaded
+  bars. Indicators are computed on the downloaded bars and sampled at the end
+  of each period; Return is the return between periods.
+--fmt: {"csv", "parquet"}, default "csv"
+  Parquet requires pyarrow or fastparquet.
+--charts: {"png", "svg", "pdf"}, optional
+  Also write a price chart with the moving averages per symbol to out_dir/charts.
+--chunk_size: int, default 50
+--max_workers: int, default 8
+  Concurrent downloads.
+--processes: int, default 1
+  Processes computing and writing the outputs; 1 runs in this process.
+--retries, timeout, rate_limit:
+  As in download_multiple_price_data.
+--resume: bool, default False
+  Skip the symbols listed in out_dir/_checkpoint.txt by a previous run.
+  Otherwise the checkpoint file is started afresh.
+--progress: callable, optional
+  progress(report) is called with the PipelineReport after every chunk.
+-Returns PipelineReport
+-Raise ValueError if an argument is invalid (including end_date not after
+ start_date); ImportError if fmt="parquet" and no Parquet engine is installed.
+ Arguments are checked before anything is downloaded or written.
+"""
+@instrument
+def run_pipeline(
+    symbols: Iterable[str],
+    start_date: str,
+    end_date: str,
+    out_dir: str,
+    interval: str = "1d",
+    fetcher: Callable | None = None,
+    ma_windows: Iterable[int] = (20, 50),
+    vol_windows: Iterable[int] = (20,),
+    method: str = "simple",
+    freq: str | None = None,
+    fmt: str = "csv",
+    charts: str | None = None,
+    chunk_size: int = 50,
+    max_workers: int = 8,
+    processes: int = 1,
+    retries: int = 0,
+    timeout: float | None = None,
+    rate_limit: float | None = None,
+    resume: bool = False,
+    progress: Callable[[PipelineReport], None] | None = None,
+) -> PipelineReport:
+    from .parallel import parallel_map
+    from .plotting import render_charts
+
+    symbols = list(dict.fromkeys(validate_symbols(symbols)))
+    fmt, charts, ma_windows, vol_windows = _check_arguments(
+        start_date, end_date, ma_windows, vol_windows, method, freq, fmt, charts,
+        chunk_size, max_workers, processes, retries, timeout, rate_limit,
+    )
+
+    os.makedirs(out_dir, exist_ok=True)
+    checkpoint_path = os.path.join(out_dir, CHECKPOINT_FILE)
+    completed = _read_checkpoint(checkpoint_path) if resume else set()
+    report = PipelineReport(total=len(symbols), skipped=[s for s in symbols if s in completed])
+    todo = [s for s in symbols if s not in completed]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    job = _SymbolJob(out_dir, fmt, ma_windows, vol_windows, method, freq)
+
+    def download(chunk: list[str]) -> tuple[dict[str, pd.DataFrame], DownloadReport, float]:
+        started = time.perf_counter()
+        chunk_report = DownloadReport()
+        result = download_multiple_price_data(
+            chunk, start_date, end_date, interval, fetcher=fetcher, max_workers=max_workers,
+            timeout=timeout, retries=retries, rate_limit=rate_limit, report=chunk_report,
+        )
+        return result, chunk_report, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with open(checkpoint_path, "a" if resume else "w", encoding="utf-8") as checkpoint, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="stocktoolkit-pipeline") as prefetch:
+        pending = prefetch.submit(download, chunks[0]) if chunks else None
+        for i in range(len(chunks)):
+            data, chunk_report, seconds = pending.result()
+            # Download the next chunk while this one is processed
+            if i + 1 < len(chunks):
+                pending = prefetch.submit(download, chunks[i + 1])
+            report.download_s += seconds
+            report.failed.update(chunk_report.failed)
+
+            process_started = time.perf_counter()
+            written: dict[str, tuple[int, int]] = {}
+            if data:
+                process_report = DownloadReport()
+                written = parallel_map(
+                    data, job, max_workers=min(processes, len(data)), report=process_report, pass_symbol=True
+                )
+                report.failed.update(process_report.failed)
+            if charts is not None and written:
+                chart_report = DownloadReport()
+                render_charts(
+                    {s: data[s] for s in written}, os.path.join(out_dir, "charts"), fmt=charts,
+                    ma_windows=ma_windows, max_workers=min(processes, len(written)), report=chart_report,
+                )
+                report.failed.update(chart_report.failed)
+                written = {s: v for s, v in written.items() if s not in chart_report.failed}
+            report.process_s += time.perf_counter() - process_started
+
+            for symbol, (rows, nbytes) in written.items():
+                report.succeeded.append(symbol)
+                report.rows += rows
+                report.bytes_written += nbytes
+            if written:
+                checkpoint.write("".join(f"{s}\n" for s in written))
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+            report.elapsed = time.perf_counter() - started
+            if progress is not None:
+                progress(report)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _print_progress(report: PipelineReport) -> None:
+    print(
+        f"[{report.done:>{len(str(report.total))}}/{report.total}] "
+        f"{report.done / max(report.total, 1):6.1%}  {report.symbols_per_second:,.1f} symbols/s  "
+        f"{len(report.failed)} failed",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m stocktoolkit",
+        description="Download a universe of symbols, compute indicators and write one file per symbol.",
+    )
+    parser.add_argument("symbols_file", help="symbol list: one per line (or comma/space separated), '#' comments")
+    parser.add_argument("--start", required=True, help="start date, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="end date, YYYY-MM-DD")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--interval", default="1d")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--data-dir", help="read bars from per-symbol files in this directory (LocalFileProvider)")
+    source.add_argument("--synthetic", action="store_true", help="use deterministic synthetic bars (offline)")
+    parser.add_argument("--ma", type=int, nargs="*", default=[20, 50], help="moving-average windows")
+    parser.add_argument("--vol", type=int, nargs="*", default=[20], help="rolling volatility windows")
+    parser.add_argument("--method", choices=["simple", "log"], default="simple")
+    parser.add_argument("--freq", help="resample the output, e.g. W or ME")
+    parser.add_argument("--format", choices=PIPELINE_FORMATS, default="csv")
+    parser.add_argument("--charts", choices=["png", "svg", "pdf"], help="also write one price chart per symbol")
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8, help="concurrent downloads")
+    parser.add_argument("--processes", type=int, default=1, help="processes computing the outputs")
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--timeout", type=float)
+    parser.add_argument("--rate-limit", type=float, help="downloads started per second")
+    parser.add_argument("--resume", action="store_true", help="skip symbols completed by a previous run")
+    parser.add_argument("--quiet", action="store_true", help="no progress lines")
+    parser.add_argument("--profile", action="store_true", help="print a profile of the instrumented functions")
+    return parser
+
+"""
+Command-line entry point (python -m stocktoolkit). Progress lines go to
+stderr and the summary to stdout. Invalid arguments, an unreadable symbols
+file or a missing Parquet engine are reported as usage errors (exit status 2).
+-Returns int: exit status, 0 if every symbol succeeded, 1 otherwise.
+"""
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    options = dict(
+        ma_windows=args.ma,
+        vol_windows=args.vol,
+        method=args.method,
+        freq=args.freq,
+        fmt=args.format,
+        charts=args.charts,
+        chunk_size=args.chunk_size,
+        max_workers=args.workers,
+        processes=args.processes,
+        retries=args.retries,
+        timeout=args.timeout,
+        rate_limit=args.rate_limit,
+    )
+    # Only the inputs are usage errors; failures during the run are not
+    try:
+        _check_arguments(args.start, args.end, **options)
+        symbols = read_symbols(args.symbols_file)
+        if args.data_dir:
+            from .providers import LocalFileProvider
+
+            fetcher = LocalFileProvider(args.data_dir)
+        elif args.synthetic:
+            from .synthetic import SyntheticFetcher
+
+            fetcher = SyntheticFetcher()
+        else:
+            fetcher = None
+    except (ValueError, OSError, ImportError) as exc:
+        parser.error(str(exc))
+
+    with profile() if args.profile else nullcontext() as profiler:
+        report = run_pipeline(
+            symbols,
+            args.start,
+            args.end,
+            args.out,
+            interval=args.interval,
+            fetcher=fetcher,
+            resume=args.resume,
+            progress=None if args.quiet else _print_progress,
+            **options,
+        )
+    print(report.summary())
+    if profiler is not None:
+        print(profiler.summary(limit=15))
+    return 0 if report.ok else 1
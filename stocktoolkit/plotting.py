@@ -1,15 +1,28 @@
 """
 plotting.py
 Visualization utilities for stocktoolkit.
+plot_* draw interactively with pyplot; render_* draw on explicit Figure/Axes
+objects with the Agg backend, without pyplot's global state, so charts can be
+saved headlessly and in parallel.
+Long series are decimated to a few points per horizontal pixel before drawing.
 """
 
+import math
+import os
+from collections import OrderedDict
 from typing import Iterable
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+from .profiling import instrument
 from .validation import validate_price_series
-from .indicators import moving_average
+from .indicators import compute_returns, moving_averages
+
+CHART_FORMATS = ("png", "svg", "pdf")
+
+# Each bucket keeps its first, min, max and last point
+_POINTS_PER_BUCKET = 4
 
 """
 Plot a price series with optional moving-average overlays.
@@ -18,53 +31,337 @@ Plot a price series with optional moving-average overlays.
 --ma_windows: iterable of int, optional
   Window sizes for moving averages.
 --title : str, optional
+--downsample: bool or int, default True
+  Decimate long series before drawing: True uses one bucket per horizontal
+  pixel of the figure, an int sets the number of buckets, False draws every point.
 """
+@instrument
 def plot_price(
     price_series: pd.Series,
     ma_windows: Iterable[int] | None = None,
     title: str | None = None,
+    downsample: bool | int = True,
 ) -> None:
     validate_price_series(price_series)
-    
-    plt.figure(figsize=(12, 6))
-    plt.plot(price_series.index, price_series.values, label="Price", linewidth=2)
-    
-    if ma_windows:
-        for window in ma_windows:
-            ma = moving_average(price_series, window)
-            plt.plot(ma.index, ma.values, label=f"MA({window})", alpha=0.7)
-    
-    plt.xlabel("Date")
-    plt.ylabel("Price")
-    if title:
-        plt.title(title)
-    else:
-        plt.title(f"{price_series.name} Price Chart")
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    import matplotlib.pyplot as plt  # deferred so importing stocktoolkit stays headless and fast
+
+    fig = plt.figure(figsize=(12, 6))
+    _draw_price(fig.add_subplot(), price_series, ma_windows, title, downsample)
+    fig.tight_layout()
     plt.show()
 
 """
 -Parameters
 --return_series : pd.Series
 --title : str, optional
+--downsample: bool or int, default True
+  As in plot_price.
 """
-def plot_returns(return_series: pd.Series, title: str | None = None) -> None:
+@instrument
+def plot_returns(
+    return_series: pd.Series,
+    title: str | None = None,
+    downsample: bool | int = True,
+) -> None:
     validate_price_series(return_series)
-    
-    plt.figure(figsize=(12, 6))
-    plt.plot(return_series.index, return_series.values, linewidth=1, alpha=0.7)
-    plt.axhline(y=0, color='r', linestyle='--', linewidth=1, alpha=0.5)
-    
-    plt.xlabel("Date")
-    plt.ylabel("Returns")
-    if title:
-        plt.title(title)
-    else:
-        plt.title(f"{return_series.name if return_series.name else 'Returns'} Chart")
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(12, 6))
+    _draw_returns(fig.add_subplot(), return_series, title, downsample)
+    fig.tight_layout()
     plt.show()
 
+"""
+Render a price chart on an explicit Figure, without pyplot.
+-Parameters
+--price_series: pd.Series
+--ma_windows: iterable of int, optional
+--title: str, optional
+--path: str, optional
+  If given, the figure is saved there; the format follows the extension.
+--ax: matplotlib Axes, optional
+  Draw on this Axes instead of a new figure.
+--figsize: tuple, default (12, 6)
+--dpi: int, default 100
+--downsample: bool or int, default True
+  As in plot_price.
+-Returns matplotlib.figure.Figure
+"""
+@instrument
+def render_price(
+    price_series: pd.Series,
+    ma_windows: Iterable[int] | None = None,
+    title: str | None = None,
+    path: str | None = None,
+    ax=None,
+    figsize: tuple[float, float] = (12, 6),
+    dpi: int = 100,
+    downsample: bool | int = True,
+):
+    validate_price_series(price_series)
+    fig, ax = _figure_axes(ax, figsize, dpi)
+    _draw_price(ax, price_series, ma_windows, title, downsample)
+    return _finish(fig, path)
+
+"""
+Render a returns chart on an explicit Figure, without pyplot.
+-Parameters
+--return_series: pd.Series
+--title, path, ax, figsize, dpi, downsample: as in render_price.
+-Returns matplotlib.figure.Figure
+"""
+@instrument
+def render_returns(
+    return_series: pd.Series,
+    title: str | None = None,
+    path: str | None = None,
+    ax=None,
+    figsize: tuple[float, float] = (12, 6),
+    dpi: int = 100,
+    downsample: bool | int = True,
+):
+    validate_price_series(return_series)
+    fig, ax = _figure_axes(ax, figsize, dpi)
+    _draw_returns(ax, return_series, title, downsample)
+    return _finish(fig, path)
+
+"""
+Write one chart file per symbol using a process pool. Each worker builds its
+figure once and only replaces the line data, limits and title for every
+following chart; price arrays reach the workers through shared memory.
+-Parameters
+--data: dict[str, pd.DataFrame | pd.Series] or pd.DataFrame
+  Price frames (the close price is charted), price series, or a panel; see parallel_map.
+--out_dir: str
+  Directory for the charts, created if missing. Files are named SYMBOL_kind.fmt.
+--kind: {"price", "returns"}, default "price"
+  "returns" charts the simple returns of the close price.
+--fmt: {"png", "svg", "pdf"}, default "png"
+--ma_windows: iterable of int, optional
+  Moving-average overlays for price charts.
+--figsize: tuple, default (12, 6)
+--dpi: int, default 100
+--downsample: bool or int, default True
+  As in plot_price.
+--max_workers: int, optional
+  Number of processes; see parallel_map.
+--report: DownloadReport, optional
+  If given, symbols whose chart failed are recorded in it instead of raising.
+-Returns dict[str, str]: Mapping from symbol -> chart path, in input order.
+"""
+@instrument
+def render_charts(
+    data,
+    out_dir: str,
+    kind: str = "price",
+    fmt: str = "png",
+    ma_windows: Iterable[int] | None = None,
+    figsize: tuple[float, float] = (12, 6),
+    dpi: int = 100,
+    downsample: bool | int = True,
+    max_workers: int | None = None,
+    report=None,
+) -> dict[str, str]:
+    from .parallel import parallel_map
+
+    kind = kind.strip().lower()
+    fmt = fmt.strip().lower()
+    if kind not in ("price", "returns"):
+        raise ValueError(f"Unsupported kind: {kind!r}. Use 'price' or 'returns'.")
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt!r}. Use one of {CHART_FORMATS}.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    job = _ChartJob(out_dir, kind, fmt, tuple(ma_windows or ()), tuple(figsize), dpi, downsample)
+    return parallel_map(data, job, max_workers=max_workers, report=report, pass_symbol=True)
+
+
+def _figure_axes(ax, figsize, dpi):
+    if ax is not None:
+        return ax.figure, ax
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _finish(fig, path: str | None):
+    fig.tight_layout()
+    if path is not None:
+        fig.savefig(path)
+    return fig
+
+
+"""
+Positions of the points to draw when a series is split into at most `buckets`
+consecutive buckets: the first, min, max and last point of each bucket (M4
+decimation). At one bucket per pixel column the drawn line looks the same as
+the full one. Missing values are ignored for min/max; an all-NaN bucket keeps
+its first point, so gaps in the line are preserved.
+-Returns np.ndarray of sorted int positions, or None if no decimation is needed.
+"""
+def _decimate(values: np.ndarray, buckets: int) -> np.ndarray | None:
+    n = len(values)
+    if buckets <= 0 or n <= _POINTS_PER_BUCKET * buckets:
+        return None
+    width = math.ceil(n / buckets)
+    rows = math.ceil(n / width)
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+
+    low = np.full(rows * width, np.inf)
+    low[:n] = np.where(missing, np.inf, values)
+    high = np.full(rows * width, -np.inf)
+    high[:n] = np.where(missing, -np.inf, values)
+
+    starts = np.arange(rows) * width
+    positions = np.concatenate([
+        starts,
+        starts + low.reshape(rows, width).argmin(axis=1),
+        starts + high.reshape(rows, width).argmax(axis=1),
+        np.minimum(starts + width - 1, n - 1),
+    ])
+    return np.unique(np.minimum(positions, n - 1))
+
+
+def _buckets(ax, downsample: bool | int) -> int:
+    if downsample is True:
+        # The figure width bounds the axes width, which tight_layout may still grow
+        return max(1, int(ax.figure.bbox.width))
+    if downsample is False or downsample is None:
+        return 0
+    if not isinstance(downsample, int) or downsample < 0:
+        raise ValueError("downsample must be a bool or a non-negative integer.")
+    return downsample
+
+
+def _points(series: pd.Series, buckets: int) -> tuple:
+    positions = _decimate(series.values, buckets)
+    if positions is None:
+        return series.index, series.values
+    return series.index[positions], series.values[positions]
+
+
+# Draw the price line and overlays; returns the data lines in drawing order
+def _draw_price(
+    ax,
+    price_series: pd.Series,
+    ma_windows: Iterable[int] | None,
+    title: str | None,
+    downsample: bool | int = True,
+) -> list:
+    buckets = _buckets(ax, downsample)
+    lines = ax.plot(*_points(price_series, buckets), label="Price", linewidth=2)
+    if ma_windows:
+        mas = moving_averages(price_series, ma_windows)
+        for window in mas.columns:
+            lines += ax.plot(*_points(mas[window], buckets), label=f"MA({window})", alpha=0.7)
+
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price")
+    ax.set_title(title or f"{price_series.name} Price Chart")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return lines
+
+
+def _draw_returns(ax, return_series: pd.Series, title: str | None, downsample: bool | int = True) -> list:
+    lines = ax.plot(*_points(return_series, _buckets(ax, downsample)), linewidth=1, alpha=0.7)
+    ax.axhline(y=0, color='r', linestyle='--', linewidth=1, alpha=0.5)
+
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Returns")
+    ax.set_title(title or f"{return_series.name if return_series.name else 'Returns'} Chart")
+    ax.grid(True, alpha=0.3)
+    return lines
+
+
+# Per-process figure templates, keyed by chart layout; least recently used
+# templates beyond _MAX_TEMPLATES are dropped and their figures cleared
+_TEMPLATES: "OrderedDict[tuple, _ChartTemplate]" = OrderedDict()
+_MAX_TEMPLATES = 4
+
+
+def _template(key: tuple) -> "_ChartTemplate":
+    template = _TEMPLATES.get(key)
+    if template is not None:
+        _TEMPLATES.move_to_end(key)
+        return template
+    template = _TEMPLATES[key] = _ChartTemplate(*key)
+    while len(_TEMPLATES) > _MAX_TEMPLATES:
+        _, evicted = _TEMPLATES.popitem(last=False)
+        evicted.fig.clear()
+    return template
+
+"""
+A figure drawn once and then refilled: later charts only replace the line
+data, axis limits and title, skipping figure, axes, legend and style setup.
+"""
+class _ChartTemplate:
+    def __init__(self, kind: str, ma_windows: tuple, figsize: tuple, dpi: int, downsample: bool | int) -> None:
+        self.kind = kind
+        self.ma_windows = ma_windows
+        self.downsample = downsample
+        self.fig, self.ax = _figure_axes(None, figsize, dpi)
+        self.lines = None
+
+    def render(self, series: pd.Series, title: str, path: str) -> None:
+        if self.lines is None:
+            if self.kind == "price":
+                self.lines = _draw_price(self.ax, series, self.ma_windows, title, self.downsample)
+            else:
+                self.lines = _draw_returns(self.ax, series, title, self.downsample)
+            self.fig.tight_layout()  # margins are computed once and kept
+        else:
+            buckets = _buckets(self.ax, self.downsample)
+            overlays = [series]
+            if self.kind == "price" and self.ma_windows:
+                mas = moving_averages(series, self.ma_windows)
+                overlays += [mas[w] for w in mas.columns]
+            for line, overlay in zip(self.lines, overlays):
+                line.set_data(*_points(overlay, buckets))
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.ax.set_title(title)
+        self.fig.savefig(path)
+
+
+"""
+Picklable per-symbol chart step for render_charts.
+"""
+class _ChartJob:
+    def __init__(
+        self,
+        out_dir: str,
+        kind: str,
+        fmt: str,
+        ma_windows: tuple,
+        figsize: tuple,
+        dpi: int,
+        downsample: bool | int,
+    ) -> None:
+        self.out_dir = out_dir
+        self.kind = kind
+        self.fmt = fmt
+        self.ma_windows = ma_windows
+        self.figsize = figsize
+        self.dpi = dpi
+        self.downsample = downsample
+
+    def __call__(self, symbol: str, data) -> str:
+        from .data import get_close_price
+
+        series = data if isinstance(data, pd.Series) else get_close_price(data)
+        if self.kind == "returns":
+            series = compute_returns(series).dropna()
+            title = f"{symbol} Returns Chart"
+        else:
+            title = f"{symbol} Price Chart"
+        validate_price_series(series)
 
+        key = (self.kind, self.ma_windows, self.figsize, self.dpi, self.downsample)
+        path = os.path.join(self.out_dir, f"{symbol.replace(os.sep, '_')}_{self.kind}.{self.fmt}")
+        _template(key).render(series, title, path)
+        return path
@@ -0,0 +1,315 @@
+"""
+profiling.py
+Opt-in instrumentation of the stocktoolkit functions: call counts, wall and
+CPU time, rows processed and bytes fetched, collected in an in-process
+registry and exported as a text summary or a Chrome trace (chrome://tracing,
+https://ui.perfetto.dev). Disabled by default; an instrumented function then
+costs one global lookup per call.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+# Profiler receiving the records, or None when profiling is disabled
+_active: "Profiler | None" = None
+
+"""
+Totals of one instrumented function.
+"""
+@dataclass
+class _Entry:
+    calls: int = 0
+    errors: int = 0
+    wall_ns: int = 0
+    cpu_ns: int = 0
+    rows: int = 0
+    nbytes: int = 0
+
+"""
+Registry of the calls recorded while this profiler is active. Thread-safe:
+calls made by download worker threads are recorded too.
+-Parameters
+--trace: bool, default False
+  Also keep one event per call, for to_chrome_trace.
+"""
+class Profiler:
+    def __init__(self, trace: bool = False) -> None:
+        self.trace = trace
+        self._entries: dict[str, _Entry] = {}
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    """
+    Call func(*args, **kwargs) and record it under name.
+    """
+    def call(self, name: str, func: Callable, args: tuple, kwargs: dict, nbytes: bool = False):
+        start, cpu = time.perf_counter_ns(), time.thread_time_ns()
+        failed = True
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._record(
+                name,
+                start,
+                time.perf_counter_ns() - start,
+                time.thread_time_ns() - cpu,
+                _rows(args, result),
+                _nbytes(result) if nbytes else 0,
+                failed,
+            )
+
+    """
+    Await func(*args, **kwargs) and record it under name. No CPU time is
+    recorded: other tasks run on the thread while the coroutine waits.
+    """
+    async def acall(self, name: str, func: Callable, args: tuple, kwargs: dict, nbytes: bool = False):
+        start = time.perf_counter_ns()
+        failed = True
+        result = None
+        try:
+            result = await func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._record(
+                name,
+                start,
+                time.perf_counter_ns() - start,
+                0,
+                _rows(args, result),
+                _nbytes(result) if nbytes else 0,
+                failed,
+            )
+
+    def _record(self, name: str, start: int, wall: int, cpu: int, rows: int, nbytes: int, failed: bool) -> None:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._entries[name] = _Entry()
+            entry.calls += 1
+            entry.errors += failed
+            entry.wall_ns += wall
+            entry.cpu_ns += cpu
+            entry.rows += rows
+            entry.nbytes += nbytes
+            if self.trace:
+                self._events.append({
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1e3,
+                    "dur": wall / 1e3,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {"rows": rows, "bytes": nbytes, "error": failed},
+                })
+
+    """
+    Recorded totals, one row per function, slowest first. Times include the
+    nested instrumented calls (e.g. validation inside a download).
+    -Returns pd.DataFrame indexed by function name with the columns calls,
+     errors, wall_s, cpu_s, mean_ms, rows and bytes.
+    """
+    def stats(self) -> pd.DataFrame:
+        with self._lock:
+            entries = {name: vars(entry).copy() for name, entry in self._entries.items()}
+        columns = ["calls", "errors", "wall_s", "cpu_s", "mean_ms", "rows", "bytes"]
+        if not entries:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name="function"))
+        df = pd.DataFrame.from_dict(entries, orient="index")
+        df.index.name = "function"
+        df["wall_s"] = df.pop("wall_ns") / 1e9
+        df["cpu_s"] = df.pop("cpu_ns") / 1e9
+        df["mean_ms"] = df["wall_s"] * 1e3 / df["calls"]
+        df["bytes"] = df.pop("nbytes")
+        return df[columns].sort_values("wall_s", ascending=False)
+
+    """
+    Text table of the recorded totals, slowest first.
+    -Parameters
+    --limit: int, optional
+      Show only the first limit functions.
+    """
+    def summary(self, limit: int | None = None) -> str:
+        df = self.stats()
+        if limit is not None:
+            df = df.head(limit)
+        lines = [f"{'function':<44}{'calls':>8}{'wall':>11}{'cpu':>11}{'mean':>11}{'rows':>12}{'bytes':>12}"]
+        # itertuples keeps the integer columns as integers (iterrows would upcast to float)
+        for row in df.itertuples():
+            lines.append(
+                f"{row.Index:<44}{row.calls:>8,}{row.wall_s:>10.3f}s{row.cpu_s:>10.3f}s"
+                f"{row.mean_ms:>9.3f}ms{row.rows:>12,}{row.bytes:>12,}"
+            )
+        return "\n".join(lines)
+
+    """
+    Recorded calls in the Chrome trace event format (complete "X" events,
+    microsecond timestamps), one track per thread.
+    -Raise ValueError if the profiler was created without trace=True.
+    """
+    def to_chrome_trace(self) -> dict:
+        if not self.trace:
+            raise ValueError("Trace events were not recorded; use trace=True.")
+        with self._lock:
+            events = list(self._events)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    """
+    Write to_chrome_trace() as JSON to path.
+    """
+    def dump_chrome_trace(self, path: str) -> None:
+        trace = self.to_chrome_trace()
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(trace, fh)
+
+    """
+    Clear the recorded totals and events.
+    """
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._events.clear()
+            self._origin = time.perf_counter_ns()
+
+
+def _size(obj) -> int:
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(len(v) for v in obj.values() if isinstance(v, (pd.DataFrame, pd.Series, np.ndarray)))
+    return 0
+
+"""
+Rows processed by a call: those of its first array-like argument, or of its
+result if it takes none (e.g. a download).
+"""
+def _rows(args: tuple, result) -> int:
+    for arg in args:
+        if isinstance(arg, (pd.DataFrame, pd.Series, np.ndarray, dict)):
+            return _size(arg)
+    return _size(result)
+
+
+def _nbytes(obj) -> int:
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(_nbytes(v) for v in obj.values())
+    return 0
+
+
+def _is_async(func) -> bool:
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+"""
+Decorator recording the calls of a function while profiling is enabled.
+-Parameters
+--name: str, optional
+  Registry name. Defaults to "<module>.<function>", e.g. "data.get_close_price".
+--nbytes: bool, default False
+  Record the in-memory size of the result as bytes fetched.
+"""
+def instrument(func: Callable | None = None, *, name: str | None = None, nbytes: bool = False):
+    if func is None:
+        return functools.partial(instrument, name=name, nbytes=nbytes)
+    label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return await func(*args, **kwargs)
+            return await profiler.acall(label, func, args, kwargs, nbytes)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler.call(label, func, args, kwargs, nbytes)
+
+    return wrapper
+
+"""
+Time the calls of a callable that cannot be decorated, such as a user
+fetcher, under name. Returns func itself when profiling is disabled.
+"""
+def traced(func: Callable, name: str, nbytes: bool = False) -> Callable:
+    profiler = _active
+    if profiler is None:
+        return func
+    if _is_async(func):
+        async def async_call(*args, **kwargs):
+            return await profiler.acall(name, func, args, kwargs, nbytes)
+
+        return async_call
+    return lambda *args, **kwargs: profiler.call(name, func, args, kwargs, nbytes)
+
+"""
+Start recording calls of the instrumented functions, process-wide.
+-Parameters
+--trace: bool, default False
+  Also keep one event per call for Chrome trace export.
+-Returns the new active Profiler.
+"""
+def enable_profiling(trace: bool = False) -> Profiler:
+    global _active
+    _active = Profiler(trace=trace)
+    return _active
+
+"""
+Stop recording.
+-Returns the Profiler that was active (None if profiling was disabled).
+"""
+def disable_profiling() -> Profiler | None:
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+"""
+The active Profiler, or None if profiling is disabled.
+"""
+def get_profiler() -> Profiler | None:
+    return _active
+
+"""
+Record the calls made inside the block in a new Profiler; the previous
+setting is restored on exit.
+
+with profile(trace=True) as prof:
+    data = download_multiple_price_data(symbols, "2024-01-01", "2024-06-30")
+print(prof.summary())
+prof.dump_chrome_trace("trace.json")
+"""
+@contextmanager
+def profile(trace: bool = False) -> Iterator[Profiler]:
+    global _active
+    previous = _active
+    profiler = Profiler(trace=trace)
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
@@ -0,0 +1,233 @@
+"""
+providers.py
+Data providers for the download functions. A provider is a fetcher
+provider(symbol, start_date, end_date, interval) -> OHLCV DataFrame, with an
+optional provider.batch(symbols, start_date, end_date, interval) returning a
+(symbol, field) panel. The download functions use the default provider
+(yfinance unless set_default_provider was called) when no fetcher is given.
+SyntheticFetcher (in synthetic.py) is the in-memory synthetic provider.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .cache import _slice_dates
+from .profiling import instrument
+from .validation import validate_symbols
+
+LOCAL_FORMATS = ("csv", "parquet")
+
+"""
+Default fetcher: download raw OHLCV data for one symbol from yfinance.
+"""
+def yfinance_fetcher(symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+    import yfinance as yf  # deferred: importing yfinance is slow and most callers never download
+
+    return yf.download(symbol, start=start_date, end=end_date, interval=interval, auto_adjust=True)
+
+"""
+Default batch fetcher: download many symbols from yfinance in a single request.
+-Returns pd.DataFrame with (symbol, field) MultiIndex columns.
+"""
+def yfinance_batch_fetcher(symbols: list[str], start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+    import yfinance as yf
+
+    return yf.download(
+        symbols,
+        start=start_date,
+        end=end_date,
+        interval=interval,
+        auto_adjust=True,
+        group_by="ticker",
+    )
+
+"""
+Provider downloading from yfinance (the default).
+"""
+class YFinanceProvider:
+    def __call__(self, symbol: str, start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        return yfinance_fetcher(symbol, start_date, end_date, interval)
+
+    def batch(self, symbols: list[str], start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        return yfinance_batch_fetcher(symbols, start_date, end_date, interval)
+
+    def __repr__(self) -> str:
+        return "YFinanceProvider()"
+
+"""
+Offline provider serving bars from a directory of per-symbol files, e.g.
+exported from a data vendor.
+Each file is read once with a bulk columnar read and kept in memory with a
+sorted DateTimeIndex; requests are then answered with two binary searches and
+a slice, without touching the disk.
+Layout: root/SYMBOL.csv or root/SYMBOL.parquet. If root/<interval>/ exists,
+files for that interval are read from it instead, e.g. root/1m/AAPL.parquet.
+CSV files hold the dates in the first column; Parquet files hold them in the
+index or in a "Date" / "Datetime" column. Reading Parquet requires pyarrow
+or fastparquet.
+Unknown symbols give an empty frame, as yfinance does for unknown tickers.
+-Parameters
+--root: str
+--fmt: {"csv", "parquet"}, optional
+  File format. By default a symbol's Parquet file is used if present, else its CSV file.
+--max_symbols: int, optional
+  Keep at most this many symbols in memory, evicting the least recently used.
+-Raise ValueError if fmt is not supported or max_symbols is not positive.
+"""
+class LocalFileProvider:
+    def __init__(self, root: str, fmt: str | None = None, max_symbols: int | None = None) -> None:
+        if fmt is not None:
+            fmt = fmt.strip().lower()
+            if fmt not in LOCAL_FORMATS:
+                raise ValueError(f"Unsupported format: {fmt!r}. Use one of {LOCAL_FORMATS}.")
+        if max_symbols is not None and (not isinstance(max_symbols, int) or max_symbols <= 0):
+            raise ValueError("max_symbols must be a positive integer.")
+        self.root = root
+        self.fmt = fmt
+        self.max_symbols = max_symbols
+        self.reads = 0
+        self._frames: OrderedDict[tuple[str, str], pd.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol: str, start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        df = self.frame(symbol, interval)
+        if df.empty:
+            return df
+        return _slice_dates(df, start_date, end_date)
+
+    """
+    Batch variant with (symbol, field) MultiIndex columns, usable as a batch_fetcher.
+    """
+    def batch(self, symbols: list[str], start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        frames = {}
+        for symbol in validate_symbols(symbols):
+            df = self(symbol, start_date, end_date, interval)
+            if not df.empty:
+                frames[symbol] = df
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    """
+    Full stored history of one symbol (empty if it has no file).
+    """
+    def frame(self, symbol: str, interval: str = "1d") -> pd.DataFrame:
+        key = (symbol.strip().upper(), interval.strip().lower())
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key]
+
+        df = self._read(*key)
+        with self._lock:
+            self._frames[key] = df
+            if self.max_symbols is not None and len(self._frames) > self.max_symbols:
+                self._frames.popitem(last=False)
+        return df
+
+    """
+    Read the files of the given symbols (default: every file for the interval) up front.
+    -Returns int: number of symbols loaded.
+    """
+    def preload(self, symbols: list[str] | None = None, interval: str = "1d") -> int:
+        symbols = self.symbols(interval) if symbols is None else validate_symbols(symbols)
+        return sum(not self.frame(s, interval).empty for s in symbols)
+
+    """
+    Symbols that have a file for the interval, sorted.
+    """
+    def symbols(self, interval: str = "1d") -> list[str]:
+        directory = self._directory(interval.strip().lower())
+        formats = (self.fmt,) if self.fmt else LOCAL_FORMATS
+        found = set()
+        for name in os.listdir(directory):
+            stem, ext = os.path.splitext(name)
+            if ext[1:].lower() in formats:
+                found.add(stem.upper())
+        return sorted(found)
+
+    def _directory(self, interval: str) -> str:
+        directory = os.path.join(self.root, interval)
+        return directory if os.path.isdir(directory) else self.root
+
+    def _path(self, symbol: str, interval: str) -> tuple[str, str] | None:
+        directory = self._directory(interval)
+        for fmt in (self.fmt,) if self.fmt else ("parquet", "csv"):
+            path = os.path.join(directory, f"{symbol}.{fmt}")
+            if os.path.isfile(path):
+                return path, fmt
+        return None
+
+    def _read(self, symbol: str, interval: str) -> pd.DataFrame:
+        found = self._path(symbol, interval)
+        if found is None:
+            return pd.DataFrame()
+        path, fmt = found
+        self.reads += 1
+        if fmt == "csv":
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+        else:
+            df = pd.read_parquet(path)
+            for column in ("Date", "Datetime"):
+                if column in df.columns and not isinstance(df.index, pd.DatetimeIndex):
+                    df = df.set_index(column)
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.to_datetime(df.index)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="stable")
+        return df
+
+    def __repr__(self) -> str:
+        return f"LocalFileProvider({self.root!r})"
+
+
+_default_provider = None
+
+"""
+Provider used by the download functions when no fetcher is given.
+-Returns the provider set with set_default_provider, or a YFinanceProvider.
+"""
+@instrument
+def get_default_provider():
+    return _default_provider if _default_provider is not None else YFinanceProvider()
+
+"""
+Route every download without an explicit fetcher through this provider,
+e.g. a LocalFileProvider on an air-gapped cluster or SyntheticFetcher in tests.
+-Parameters
+--provider: callable or None
+  provider(symbol, start_date, end_date, interval) -> pd.DataFrame, optionally
+  with a .batch method. None restores yfinance.
+-Returns the previous provider (None for the yfinance default).
+-Raise TypeError if provider is not callable.
+"""
+@instrument
+def set_default_provider(provider):
+    global _default_provider
+    if provider is not None and not callable(provider):
+        raise TypeError(f"provider must be callable, got {type(provider)} instead.")
+    previous = _default_provider
+    _default_provider = provider
+    return previous
+
+"""
+Batch fetcher of a provider: its .batch method, or one call per symbol joined
+into a (symbol, field) panel for providers without one.
+"""
+def batch_fetcher_of(provider):
+    batch = getattr(provider, "batch", None)
+    if callable(batch):
+        return batch
+
+    def fetch_each(symbols: list[str], start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        frames = {}
+        for symbol in symbols:
+            df = provider(symbol, start_date, end_date, interval)
+            if df is not None and not df.empty:
+                frames[symbol] = df
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    return fetch_each
@@ -0,0 +1,119 @@
+"""
+store.py
+Local columnar price store. Frames are written as one .npy file per column and
+reopened through read-only memory maps, so loading is zero-copy: pages are read
+from disk only when touched, and processes opening the same symbol share the
+same physical pages through the OS page cache.
+"""
+
+import os
+import shutil
+from urllib.parse import quote
+
+import pandas as pd
+
+from ._columnar import read_frame, read_meta, write_frame
+from .validation import validate_price_dataframe, validate_symbols
+
+"""
+Directory of price frames keyed by symbol and interval.
+-Parameters
+--root: str
+  Store directory, created if missing. Layout: root/SYMBOL/interval/, with
+  characters such as path separators percent-encoded in SYMBOL (BRK/B is
+  stored as BRK%2FB).
+Writes replace a symbol atomically (a new directory is renamed into place);
+readers that already mapped the old files keep seeing the old data. Use one
+writer per symbol at a time.
+"""
+class PriceStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol: str, interval: str) -> str:
+        # Reversible, unlike replacing separators: BRK/B and BRK_B stay distinct
+        directory = quote(symbol.strip().upper(), safe="-_^=")
+        if directory in (".", ".."):
+            directory = directory.replace(".", "%2E")
+        return os.path.join(self.root, directory, interval.strip().lower())
+
+    """
+    Store one price frame, replacing any previous data for the symbol and interval.
+    -Parameters
+    --symbol: str
+    --df: pd.DataFrame
+      OHLCV frame with a DateTimeIndex, e.g. from download_price_data.
+    --interval: str, default "1d"
+    -Returns int: number of bytes written.
+    """
+    def write(self, symbol: str, df: pd.DataFrame, interval: str = "1d") -> int:
+        validate_price_dataframe(df, symbol)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return write_frame(self._path(symbol, interval), df, extra={"symbol": symbol.strip().upper()})
+
+    """
+    Store every frame of a symbol -> frame mapping, e.g. from download_multiple_price_data.
+    -Returns int: total number of bytes written.
+    """
+    def write_many(self, data: dict[str, pd.DataFrame], interval: str = "1d") -> int:
+        return sum(self.write(symbol, df, interval) for symbol, df in data.items())
+
+    """
+    Open a stored frame.
+    -Parameters
+    --symbol: str
+    --interval: str, default "1d"
+    --mmap: bool, default True
+      If True, columns and index are read-only memory maps; otherwise the
+      frame is read into RAM.
+    -Returns pd.DataFrame with the stored columns and DateTimeIndex.
+    -Raise KeyError if the symbol is not stored for this interval.
+    """
+    def open(self, symbol: str, interval: str = "1d", mmap: bool = True) -> pd.DataFrame:
+        df = read_frame(self._path(symbol, interval), mmap=mmap)
+        if df is None:
+            raise KeyError(f"No stored data for symbol {symbol!r} at interval {interval!r}.")
+        return df
+
+    """
+    Open several stored frames.
+    -Parameters
+    --symbols: list[str], optional
+      Defaults to every symbol stored for the interval.
+    --interval: str, default "1d"
+    --mmap: bool, default True
+    -Returns dict[str, pd.DataFrame]: Mapping from symbol -> price DataFrame.
+    """
+    def open_many(
+        self,
+        symbols: list[str] | None = None,
+        interval: str = "1d",
+        mmap: bool = True,
+    ) -> dict[str, pd.DataFrame]:
+        symbols = self.symbols(interval) if symbols is None else validate_symbols(symbols)
+        return {s: self.open(s, interval, mmap) for s in symbols}
+
+    """
+    Symbols stored for an interval, sorted.
+    """
+    def symbols(self, interval: str = "1d") -> list[str]:
+        interval = interval.strip().lower()
+        found = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                meta = read_meta(os.path.join(entry.path, interval)) if entry.is_dir() else None
+                if meta is not None:
+                    found.append(meta["extra"].get("symbol", entry.name))
+        return sorted(found)
+
+    def __contains__(self, symbol: str) -> bool:
+        return read_meta(self._path(symbol, "1d")) is not None
+
+    """
+    Remove a symbol, for one interval or for all of them.
+    """
+    def delete(self, symbol: str, interval: str | None = None) -> None:
+        path = self._path(symbol, interval or "1d")
+        shutil.rmtree(path if interval is not None else os.path.dirname(path), ignore_errors=True)
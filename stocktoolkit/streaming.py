@@ -0,0 +1,211 @@
+"""
+streaming.py
+Online (per-bar) counterparts of the indicators in indicators.py.
+Each update costs O(1), so live feeds do not recompute the whole rolling window.
+"""
+
+import math
+
+import pandas as pd
+
+from .validation import validate_price_series, validate_ma_window
+
+# Running sums are rebuilt from the ring buffer once per this many windows of
+# updates, so floating-point drift cannot accumulate over long feeds.
+_RESYNC_WINDOWS = 64
+
+"""
+Incremental simple or log returns.
+-Parameters
+--method : {"simple", "log"}, default "simple"
+"""
+class OnlineReturns:
+    __slots__ = ("method", "previous", "value")
+
+    def __init__(self, method: str = "simple") -> None:
+        if method not in ("simple", "log"):
+            raise ValueError(f"Unsupported method: {method!r}. Use 'simple' or 'log'.")
+        self.method = method
+        self.previous = math.nan
+        self.value = math.nan
+
+    """
+    Seed the state with the last price of a historical series.
+    """
+    @classmethod
+    def from_series(cls, price_series: pd.Series, method: str = "simple") -> "OnlineReturns":
+        validate_price_series(price_series)
+        state = cls(method)
+        state.previous = float(price_series.iloc[-1])
+        return state
+
+    """
+    Add one price and return the return versus the previous price
+    (NaN for the first price, when either price is missing or the previous price is 0).
+    """
+    def update(self, price: float) -> float:
+        price = float(price)
+        if self.previous == 0.0:
+            self.value = math.nan
+        elif self.method == "simple":
+            self.value = price / self.previous - 1.0
+        else:
+            ratio = price / self.previous
+            self.value = math.log(ratio) if ratio > 0 else math.nan
+        self.previous = price
+        return self.value
+
+
+"""
+Shared ring-buffer state for fixed-size rolling windows. NaN values occupy a
+slot but are excluded from the running statistics; the output is NaN while
+any NaN is inside the window, as with pandas rolling().
+"""
+class _RollingWindow:
+    __slots__ = ("window", "ring", "head", "filled", "nan_count", "updates")
+
+    def __init__(self, window: int) -> None:
+        validate_ma_window(window)
+        self.window = window
+        self.ring = [math.nan] * window
+        self.head = 0
+        self.filled = 0
+        self.nan_count = 0
+        self.updates = 0
+
+    def _push(self, x: float) -> float:
+        # Store x in the ring and return the value it evicted (NaN if none)
+        old = self.ring[self.head] if self.filled == self.window else math.nan
+        if self.filled == self.window and math.isnan(old):
+            self.nan_count -= 1
+        self.ring[self.head] = x
+        self.head = (self.head + 1) % self.window
+        self.filled = min(self.filled + 1, self.window)
+        if math.isnan(x):
+            self.nan_count += 1
+        self.updates += 1
+        return old
+
+    def _ready(self) -> bool:
+        return self.filled == self.window and self.nan_count == 0
+
+    def _needs_resync(self) -> bool:
+        return self.updates % (self.window * _RESYNC_WINDOWS) == 0
+
+    def _seed(self, price_series: pd.Series) -> None:
+        validate_price_series(price_series)
+        for x in price_series.iloc[-self.window:].to_numpy(dtype=float):
+            self.update(x)
+
+    def update(self, x: float) -> float:
+        raise NotImplementedError
+
+
+"""
+Online simple moving average over a fixed window.
+-Parameters
+--window : int
+"""
+class OnlineSMA(_RollingWindow):
+    __slots__ = ("total", "value")
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        self.total = 0.0
+        self.value = math.nan
+
+    """
+    Seed the state with the last `window` values of a historical series, so
+    later updates match moving_average on the extended series.
+    """
+    @classmethod
+    def from_series(cls, price_series: pd.Series, window: int) -> "OnlineSMA":
+        state = cls(window)
+        state._seed(price_series)
+        return state
+
+    """
+    Add one price and return the current moving average (NaN until a full
+    window of non-missing prices is available).
+    """
+    def update(self, price: float) -> float:
+        price = float(price)
+        old = self._push(price)
+        if not math.isnan(old):
+            self.total -= old
+        if not math.isnan(price):
+            self.total += price
+        if self._needs_resync():
+            self.total = math.fsum(x for x in self.ring if not math.isnan(x))
+
+        self.value = self.total / self.window if self._ready() else math.nan
+        return self.value
+
+
+"""
+Online rolling standard deviation (ddof=1) over a fixed window, updated with
+Welford-style add/remove steps.
+-Parameters
+--window : int
+"""
+class OnlineRollingVolatility(_RollingWindow):
+    __slots__ = ("count", "mean", "m2", "value")
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.value = math.nan
+
+    """
+    Seed the state with the last `window` values of a historical return series,
+    so later updates match rolling_volatility on the extended series.
+    """
+    @classmethod
+    def from_series(cls, return_series: pd.Series, window: int) -> "OnlineRollingVolatility":
+        state = cls(window)
+        state._seed(return_series)
+        return state
+
+    """
+    Add one return and return the current rolling volatility (NaN until a full
+    window of non-missing returns is available).
+    """
+    def update(self, value: float) -> float:
+        value = float(value)
+        old = self._push(value)
+        if not math.isnan(old):
+            self._remove(old)
+        if not math.isnan(value):
+            self._add(value)
+        if self._needs_resync():
+            self._recompute()
+
+        if self._ready() and self.window > 1:
+            self.value = math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+        else:
+            self.value = math.nan
+        return self.value
+
+    def _add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (x - self.mean)
+
+    def _recompute(self) -> None:
+        values = [x for x in self.ring if not math.isnan(x)]
+        self.count = len(values)
+        self.mean = math.fsum(values) / self.count if values else 0.0
+        self.m2 = math.fsum((x - self.mean) ** 2 for x in values)
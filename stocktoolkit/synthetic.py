@@ -0,0 +1,246 @@
+"""
+synthetic.py
+Synthetic OHLCV data and an offline fetcher, for tests, benchmarks and
+air-gapped environments.
+"""
+
+import asyncio
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .validation import validate_symbols
+
+# yfinance interval -> pandas frequency of the generated bars
+INTERVAL_FREQ = {
+    "1m": "min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "h",
+    "1d": "B",
+    "1wk": "W-FRI",
+    "1mo": "MS",
+}
+
+"""
+Generate a random-walk OHLCV frame.
+-Parameters
+--n_bars: int
+  Number of bars.
+--start: str, default "2000-01-03"
+  Timestamp of the first bar.
+--freq: str, default "B"
+  Pandas frequency of the bars, e.g. "B" (business days) or "min".
+--seed: int, default 0
+--start_price: float, default 100.0
+--volatility: float, default 0.01
+  Standard deviation of the log return per bar.
+-Returns pd.DataFrame with Open, High, Low, Close (float64) and Volume (int64) columns.
+"""
+def make_ohlcv(
+    n_bars: int,
+    start: str = "2000-01-03",
+    freq: str = "B",
+    seed: int = 0,
+    start_price: float = 100.0,
+    volatility: float = 0.01,
+) -> pd.DataFrame:
+    index = pd.date_range(start, periods=n_bars, freq=freq, name="Date")
+    return _ohlcv_for_index(index, seed, start_price, volatility)
+
+
+def _ohlcv_for_index(
+    index: pd.DatetimeIndex,
+    seed: int,
+    start_price: float = 100.0,
+    volatility: float = 0.01,
+) -> pd.DataFrame:
+    n = len(index)
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, n)))
+    open_ = np.empty(n)
+    open_[:1] = start_price
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0.0, volatility / 2, n))
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + spread),
+            "Low": np.minimum(open_, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(10_000, 1_000_000, n, dtype=np.int64),
+        },
+        index=index,
+    )
+
+"""
+Generate OHLCV frames for a universe of synthetic symbols sharing one calendar.
+-Parameters
+--n_symbols: int
+--n_bars: int
+--freq: str, default "B"
+--seed: int, default 0
+-Returns dict[str, pd.DataFrame] keyed "SYM0000", "SYM0001", ...
+"""
+def make_universe(
+    n_symbols: int,
+    n_bars: int,
+    freq: str = "B",
+    seed: int = 0,
+) -> dict[str, pd.DataFrame]:
+    index = pd.date_range("2000-01-03", periods=n_bars, freq=freq, name="Date")
+    return {
+        f"SYM{i:04d}": _ohlcv_for_index(index, seed + i)
+        for i in range(n_symbols)
+    }
+
+# Synthetic histories start in this year; the walk is generated per calendar year
+_ORIGIN_YEAR = 1900
+
+
+@lru_cache(maxsize=None)
+def _bars_per_year(freq: str) -> int:
+    return len(pd.date_range("2001-01-01", "2002-01-01", freq=freq, inclusive="left"))
+
+
+# Building business-day calendars dominates generation time; share them across symbols
+@lru_cache(maxsize=256)
+def _year_index(year: int, freq: str) -> pd.DatetimeIndex:
+    return pd.date_range(
+        pd.Timestamp(year=year, month=1, day=1),
+        pd.Timestamp(year=year + 1, month=1, day=1),
+        freq=freq,
+        inclusive="left",
+        name="Date",
+    )
+
+"""
+Bars of one calendar year for a symbol. The log price at each year start is a
+random walk over years, and each year's path is a Brownian bridge between its
+start level and the next year's, so any date range can be generated without
+the years before it while staying continuous and deterministic.
+"""
+def _synthetic_year(
+    symbol_seed: int,
+    year: int,
+    freq: str,
+    start_price: float = 100.0,
+    volatility: float = 0.01,
+) -> pd.DataFrame:
+    index = _year_index(year, freq)
+    n = len(index)
+    if n == 0:
+        return pd.DataFrame(index=index, columns=["Open", "High", "Low", "Close", "Volume"])
+
+    offset = max(year - _ORIGIN_YEAR, 0)
+    level_rng = np.random.default_rng([symbol_seed, 0])
+    yearly = level_rng.normal(0.0, volatility * np.sqrt(_bars_per_year(freq)), offset + 2)
+    yearly[0] = 0.0
+    start_level, end_level = np.cumsum(yearly)[offset:offset + 2]
+
+    rng = np.random.default_rng([symbol_seed, year, n])
+    steps = np.cumsum(rng.normal(0.0, volatility, n))
+    t = np.arange(1, n + 1) / n
+    log_close = start_level + steps - t * steps[-1] + t * (end_level - start_level)
+
+    close = start_price * np.exp(log_close)
+    open_ = np.empty(n)
+    open_[0] = start_price * np.exp(start_level)
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0.0, volatility / 2, n))
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + spread),
+            "Low": np.minimum(open_, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(10_000, 1_000_000, n, dtype=np.int64),
+        },
+        index=index,
+    )
+
+"""
+Offline fetcher returning deterministic synthetic bars, usable wherever a
+fetcher(symbol, start_date, end_date, interval) is accepted.
+The same symbol always gives the same prices for the same dates.
+-Parameters
+--latency: float, default 0.0
+  Seconds slept per call, to simulate network round-trips.
+--fail: iterable of str, optional
+  Symbols for which an empty frame is returned (as yfinance does for unknown tickers).
+--seed: int, default 0
+"""
+class SyntheticFetcher:
+    def __init__(self, latency: float = 0.0, fail=(), seed: int = 0) -> None:
+        self.latency = latency
+        self.fail = {s.upper() for s in fail}
+        self.seed = seed
+        self.calls = 0
+
+    def _frame(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        freq = INTERVAL_FREQ.get(interval, "B")
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date)
+        if start >= end:
+            return pd.DataFrame()
+
+        symbol_seed = self.seed + zlib.crc32(symbol.encode())
+        frames = []
+        for year in range(start.year, (end - pd.Timedelta(1, "ns")).year + 1):
+            df = _synthetic_year(symbol_seed, year, freq)
+            frames.append(df.iloc[df.index.searchsorted(start):df.index.searchsorted(end)])
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def __call__(self, symbol: str, start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        symbol = symbol.upper()
+        if symbol in self.fail:
+            return pd.DataFrame()
+        return self._frame(symbol, start_date, end_date, interval)
+
+    """
+    Batch variant with (symbol, field) MultiIndex columns, usable as a batch_fetcher.
+    """
+    def batch(self, symbols: list[str], start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        frames = {
+            s: self._frame(s, start_date, end_date, interval)
+            for s in validate_symbols(symbols)
+            if s not in self.fail
+        }
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+"""
+Async variant of SyntheticFetcher, usable as a fetcher of the *_async download
+functions. Latency is awaited with asyncio.sleep, so concurrent calls overlap
+on one event loop; in_flight / max_in_flight count the calls running at once.
+"""
+class AsyncSyntheticFetcher(SyntheticFetcher):
+    def __init__(self, latency: float = 0.0, fail=(), seed: int = 0) -> None:
+        super().__init__(latency, fail, seed)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, symbol: str, start_date: str, end_date: str, interval: str = "1d") -> pd.DataFrame:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        symbol = symbol.upper()
+        if symbol in self.fail:
+            return pd.DataFrame()
+        return self._frame(symbol, start_date, end_date, interval)
@@ -3,11 +3,74 @@ validation.py
 Input validation & Error handling for stocktoolkit package
 """
 
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable
+from typing import Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
+from .profiling import instrument
+
+# When True, price series / frame / panel checks are skipped entirely
+_TRUSTED = False
+
+# id(obj) -> weak reference, for objects marked with mark_validated
+_VALIDATED: dict[int, weakref.ref] = {}
+
+# Elements per NaN-scan block: bounds the temporary mask to a few KB
+_NAN_SCAN_BLOCK = 8192
+
+"""
+Skip price series, DataFrame and panel validation globally, for production
+batch runs whose inputs are known to be well formed.
+-Parameters
+--enabled: bool
+-Returns bool: the previous setting.
+"""
+def set_trusted_inputs(enabled: bool) -> bool:
+    global _TRUSTED
+    previous = _TRUSTED
+    _TRUSTED = bool(enabled)
+    return previous
+
+"""
+Context manager version of set_trusted_inputs: validation is skipped inside
+the block and the previous setting is restored on exit. The setting is
+process-wide, so it also applies to threads running meanwhile.
+"""
+@contextmanager
+def trusted_inputs(enabled: bool = True) -> Iterator[None]:
+    previous = set_trusted_inputs(enabled)
+    try:
+        yield
+    finally:
+        set_trusted_inputs(previous)
+
+"""
+Mark a price series, DataFrame or panel as already validated, so that the
+validate_price_* functions return immediately for this object. The mark
+lasts as long as the object; modifying it in place afterwards is not detected.
+-Returns the object itself.
+"""
+@instrument
+def mark_validated(obj):
+    key = id(obj)
+    _VALIDATED[key] = weakref.ref(obj, lambda _, key=key: _VALIDATED.pop(key, None))
+    return obj
+
+"""
+Return True if validation is currently skipped for obj, either because it was
+marked with mark_validated or because trusted mode is on.
+"""
+def is_validated(obj) -> bool:
+    if _TRUSTED:
+        return True
+    ref = _VALIDATED.get(id(obj))
+    return ref is not None and ref() is obj
+
 """
 Validate date string is in 'YYYY-MM-DD' format.
 -Raises ValueError if the string is not in the correct format.
@@ -27,7 +90,10 @@ Validate that the downloaded price dataframe is not empty and has a DateTimeInde
 --symbol : str, optional -> Symbol used to download the data.
 -Raises ValueError if the DataFrame is empty or index is not a DateTimeIndex.
 """
+@instrument
 def validate_price_dataframe(df: pd.DataFrame, symbol: str | None = None) -> None:
+    if is_validated(df):
+        return
     if df is None or df.empty:
         if symbol:
             raise ValueError(
@@ -45,7 +111,10 @@ Validate that the input is a non-empty price series with a DateTimeIndex.
 -Raises TypeError if the input is not a pandas Series
 -Raises ValueError if the series is empty or contains only NaN values.
 """
+@instrument
 def validate_price_series(price_series: pd.Series) -> None:
+    if is_validated(price_series):
+        return
     if not isinstance(price_series, pd.Series):
         raise TypeError(
             f"price_series must be a pandas Series, got {type(price_series)} instead."
@@ -54,9 +123,50 @@ def validate_price_series(price_series: pd.Series) -> None:
         raise ValueError("price_series is empty.")
     if not isinstance(price_series.index, pd.DatetimeIndex):
         raise ValueError("price_series must have a DateTimeIndex.")
-    if price_series.dropna().empty:
+    if not _has_value(price_series):
         raise ValueError("price_series contains only NaN values.")
+
+# True if the series has at least one non-missing value, without copying it
+def _has_value(series: pd.Series) -> bool:
+    if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in "fiub":
+        return bool(series.notna().any())
+    if series.dtype.kind != "f":
+        return True  # integer and bool arrays cannot hold NaN
+    values = series.to_numpy()
+    # Real prices almost always have a value at one end
+    if not (np.isnan(values[0]) and np.isnan(values[-1])):
+        return True
+    for start in range(0, len(values), _NAN_SCAN_BLOCK):
+        if not np.isnan(values[start:start + _NAN_SCAN_BLOCK]).all():
+            return True
+    return False
     
+"""
+Validate that the input is a non-empty 2-D price panel (dates x symbols).
+-Parameters
+--panel: pd.DataFrame with a DateTimeIndex, or 2-D np.ndarray
+-Raises TypeError if the input is neither a DataFrame nor a NumPy array
+-Raises ValueError if the panel is empty, not 2-D, or a DataFrame without DateTimeIndex.
+"""
+@instrument
+def validate_price_panel(panel: pd.DataFrame | np.ndarray) -> None:
+    if is_validated(panel):
+        return
+    if isinstance(panel, pd.DataFrame):
+        if panel.empty:
+            raise ValueError("price panel is empty.")
+        if not isinstance(panel.index, pd.DatetimeIndex):
+            raise ValueError("price panel must have a DateTimeIndex.")
+    elif isinstance(panel, np.ndarray):
+        if panel.ndim != 2:
+            raise ValueError(f"price panel must be 2-D, got {panel.ndim} dimension(s).")
+        if panel.size == 0:
+            raise ValueError("price panel is empty.")
+    else:
+        raise TypeError(
+            f"price panel must be a pandas DataFrame or NumPy array, got {type(panel)} instead."
+        )
+
 """
 Validate that window is an positive integer
 -Raise TypeError if window is not an integer
@@ -86,3 +196,216 @@ def validate_symbols(symbols: str | Iterable[str]) -> list[str]:
     return result
 
 
+# Columns checked for NaN ratios and non-positive values (Volume is not)
+_PRICE_FIELDS = {"open", "high", "low", "close", "adj close"}
+
+_STAT_COLUMNS = ["rows", "datetime_index", "monotonic", "duplicates", "nan_ratio", "non_positive"]
+
+"""
+Per-symbol outcome of validate_price_universe.
+--stats: pd.DataFrame indexed by symbol, in input order, with columns
+  rows, datetime_index, monotonic, duplicates, nan_ratio and non_positive.
+--issues: mapping symbol -> list of problems; symbols without problems are absent.
+"""
+@dataclass
+class ValidationReport:
+    stats: pd.DataFrame
+    issues: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def valid(self) -> list[str]:
+        return [s for s in self.stats.index if s not in self.issues]
+
+    @property
+    def invalid(self) -> list[str]:
+        return list(self.issues)
+
+"""
+Screen a whole universe of price data in one sweep and report every problem
+per symbol instead of raising on the first bad ticker.
+Checks: symbol names, emptiness, DateTimeIndex, sorted index, duplicate
+timestamps, ratio of missing price values, and non-positive prices.
+A (symbol, field) or dates x symbols panel is checked with a few array
+reductions over the whole panel; a dict is checked frame by frame with
+index checks shared between frames that use the same index object.
+-Parameters
+--data: dict[str, pd.DataFrame | pd.Series] or pd.DataFrame
+  Mapping symbol -> price frame (e.g. from download_multiple_price_data), a
+  (symbol, field) panel (e.g. from download_price_panel) or a dates x symbols
+  panel of prices. For panels, a symbol's rows are the dates on which it has a bar.
+--max_nan_ratio: float, default 0.5
+  Largest accepted fraction of missing values in the price columns
+  (Open, High, Low, Close, Adj Close; all columns for a dates x symbols panel).
+--mark: bool, default False
+  If True, the frames of a dict that pass every check are marked with
+  mark_validated so later validate_price_* calls skip them.
+-Returns ValidationReport
+-Raise TypeError if data is neither a dict nor a DataFrame.
+-Raise ValueError if max_nan_ratio is not between 0 and 1.
+"""
+@instrument
+def validate_price_universe(
+    data: dict[str, pd.DataFrame | pd.Series] | pd.DataFrame,
+    max_nan_ratio: float = 0.5,
+    mark: bool = False,
+) -> ValidationReport:
+    if not 0 <= max_nan_ratio <= 1:
+        raise ValueError("max_nan_ratio must be between 0 and 1.")
+    if isinstance(data, pd.DataFrame):
+        stats = _panel_stats(data)
+    elif isinstance(data, dict):
+        stats = _frame_stats(data)
+    else:
+        raise TypeError(
+            f"data must be a dict of price frames or a DataFrame panel, got {type(data)} instead."
+        )
+
+    issues = _collect_issues(stats, max_nan_ratio)
+    if mark and isinstance(data, dict):
+        for symbol, obj in data.items():
+            if symbol not in issues and isinstance(obj, (pd.DataFrame, pd.Series)):
+                mark_validated(obj)
+    return ValidationReport(stats=stats, issues=issues)
+
+
+def _index_stats(index: pd.Index) -> tuple[bool, bool, int]:
+    is_datetime = isinstance(index, pd.DatetimeIndex)
+    duplicates = int(index.duplicated().sum()) if index.has_duplicates else 0
+    return is_datetime, bool(index.is_monotonic_increasing), duplicates
+
+
+def _price_mask(columns: pd.Index) -> np.ndarray:
+    from .data import _column_fields
+
+    codes, fields = pd.factorize(_column_fields(columns))
+    is_price = np.array([str(f).lower() in _PRICE_FIELDS for f in fields], dtype=bool)
+    return is_price[codes]
+
+
+def _frame_stats(data: dict) -> pd.DataFrame:
+    # id(index) -> (index, stats); holding the index keeps its id from being reused
+    index_cache: dict[int, tuple[pd.Index, tuple[bool, bool, int]]] = {}
+    columns, mask = None, None
+    rows = []
+    for symbol, obj in data.items():
+        if isinstance(obj, (pd.Series, pd.DataFrame)):
+            index = obj.index  # to_frame builds a new index object
+        if isinstance(obj, pd.Series):
+            obj = obj.to_frame()
+            columns, mask = None, np.ones(1, dtype=bool)
+        elif isinstance(obj, pd.DataFrame):
+            # Consecutive frames usually have the same columns
+            if columns is None or not (obj.columns is columns or obj.columns.equals(columns)):
+                columns, mask = obj.columns, _price_mask(obj.columns)
+        else:
+            rows.append((symbol, 0, False, False, 0, np.nan, 0))
+            continue
+
+        # Frames of one download or store often share their index object
+        if id(index) not in index_cache:
+            index_cache[id(index)] = (index, _index_stats(index))
+        is_datetime, monotonic, duplicates = index_cache[id(index)][1]
+
+        nan_ratio, non_positive = np.nan, 0
+        if len(obj) and mask.any():
+            try:
+                prices = obj.to_numpy(dtype=np.float64)[:, mask]
+            except (TypeError, ValueError):
+                prices = None  # non-numeric columns: reported as all missing
+            if prices is None:
+                nan_ratio = 1.0
+            else:
+                missing = np.count_nonzero(np.isnan(prices))
+                nan_ratio = missing / prices.size
+                non_positive = np.count_nonzero(prices <= 0)
+        rows.append((symbol, len(obj), is_datetime, monotonic, duplicates, nan_ratio, non_positive))
+
+    stats = pd.DataFrame.from_records(rows, columns=["symbol"] + _STAT_COLUMNS)
+    return stats.set_index("symbol")
+
+
+def _panel_stats(panel: pd.DataFrame) -> pd.DataFrame:
+    if isinstance(panel.columns, pd.MultiIndex):
+        symbols = panel.columns.get_level_values(0)
+        mask = _price_mask(panel.columns)
+    else:
+        symbols = panel.columns
+        mask = np.ones(panel.shape[1], dtype=bool)
+    codes, labels = pd.factorize(symbols, sort=False)
+    n_symbols = len(labels)
+
+    # One row per column: to_numpy() of a frame is column-major, so .T is contiguous
+    try:
+        values = panel.to_numpy(dtype=np.float64).T
+    except (TypeError, ValueError):
+        values = np.full(panel.shape[::-1], np.nan)
+    present = ~np.isnan(values)
+    n_rows = len(panel)
+
+    # Rows on which each symbol has at least one value
+    if present.all():
+        bars = np.full(n_symbols, n_rows, dtype=np.int64)
+    else:
+        order = np.argsort(codes, kind="stable")
+        starts = np.searchsorted(codes[order], np.arange(n_symbols))
+        grouped = present if (np.diff(codes) >= 0).all() else present[order]
+        bars = np.count_nonzero(np.logical_or.reduceat(grouped, starts, axis=0), axis=1)
+
+    # Missing and non-positive price values per symbol, counted on rows with a bar;
+    # every column is missing on the rows where its symbol has no bar at all
+    counted = mask.astype(np.float64)
+    missing = n_rows - np.count_nonzero(present, axis=1) - (n_rows - bars[codes])
+    with np.errstate(invalid="ignore"):
+        non_positive = np.count_nonzero(values <= 0, axis=1)
+    checked = np.bincount(codes, counted, n_symbols) * bars
+    missing = np.bincount(codes, counted * missing, n_symbols)
+    non_positive = np.bincount(codes, counted * non_positive, n_symbols)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        nan_ratio = np.where(checked > 0, missing / checked, np.nan)
+
+    # The index is shared: check it once
+    is_datetime, monotonic, duplicates = _index_stats(panel.index)
+    stats = pd.DataFrame({
+        "rows": bars.astype(np.int64),
+        "datetime_index": is_datetime,
+        "monotonic": monotonic,
+        "duplicates": duplicates,
+        "nan_ratio": nan_ratio,
+        "non_positive": non_positive.astype(np.int64),
+    }, index=pd.Index(labels, name="symbol"))
+    return stats
+
+
+def _collect_issues(stats: pd.DataFrame, max_nan_ratio: float) -> dict[str, list[str]]:
+    issues: dict[str, list[str]] = {}
+
+    def add(mask: np.ndarray, message) -> None:
+        for i in np.flatnonzero(mask):
+            symbol = stats.index[i]
+            issues.setdefault(symbol, []).append(message(i) if callable(message) else message)
+
+    symbols = stats.index.to_numpy()
+    rows = stats["rows"].to_numpy()
+    nan_ratio = stats["nan_ratio"].to_numpy(dtype=np.float64)
+    duplicates = stats["duplicates"].to_numpy()
+    non_positive = stats["non_positive"].to_numpy()
+
+    add(np.array([not (isinstance(s, str) and s.strip()) for s in symbols], dtype=bool),
+        "symbol is not a non-empty string")
+    normalized = pd.Series([str(s).strip().upper() for s in symbols])
+    add(normalized.duplicated(keep=False).to_numpy(), "symbol is duplicated after normalization")
+    add(rows == 0, "no data")
+    has_rows = rows > 0
+    add(has_rows & ~stats["datetime_index"].to_numpy(dtype=bool), "index is not a DateTimeIndex")
+    add(has_rows & ~stats["monotonic"].to_numpy(dtype=bool), "index is not sorted")
+    add(duplicates > 0, lambda i: f"{duplicates[i]} duplicate timestamps")
+    add(has_rows & (nan_ratio >= 1), "contains only NaN values")
+    add(has_rows & (nan_ratio > max_nan_ratio) & (nan_ratio < 1),
+        lambda i: f"NaN ratio {nan_ratio[i]:.2f} exceeds {max_nan_ratio:.2f}")
+    add(non_positive > 0, lambda i: f"{non_positive[i]} non-positive prices")
+
+    return {s: issues[s] for s in stats.index if s in issues}
@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.aio import download_multiple_price_data_async, download_price_data_async
+from stocktoolkit.concurrency import DownloadReport
+from stocktoolkit.data import compact_price_frame, download_multiple_price_data
+from stocktoolkit.synthetic import AsyncSyntheticFetcher, SyntheticFetcher
+
+START, END = "2024-01-01", "2024-03-01"
+
+
+class TestAsyncDownloads(unittest.IsolatedAsyncioTestCase):
+
+    # ---------- download_price_data_async ----------
+
+    async def test_single_symbol(self):
+        fetcher = AsyncSyntheticFetcher()
+        df = await download_price_data_async(" aapl ", START, END, fetcher=fetcher, compact=True)
+        self.assertIsInstance(df.index, pd.DatetimeIndex)
+        self.assertEqual(df["Close"].dtype, np.float32)
+        pd.testing.assert_frame_equal(df, compact_price_frame(SyntheticFetcher()("AAPL", START, END)))
+
+    async def test_single_symbol_validation(self):
+        with self.assertRaises(ValueError):
+            await download_price_data_async("AAPL", "2024/01/01", END, fetcher=AsyncSyntheticFetcher())
+        with self.assertRaises(ValueError):
+            await download_price_data_async("BAD", START, END, fetcher=AsyncSyntheticFetcher(fail=["BAD"]))
+        with self.assertRaises(TimeoutError):
+            await download_price_data_async("AAPL", START, END, fetcher=AsyncSyntheticFetcher(1.0), timeout=0.01)
+
+    # ---------- download_multiple_price_data_async ----------
+
+    async def test_matches_sync_download_in_input_order(self):
+        symbols = ["msft", "AAPL", "nvda", "AAPL"]
+        result = await download_multiple_price_data_async(symbols, START, END, fetcher=AsyncSyntheticFetcher())
+        expected = download_multiple_price_data(symbols[:3], START, END, fetcher=SyntheticFetcher())
+        self.assertEqual(list(result), ["MSFT", "AAPL", "NVDA"])
+        for symbol, df in expected.items():
+            pd.testing.assert_frame_equal(result[symbol], df)
+
+    async def test_concurrency_is_bounded(self):
+        fetcher = AsyncSyntheticFetcher(latency=0.02)
+        symbols = [f"S{i}" for i in range(12)]
+        result = await download_multiple_price_data_async(
+            symbols, START, END, fetcher=fetcher, max_concurrency=4
+        )
+        self.assertEqual(len(result), 12)
+        self.assertEqual(fetcher.max_in_flight, 4)
+
+    async def test_failures_retries_and_timeouts(self):
+        fetcher = AsyncSyntheticFetcher(fail=["BAD"])
+        report = DownloadReport()
+        result = await download_multiple_price_data_async(
+            ["AAPL", "BAD", "MSFT"], START, END, fetcher=fetcher, retries=2, backoff=0.0, report=report
+        )
+        self.assertEqual(list(result), ["AAPL", "MSFT"])
+        self.assertEqual(report.succeeded, ["AAPL", "MSFT"])
+        self.assertEqual(report.attempts["BAD"], 3)
+        self.assertIsInstance(report.failed["BAD"].error, ValueError)
+
+        with self.assertRaises(ValueError):
+            await download_multiple_price_data_async(["AAPL", "BAD"], START, END, fetcher=fetcher)
+
+        report = DownloadReport()
+        await download_multiple_price_data_async(
+            ["SLOW"], START, END, fetcher=AsyncSyntheticFetcher(latency=1.0),
+            timeout=0.01, retries=1, backoff=0.0, report=report,
+        )
+        self.assertIsInstance(report.failed["SLOW"].error, TimeoutError)
+        self.assertEqual(report.failed["SLOW"].attempts, 2)
+
+    async def test_cancellation_stops_downloads_in_flight(self):
+        fetcher = AsyncSyntheticFetcher(latency=10.0)
+        task = asyncio.create_task(download_multiple_price_data_async(
+            [f"S{i}" for i in range(5)], START, END, fetcher=fetcher, max_concurrency=2
+        ))
+        await asyncio.sleep(0.05)
+        self.assertEqual(fetcher.in_flight, 2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(fetcher.in_flight, 0)
+        self.assertEqual(fetcher.calls, 2)
+
+    async def test_blocking_fetcher_does_not_stall_loop(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.create_task(ticker())
+        result = await download_multiple_price_data_async(
+            ["AAPL", "MSFT"], START, END, fetcher=SyntheticFetcher(latency=0.1), max_concurrency=2
+        )
+        ticking.cancel()
+        self.assertEqual(list(result), ["AAPL", "MSFT"])
+        self.assertGreater(ticks, 5)
+
+    async def test_invalid_arguments(self):
+        fetcher = AsyncSyntheticFetcher()
+        with self.assertRaises(ValueError):
+            await download_multiple_price_data_async([], START, END, fetcher=fetcher)
+        with self.assertRaises(ValueError):
+            await download_multiple_price_data_async(["AAPL"], START, END, fetcher=fetcher, max_concurrency=0)
+        with self.assertRaises(ValueError):
+            await download_multiple_price_data_async(["AAPL"], START, END, fetcher=fetcher, timeout=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.analytics import (
+    correlation_matrix,
+    covariance_matrix,
+    ledoit_wolf_shrinkage,
+    rolling_correlation,
+    rolling_covariance,
+)
+from stocktoolkit.data import build_close_panel
+from stocktoolkit.indicators import compute_returns, compute_returns_panel
+from stocktoolkit.synthetic import make_universe
+
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        universe = make_universe(12, 300)
+        self.returns = compute_returns_panel(build_close_panel(universe))
+        rng = np.random.default_rng(1)
+        # Common factor so that the correlations are not all close to zero
+        factor = rng.standard_normal(len(self.returns))[:, None] * 0.01
+        self.returns = self.returns + factor * rng.uniform(0.5, 1.5, self.returns.shape[1])
+        self.gappy = self.returns.mask(rng.random(self.returns.shape) < 0.1)
+
+    # ---------- covariance_matrix / correlation_matrix ----------
+
+    def test_matches_pandas_with_pairwise_missing_values(self):
+        for df in (self.returns, self.gappy):
+            pd.testing.assert_frame_equal(covariance_matrix(df), df.cov(), rtol=1e-10, atol=1e-15)
+            pd.testing.assert_frame_equal(correlation_matrix(df), df.corr(), rtol=1e-10, atol=1e-12)
+            pd.testing.assert_frame_equal(
+                correlation_matrix(df, min_periods=270), df.corr(min_periods=270), rtol=1e-10, atol=1e-12
+            )
+
+    def test_blocked_matches_full(self):
+        full = correlation_matrix(self.gappy)
+        for block_size in (1, 5, 12, 100):
+            pd.testing.assert_frame_equal(correlation_matrix(self.gappy, block_size=block_size), full)
+        np.testing.assert_allclose(
+            covariance_matrix(self.gappy.to_numpy(), block_size=5),
+            self.gappy.cov().to_numpy(),
+            rtol=1e-10,
+            atol=1e-15,
+        )
+
+    def test_dict_of_return_series(self):
+        universe = make_universe(3, 200)
+        returns = {symbol: compute_returns(df["Close"]) for symbol, df in universe.items()}
+        returns["SYM0002"] = returns["SYM0002"].iloc[50:]
+        corr = correlation_matrix(returns)
+        self.assertEqual(list(corr.columns), ["SYM0000", "SYM0001", "SYM0002"])
+        pd.testing.assert_frame_equal(corr, pd.DataFrame(returns).corr(), rtol=1e-10)
+
+    def test_constant_and_sparse_symbols(self):
+        df = self.returns.iloc[:, :3].copy()
+        df.iloc[:, 1] = 0.001
+        df.iloc[1:, 2] = np.nan
+        corr = correlation_matrix(df)
+        self.assertEqual(corr.iloc[0, 0], 1.0)
+        self.assertTrue(corr.iloc[:, 1].isna().all())
+        self.assertTrue(corr.iloc[:, 2].isna().all())
+        self.assertEqual(covariance_matrix(df).iloc[1, 1], 0.0)
+
+    # ---------- shrinkage ----------
+
+    def test_ledoit_wolf_shrinkage(self):
+        # Fewer dates than symbols: the sample covariance is singular
+        rng = np.random.default_rng(2)
+        x = rng.standard_normal((30, 5)) @ rng.standard_normal((5, 60)) * 0.01
+        x += rng.standard_normal((30, 60)) * 0.005
+
+        intensity = ledoit_wolf_shrinkage(x)
+        self.assertTrue(0 < intensity < 1)
+        self.assertAlmostEqual(ledoit_wolf_shrinkage(x, block_size=7), intensity, places=12)
+
+        sample = covariance_matrix(x)
+        shrunk = covariance_matrix(x, shrinkage="ledoit-wolf")
+        self.assertLess(np.linalg.eigvalsh(sample).min(), 1e-12)
+        self.assertGreater(np.linalg.eigvalsh(shrunk).min(), 0)
+        self.assertAlmostEqual(np.trace(shrunk), np.trace(sample))
+        np.testing.assert_allclose(shrunk[0, 1:], (1 - intensity) * sample[0, 1:])
+
+    def test_fixed_shrinkage_correlation(self):
+        corr = correlation_matrix(self.returns, shrinkage=0.5)
+        self.assertEqual(corr.attrs["shrinkage"], 0.5)
+        np.testing.assert_array_equal(np.diagonal(corr), 1.0)
+        self.assertLess(corr.abs().to_numpy()[~np.eye(12, dtype=bool)].max(), self.returns.corr().abs().max().max())
+        pd.testing.assert_frame_equal(correlation_matrix(self.returns, shrinkage=0.0), self.returns.corr())
+
+    # ---------- rolling_covariance / rolling_correlation ----------
+
+    def test_rolling_matches_pandas(self):
+        for df in (self.returns, self.gappy):
+            for min_periods in (None, 20):
+                pd.testing.assert_frame_equal(
+                    rolling_covariance(df, 40, min_periods=min_periods),
+                    df.rolling(40, min_periods=min_periods).cov(),
+                    rtol=1e-8,
+                    atol=1e-15,
+                )
+                pd.testing.assert_frame_equal(
+                    rolling_correlation(df, 40, min_periods=min_periods),
+                    df.rolling(40, min_periods=min_periods).corr(),
+                    rtol=1e-7,
+                    atol=1e-9,
+                )
+
+    def test_rolling_step_and_array_input(self):
+        expected = self.gappy.rolling(30).corr().loc[self.gappy.index[::7]]
+        pd.testing.assert_frame_equal(rolling_correlation(self.gappy, 30, step=7), expected, rtol=1e-7, atol=1e-9)
+
+        matrices = rolling_covariance(self.returns.to_numpy(), 30, step=50)
+        self.assertEqual(matrices.shape, (6, 12, 12))
+        self.assertTrue(np.isnan(matrices[0]).all())
+        np.testing.assert_allclose(matrices[-1], self.returns.iloc[221:251].cov().to_numpy(), rtol=1e-9)
+
+    def test_long_series_does_not_drift(self):
+        rng = np.random.default_rng(3)
+        x = rng.standard_normal((3000, 4)) * 0.01 + 0.05
+        matrices = rolling_covariance(x, 20)
+        np.testing.assert_allclose(matrices[-1], np.cov(x[-20:].T), rtol=1e-10)
+
+    # ---------- validation ----------
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            covariance_matrix({})
+        with self.assertRaises(ValueError):
+            covariance_matrix(self.returns, shrinkage="oas")
+        with self.assertRaises(ValueError):
+            correlation_matrix(self.returns, shrinkage=1.5)
+        with self.assertRaises(ValueError):
+            correlation_matrix(self.returns, block_size=0)
+        with self.assertRaises(ValueError):
+            rolling_correlation(self.returns, 20, min_periods=21)
+        with self.assertRaises(ValueError):
+            rolling_covariance(self.returns, 20, step=0)
+        with self.assertRaises(TypeError):
+            correlation_matrix([[0.1, 0.2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.backtest import BACKTEST_STATS, backtest_ma_crossover
+from stocktoolkit.data import build_close_panel
+from stocktoolkit.synthetic import make_universe
+
+
+def crossover_loop(close, fast, slow, cost=0.0, allow_short=False):
+    # Per-bar reference: the position decided on bar i earns bar i + 1's return
+    equity = np.empty(len(close))
+    value, position, target = 1.0, 0.0, 0.0
+    for i in range(len(close)):
+        if i:
+            value *= 1.0 + target * (close[i] / close[i - 1] - 1.0) - cost * abs(target - position)
+            position = target
+        equity[i] = value
+        target = 0.0
+        if i + 1 >= slow:
+            fast_ma = close[i + 1 - fast:i + 1].mean()
+            slow_ma = close[i + 1 - slow:i + 1].mean()
+            if fast_ma > slow_ma:
+                target = 1.0
+            elif fast_ma < slow_ma and allow_short:
+                target = -1.0
+    return equity
+
+
+class TestBacktest(unittest.TestCase):
+    def setUp(self):
+        self.universe = make_universe(4, 400)
+        self.panel = build_close_panel(self.universe)
+
+    # ---------- backtest_ma_crossover ----------
+
+    def test_matches_per_bar_loop(self):
+        for allow_short in (False, True):
+            result = backtest_ma_crossover(
+                self.panel, [5, 10], [20, 50], cost=0.001, allow_short=allow_short
+            )
+            self.assertEqual(result.params, [(5, 20), (5, 50), (10, 20), (10, 50)])
+            for fast, slow in result.params:
+                curves = result.equity_curve(fast, slow)
+                self.assertEqual(list(curves.columns), list(self.panel.columns))
+                for symbol in self.panel.columns:
+                    expected = crossover_loop(self.panel[symbol].to_numpy(), fast, slow, 0.001, allow_short)
+                    np.testing.assert_allclose(curves[symbol].to_numpy(), expected, rtol=1e-10)
+
+    def test_stats(self):
+        result = backtest_ma_crossover(self.universe, [5], [20, 5])
+        stats = result.stats
+        self.assertEqual(list(stats.columns), list(BACKTEST_STATS))
+        self.assertEqual(stats.index.names, ["fast", "slow", "symbol"])
+        self.assertEqual(len(stats), 4)
+
+        curve = result.equity_curve(5, 20)["SYM0001"]
+        row = stats.loc[(5, 20, "SYM0001")]
+        pnl = curve.pct_change().iloc[1:]
+        self.assertAlmostEqual(row["total_return"], curve.iloc[-1] - 1)
+        self.assertAlmostEqual(row["annual_return"], curve.iloc[-1] ** (252 / 399) - 1)
+        self.assertAlmostEqual(row["sharpe"], pnl.mean() / pnl.std() * np.sqrt(252))
+        self.assertAlmostEqual(row["max_drawdown"], (curve / curve.cummax()).min() - 1)
+        self.assertLessEqual(row["max_drawdown"], 0)
+        self.assertTrue(0 < row["exposure"] < 1)
+        self.assertGreater(row["trades"], 0)
+
+    def test_costs_reduce_returns(self):
+        free = backtest_ma_crossover(self.panel, [5], [20], keep_equity=False)
+        costly = backtest_ma_crossover(self.panel, [5], [20], cost=0.01, keep_equity=False)
+        self.assertIsNone(free.equity)
+        self.assertTrue((costly.stats["total_return"] < free.stats["total_return"]).all())
+        pd.testing.assert_series_equal(costly.stats["trades"], free.stats["trades"])
+
+    def test_missing_prices_and_array_input(self):
+        panel = self.panel.copy()
+        panel.iloc[100:110, 0] = np.nan
+        result = backtest_ma_crossover(panel.to_numpy(), [5], [20])
+        curve = result.equity_curve(5, 20)[:, 0]
+        self.assertTrue(np.isfinite(curve).all())
+        # Flat while the window contains a missing price, so the curve does not move
+        self.assertTrue((curve[111:130] == curve[110]).all())
+        self.assertEqual(list(result.stats.index.get_level_values("symbol")[:4]), [0, 1, 2, 3])
+
+    def test_best(self):
+        result = backtest_ma_crossover(self.panel, [5, 10, 20], [30, 60])
+        best = result.best("sharpe")
+        self.assertEqual(list(best.index.get_level_values("symbol")), list(self.panel.columns))
+        for (fast, slow, symbol), row in best.iterrows():
+            self.assertEqual(row["sharpe"], result.stats.xs(symbol, level="symbol")["sharpe"].max())
+        with self.assertRaises(ValueError):
+            result.best("profit")
+
+    def test_process_pool_matches_serial(self):
+        serial = backtest_ma_crossover(self.panel, [5, 10], [20, 40], cost=0.0005)
+        pooled = backtest_ma_crossover(self.panel, [5, 10], [20, 40], cost=0.0005, max_workers=2)
+        pd.testing.assert_frame_equal(pooled.stats, serial.stats)
+        np.testing.assert_array_equal(pooled.equity, serial.equity)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            backtest_ma_crossover(self.panel, [50], [20])
+        with self.assertRaises(ValueError):
+            backtest_ma_crossover(self.panel, [5], [20], cost=-0.01)
+        with self.assertRaises(ValueError):
+            backtest_ma_crossover(self.panel, [5], [20], max_workers=0)
+        with self.assertRaises(TypeError):
+            backtest_ma_crossover(self.panel, [5.0], [20])
+        result = backtest_ma_crossover(self.panel, [5], [20])
+        with self.assertRaises(KeyError):
+            result.equity_curve(10, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.buffer import PriceBuffer
+from stocktoolkit.data import update_price_data
+from stocktoolkit.indicators import moving_average
+
+
+# Offline stand-in for yfinance backed by a fixed "true" history
+class HistoryFetcher:
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, symbol, start_date, end_date, interval):
+        self.calls.append((start_date, end_date))
+        idx = self.history.index
+        return self.history[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+
+class TestPriceBuffer(unittest.TestCase):
+    def setUp(self):
+        idx = pd.date_range("2024-01-01", periods=10, freq="D")
+        self.history = pd.DataFrame(
+            {"Close": np.arange(10, dtype=float) + 100.0, "Volume": np.arange(10, dtype=np.int64)},
+            index=idx,
+        )
+
+    # ---------- PriceBuffer ----------
+
+    def test_append_grows_geometrically(self):
+        buffer = PriceBuffer.from_frame(self.history.iloc[:2], capacity=2)
+        capacities = set()
+        for i in range(2, 10):
+            buffer.append(self.history.iloc[i:i + 1])
+            capacities.add(buffer.capacity)
+        self.assertEqual(capacities, {4, 8, 16})
+        pd.testing.assert_frame_equal(buffer.frame, self.history, check_freq=False)
+
+    def test_append_replaces_overlapping_bar(self):
+        buffer = PriceBuffer.from_frame(self.history.iloc[:5])
+        revised = self.history.iloc[4:7].copy()
+        revised.iloc[0, 0] = 999.0
+
+        first_changed, appended, replaced = buffer.append(revised)
+        self.assertEqual((first_changed, appended, replaced), (4, 2, 1))
+        self.assertEqual(len(buffer), 7)
+        self.assertEqual(buffer.frame["Close"].iloc[4], 999.0)
+        self.assertFalse(buffer.frame.index.has_duplicates)
+
+    def test_append_identical_overlap_changes_nothing(self):
+        buffer = PriceBuffer.from_frame(self.history)
+        self.assertEqual(buffer.append(self.history.iloc[-1:]), (None, 0, 0))
+
+    def test_append_leaves_input_index_unchanged(self):
+        buffer = PriceBuffer.from_frame(self.history.iloc[:5])
+        new = self.history.iloc[5:7].copy()
+        new.index = new.index.strftime("%Y-%m-%d")
+        self.assertEqual(buffer.append(new), (5, 2, 0))
+        self.assertEqual(list(new.index), ["2024-01-06", "2024-01-07"])
+
+    def test_append_widens_compact_integer_column(self):
+        compact = self.history.astype({"Volume": np.int32})
+        buffer = PriceBuffer.from_frame(compact.iloc[:5])
+        big = compact.iloc[5:6].astype({"Volume": np.int64})
+        big.iloc[0, 1] = 5_000_000_000
+        buffer.append(big)
+        self.assertEqual(buffer.frame["Volume"].iloc[-1], 5_000_000_000)
+        self.assertEqual(buffer.frame["Volume"].dtype, np.int64)
+
+    # ---------- update_price_data ----------
+
+    def test_update_price_data_fetches_only_new_bars(self):
+        fetcher = HistoryFetcher(self.history)
+        update = update_price_data(self.history.iloc[:6], "aapl", end_date="2024-01-11", fetcher=fetcher)
+
+        self.assertEqual(fetcher.calls, [("2024-01-06", "2024-01-11")])
+        self.assertEqual(update.new_rows, 4)
+        self.assertEqual(update.replaced_rows, 0)
+        self.assertEqual(update.recompute_from, 6)
+        pd.testing.assert_frame_equal(update.data, self.history, check_freq=False)
+
+    def test_update_price_data_buffer_in_place(self):
+        buffer = PriceBuffer.from_frame(self.history.iloc[:6])
+        update = update_price_data(buffer, "AAPL", end_date="2024-01-11", fetcher=HistoryFetcher(self.history))
+        self.assertEqual(len(buffer), 10)
+        self.assertEqual(update.new_rows, 4)
+
+        # Nothing new on the next poll
+        update = update_price_data(buffer, "AAPL", end_date="2024-01-11", fetcher=HistoryFetcher(self.history))
+        self.assertIsNone(update.recompute_from)
+        self.assertIsNone(update.input_start(3))
+
+    def test_input_start_gives_indicator_lookback(self):
+        update = update_price_data(
+            self.history.iloc[:6], "AAPL", end_date="2024-01-11", fetcher=HistoryFetcher(self.history)
+        )
+        close = update.data["Close"]
+        start = update.input_start(3)
+        self.assertEqual(start, 4)
+
+        # Recomputing the tail from input_start matches a full recomputation
+        tail = moving_average(close.iloc[start:], 3).iloc[update.recompute_from - start:]
+        full = moving_average(close, 3).iloc[update.recompute_from:]
+        pd.testing.assert_series_equal(tail, full)
+
+    def test_update_price_data_empty_input(self):
+        with self.assertRaises(ValueError):
+            update_price_data(pd.DataFrame(), "AAPL", fetcher=HistoryFetcher(self.history))
+
+
+if __name__ == "__main__":
+    unittest.main()
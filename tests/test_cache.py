@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.cache import PriceCache
+from stocktoolkit.data import download_price_data
+
+
+# Offline stand-in for yfinance: one bar per business day, records every call
+class FakeFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start_date, end_date, interval):
+        self.calls.append((symbol, start_date, end_date, interval))
+        idx = pd.bdate_range(start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1))
+        close = np.arange(len(idx), dtype=float) + 100.0
+        return pd.DataFrame({"Close": close, "Volume": np.ones(len(idx))}, index=idx)
+
+
+class TestPriceCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = PriceCache(self.tmp.name)
+        self.fetcher = FakeFetcher()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # ---------- coverage / partial fetches ----------
+
+    def test_fully_covered_request_does_not_fetch(self):
+        download_price_data("aapl", "2024-01-01", "2024-03-01", cache=self.cache, fetcher=self.fetcher)
+        df = download_price_data("AAPL", "2024-01-15", "2024-02-15", cache=self.cache, fetcher=self.fetcher)
+
+        self.assertEqual(len(self.fetcher.calls), 1)
+        self.assertTrue(isinstance(df.index, pd.DatetimeIndex))
+        self.assertEqual(df.index[0], pd.Timestamp("2024-01-15"))
+        self.assertLess(df.index[-1], pd.Timestamp("2024-02-15"))
+
+    def test_only_missing_head_and_tail_are_fetched(self):
+        download_price_data("AAPL", "2024-02-01", "2024-03-01", cache=self.cache, fetcher=self.fetcher)
+        df = download_price_data("AAPL", "2024-01-01", "2024-04-01", cache=self.cache, fetcher=self.fetcher)
+
+        self.assertEqual(
+            self.fetcher.calls[1:],
+            [
+                ("AAPL", "2024-01-01", "2024-02-01", "1d"),
+                ("AAPL", "2024-03-01", "2024-04-01", "1d"),
+            ],
+        )
+        self.assertEqual(self.cache.coverage("AAPL"), ("2024-01-01", "2024-04-01"))
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertFalse(df.index.has_duplicates)
+        self.assertEqual(len(df), len(pd.bdate_range("2024-01-01", "2024-03-31")))
+
+    def test_stale_recent_bars_are_refetched(self):
+        cache = PriceCache(self.tmp.name, ttl=0, recent_days=5)
+        cache.get("AAPL", "2024-01-01", "2099-01-01", "1d", self.fetcher)
+        time.sleep(0.01)
+
+        # With ttl=0 the bars of the last recent_days are provisional right away
+        settled = (pd.Timestamp.now().normalize() - pd.Timedelta(days=5)).strftime("%Y-%m-%d")
+        self.assertEqual(cache.coverage("AAPL"), ("2024-01-01", settled))
+
+        cache.get("AAPL", "2024-01-01", "2099-01-01", "1d", self.fetcher)
+        self.assertEqual(self.fetcher.calls[-1], ("AAPL", settled, "2099-01-01", "1d"))
+
+        # Fresh bars are served from disk while the ttl holds
+        fresh = PriceCache(self.tmp.name, ttl=3600, recent_days=5)
+        fresh.get("AAPL", "2024-01-01", "2099-01-01", "1d", self.fetcher)
+        self.assertEqual(len(self.fetcher.calls), 2)
+
+    def test_empty_result_raises_and_is_not_cached(self):
+        empty_fetcher = lambda *args: pd.DataFrame()
+        with self.assertRaises(ValueError):
+            download_price_data("XXXX", "2024-01-01", "2024-02-01", cache=self.cache, fetcher=empty_fetcher)
+        self.assertIsNone(self.cache.coverage("XXXX"))
+
+    def test_symbol_and_interval_are_case_insensitive(self):
+        self.cache.get("AAPL", "2024-01-01", "2024-03-01", "1D", self.fetcher)
+        self.assertEqual(self.cache.coverage("aapl", "1d"), ("2024-01-01", "2024-03-01"))
+        self.cache.invalidate("aapl", "1D")
+        self.assertIsNone(self.cache.coverage("AAPL", "1d"))
+        self.assertEqual(self.cache.size(), 0)
+
+    # ---------- eviction ----------
+
+    def test_size_bounded_eviction_removes_least_recently_used(self):
+        download_price_data("AAPL", "2024-01-01", "2024-03-01", cache=self.cache, fetcher=self.fetcher)
+        entry_size = self.cache.size()
+
+        cache = PriceCache(self.tmp.name, max_bytes=int(entry_size * 1.5))
+        past = time.time() - 100
+        os.utime(os.path.join(self.tmp.name, "AAPL", "1d", "meta.json"), (past, past))
+        download_price_data("MSFT", "2024-01-01", "2024-03-01", cache=cache, fetcher=self.fetcher)
+
+        self.assertIsNone(cache.coverage("AAPL"))
+        self.assertIsNotNone(cache.coverage("MSFT"))
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            PriceCache(self.tmp.name, ttl=-1)
+        with self.assertRaises(ValueError):
+            PriceCache(self.tmp.name, max_bytes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.concurrency import DownloadReport, RateLimiter, fetch_concurrently
+from stocktoolkit.data import download_multiple_price_data
+
+
+# Local stub for yfinance: fixed latency, optional per-symbol failures
+class StubFetcher:
+    def __init__(self, latency=0.0, fail=(), flaky=(), hang=()):
+        self.latency = latency
+        self.fail = set(fail)
+        self.flaky = set(flaky)
+        self.hang = set(hang)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol, start_date, end_date, interval):
+        with self._lock:
+            self.calls.append(symbol)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            first_call = self.calls.count(symbol) == 1
+        try:
+            time.sleep(self.latency)
+            if symbol in self.hang:
+                time.sleep(1.0)
+            if symbol in self.fail:
+                return pd.DataFrame()
+            if symbol in self.flaky and first_call:
+                raise ConnectionError("temporary failure")
+            idx = pd.bdate_range(start_date, end_date, inclusive="left")
+            return pd.DataFrame({"Close": np.linspace(1.0, 2.0, len(idx))}, index=idx)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestConcurrentDownload(unittest.TestCase):
+    def setUp(self):
+        self.symbols = [f"S{i:02d}" for i in range(12)]
+
+    def test_concurrent_download_matches_serial(self):
+        fetcher = StubFetcher(latency=0.05)
+        start = time.monotonic()
+        result = download_multiple_price_data(
+            self.symbols, "2024-01-01", "2024-02-01", fetcher=fetcher, max_workers=6
+        )
+        elapsed = time.monotonic() - start
+
+        serial = download_multiple_price_data(
+            self.symbols, "2024-01-01", "2024-02-01", fetcher=StubFetcher()
+        )
+        self.assertEqual(list(result), self.symbols)
+        for sym in self.symbols:
+            pd.testing.assert_frame_equal(result[sym], serial[sym])
+        self.assertLessEqual(fetcher.max_in_flight, 6)
+        self.assertLess(elapsed, 12 * 0.05)
+
+    def test_failures_are_collected_in_report(self):
+        fetcher = StubFetcher(fail=["S03", "S07"])
+        report = DownloadReport()
+        result = download_multiple_price_data(
+            self.symbols, "2024-01-01", "2024-02-01", fetcher=fetcher, max_workers=4, report=report
+        )
+        self.assertEqual(sorted(report.failed), ["S03", "S07"])
+        self.assertIsInstance(report.failed["S03"].error, ValueError)
+        self.assertEqual(len(result), 10)
+        self.assertNotIn("S03", result)
+        self.assertFalse(report.ok)
+
+    def test_failure_raises_without_report(self):
+        fetcher = StubFetcher(fail=["S05"])
+        with self.assertRaises(ValueError):
+            download_multiple_price_data(
+                self.symbols, "2024-01-01", "2024-02-01", fetcher=fetcher, max_workers=4
+            )
+
+    def test_retry_with_backoff_recovers_transient_errors(self):
+        fetcher = StubFetcher(flaky=["S01", "S02"])
+        report = DownloadReport()
+        result = download_multiple_price_data(
+            self.symbols, "2024-01-01", "2024-02-01",
+            fetcher=fetcher, max_workers=4, retries=2, backoff=0.01, report=report,
+        )
+        self.assertTrue(report.ok)
+        self.assertEqual(len(result), 12)
+        self.assertEqual(report.attempts["S01"], 2)
+        self.assertEqual(report.attempts["S00"], 1)
+
+    def test_timeout_is_reported(self):
+        fetcher = StubFetcher(hang=["S00"])
+        report = DownloadReport()
+        result = download_multiple_price_data(
+            self.symbols[:3], "2024-01-01", "2024-02-01",
+            fetcher=fetcher, max_workers=3, timeout=0.2, report=report,
+        )
+        self.assertIsInstance(report.failed["S00"].error, TimeoutError)
+        self.assertEqual(list(result), ["S01", "S02"])
+
+    # ---------- engine helpers ----------
+
+    def test_rate_limiter_spaces_calls(self):
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50 * 0.9)
+
+    def test_invalid_engine_parameters(self):
+        with self.assertRaises(ValueError):
+            fetch_concurrently(["A"], lambda s: s, max_workers=0)
+        with self.assertRaises(ValueError):
+            fetch_concurrently(["A"], lambda s: s, retries=-1)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
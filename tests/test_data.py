@@ -1,15 +1,42 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 
+from stocktoolkit.concurrency import DownloadReport
 from stocktoolkit.data import (
     download_price_data,
     download_multiple_price_data,
+    download_price_panel,
+    build_close_panel,
+    compact_price_frame,
+    from_long_format,
     get_close_price,
     resample_price,
+    resample_price_multi,
+    split_price_panel,
+    to_long_format,
 )
+from stocktoolkit.synthetic import SyntheticFetcher, make_ohlcv, make_universe
 from stocktoolkit.validation import validate_price_dataframe
 
+_BAR_RULES = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+# Offline stand-in for a multi-ticker yfinance request (group_by="ticker")
+class FakeBatchFetcher:
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.calls = []
+
+    def __call__(self, symbols, start_date, end_date, interval):
+        self.calls.append(list(symbols))
+        idx = pd.bdate_range(start_date, end_date, inclusive="left")
+        present = [s for s in symbols if s not in self.missing]
+        columns = pd.MultiIndex.from_product([present, ["Close", "Volume"]])
+        data = np.arange(len(idx) * len(columns), dtype=float).reshape(len(idx), len(columns))
+        return pd.DataFrame(data, index=idx, columns=columns)
+
 
 class TestDataModule(unittest.TestCase):
     # ---------- download_price_data ----------
@@ -46,8 +73,76 @@ class TestDataModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             download_multiple_price_data(["AAPL", "MSFT"], "2024-13-01", "2024-01-31")
 
+    # ---------- batched downloads ----------
+
+    def test_download_multiple_price_data_batched(self):
+        fetcher = FakeBatchFetcher()
+        symbols = [f"s{i}" for i in range(25)]
+        data_dict = download_multiple_price_data(
+            symbols, "2024-01-01", "2024-02-01", batch_size=10, batch_fetcher=fetcher
+        )
+        # 25 symbols in groups of 10 -> 3 requests
+        self.assertEqual([len(c) for c in fetcher.calls], [10, 10, 5])
+        self.assertEqual(list(data_dict), [s.upper() for s in symbols])
+        self.assertEqual(list(data_dict["S3"].columns), ["Close", "Volume"])
+        self.assertTrue(isinstance(data_dict["S3"].index, pd.DatetimeIndex))
+
+    def test_download_multiple_price_data_batched_missing_symbol(self):
+        fetcher = FakeBatchFetcher(missing=["BAD"])
+        report = DownloadReport()
+        data_dict = download_multiple_price_data(
+            ["AAPL", "BAD", "MSFT"], "2024-01-01", "2024-02-01",
+            batch_size=2, batch_fetcher=fetcher, report=report,
+        )
+        self.assertEqual(list(data_dict), ["AAPL", "MSFT"])
+        self.assertIn("BAD", report.failed)
+
+        with self.assertRaises(ValueError):
+            download_multiple_price_data(
+                ["AAPL", "BAD"], "2024-01-01", "2024-02-01", batch_size=2, batch_fetcher=fetcher
+            )
+
+    def test_download_price_panel_and_split(self):
+        panel = download_price_panel(
+            ["AAPL", "MSFT", "NVDA"], "2024-01-01", "2024-02-01",
+            batch_size=2, batch_fetcher=FakeBatchFetcher(),
+        )
+        self.assertEqual(list(panel.columns.get_level_values(0).unique()), ["AAPL", "MSFT", "NVDA"])
+
+        frames = split_price_panel(panel, ["msft"])
+        self.assertEqual(list(frames), ["MSFT"])
+        np.testing.assert_array_equal(frames["MSFT"]["Close"].values, panel[("MSFT", "Close")].values)
+
+    def test_split_price_panel_drops_dates_without_bars(self):
+        idx = pd.date_range("2024-01-01", periods=4, freq="D")
+        columns = pd.MultiIndex.from_product([["A", "B"], ["Close"]])
+        panel = pd.DataFrame(
+            [[1.0, np.nan], [2.0, 5.0], [3.0, 6.0], [4.0, np.nan]], index=idx, columns=columns
+        )
+        frames = split_price_panel(panel)
+        self.assertEqual(len(frames["A"]), 4)
+        self.assertEqual(len(frames["B"]), 2)
+        with self.assertRaises(ValueError):
+            split_price_panel(panel, ["C"])
+
+    def test_split_price_panel_leaves_input_index_unchanged(self):
+        columns = pd.MultiIndex.from_product([["A"], ["Close"]])
+        panel = pd.DataFrame([[1.0], [2.0]], index=["2024-01-01", "2024-01-02"], columns=columns)
+        frames = split_price_panel(panel)
+        self.assertIsInstance(frames["A"].index, pd.DatetimeIndex)
+        self.assertEqual(list(panel.index), ["2024-01-01", "2024-01-02"])
+
     # ---------- get_close_price ----------
 
+    def test_get_close_price_multiindex_without_copy(self):
+        idx = pd.date_range("2024-01-01", periods=3, freq="D")
+        columns = pd.MultiIndex.from_product([["Close", "Open"], ["AAPL"]], names=["Price", "Ticker"])
+        df = pd.DataFrame(np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]), index=idx, columns=columns)
+        series = get_close_price(df)
+        self.assertEqual(list(series.values), [1.0, 3.0, 5.0])
+        self.assertEqual(series.name, "Close")
+        self.assertTrue(np.shares_memory(series.to_numpy(), df[("Close", "AAPL")].to_numpy()))
+
     def test_get_close_price_prefers_adj_close(self):
         # Construct a small fake DataFrame with both 'Adj Close' and 'Close'
         idx = pd.date_range("2024-01-01", periods=3, freq="D")
@@ -84,6 +179,89 @@ class TestDataModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             get_close_price(df, use_adjusted=True)
 
+    # ---------- build_close_panel ----------
+
+    def test_build_close_panel_aligns_calendars(self):
+        a = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=pd.date_range("2024-01-01", periods=3, freq="D"))
+        b = pd.DataFrame({"Close": [5.0, 6.0]}, index=pd.date_range("2024-01-02", periods=2, freq="D"))
+
+        outer = build_close_panel({"A": a, "B": b})
+        self.assertEqual(list(outer.columns), ["A", "B"])
+        self.assertEqual(len(outer), 3)
+        self.assertTrue(np.isnan(outer["B"].iloc[0]))
+
+        inner = build_close_panel({"A": a, "B": b}, how="inner")
+        self.assertEqual(len(inner), 2)
+
+        with self.assertRaises(ValueError):
+            build_close_panel({"A": a}, how="left")
+        with self.assertRaises(ValueError):
+            build_close_panel({})
+
+    # ---------- compact mode ----------
+
+    def test_compact_price_frame_dtypes_and_savings(self):
+        df = make_ohlcv(10_000)
+        compact = compact_price_frame(df)
+        self.assertEqual(set(compact[["Open", "High", "Low", "Close"]].dtypes), {np.dtype(np.float32)})
+        self.assertEqual(compact["Volume"].dtype, np.int32)
+        self.assertTrue((compact["Volume"] == df["Volume"]).all())
+        # 4 float64 + int64 + int64 index -> 4 float32 + int32 + int64 index
+        saving = 1 - compact.memory_usage(deep=True).sum() / df.memory_usage(deep=True).sum()
+        self.assertGreater(saving, 0.4)
+        # Documented precision: relative rounding error of at most 6e-8
+        rel_err = ((compact["Close"].astype(float) - df["Close"]) / df["Close"]).abs().max()
+        self.assertLess(rel_err, 6e-8)
+
+    def test_compact_price_frame_keeps_nan_volume_exact(self):
+        df = make_ohlcv(10).astype({"Volume": float})
+        df.iloc[3, 4] = np.nan
+        self.assertEqual(compact_price_frame(df)["Volume"].dtype, np.float64)
+
+    def test_compact_price_frame_panel_and_close_without_copy(self):
+        panel = pd.concat(make_universe(3, 50), axis=1)
+        compact = compact_price_frame(panel)
+        self.assertEqual(compact[("SYM0001", "Volume")].dtype, np.int32)
+        self.assertEqual(compact[("SYM0001", "High")].dtype, np.float32)
+
+        single = compact_price_frame(make_ohlcv(50))
+        close = get_close_price(single)
+        self.assertEqual(close.dtype, np.float32)
+        self.assertTrue(np.shares_memory(close.to_numpy(), single["Close"].to_numpy()))
+
+    def test_download_compact(self):
+        fetcher = SyntheticFetcher()
+        df = download_price_data("AAPL", "2024-01-01", "2024-03-01", fetcher=fetcher, compact=True)
+        self.assertEqual(df["Close"].dtype, np.float32)
+        data = download_multiple_price_data(
+            ["AAPL", "MSFT"], "2024-01-01", "2024-03-01",
+            batch_size=10, batch_fetcher=fetcher.batch, compact=True,
+        )
+        self.assertEqual(data["MSFT"]["Volume"].dtype, np.int32)
+
+    def test_to_long_format_round_trip_and_savings(self):
+        universe = make_universe(20, 500)
+        long = to_long_format(universe)
+        self.assertEqual(list(long.columns), ["Date", "Symbol", "Open", "High", "Low", "Close", "Volume"])
+        self.assertIsInstance(long["Symbol"].dtype, pd.CategoricalDtype)
+        self.assertEqual(len(long), 20 * 500)
+        back = from_long_format(long)
+        self.assertEqual(list(back), list(universe))
+        pd.testing.assert_frame_equal(back["SYM0007"], universe["SYM0007"], check_freq=False)
+
+        plain = to_long_format(universe, categorical=False).memory_usage(deep=True).sum()
+        compact = to_long_format(universe, compact=True).memory_usage(deep=True).sum()
+        self.assertLess(long.memory_usage(deep=True).sum(), 0.5 * plain)
+        self.assertLess(compact, 0.3 * plain)
+
+    def test_to_long_format_missing_fields(self):
+        a = make_ohlcv(5)
+        b = a[["Close"]]
+        long = to_long_format({"A": a, "B": b})
+        self.assertTrue(long.loc[long["Symbol"] == "B", "Volume"].isna().all())
+        with self.assertRaises(ValueError):
+            to_long_format({})
+
     # ---------- resample_price ----------
 
     def test_resample_price_last(self):
@@ -117,6 +295,58 @@ class TestDataModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             resample_price(df, freq="W", how="median")
 
+    def test_resample_price_ohlc_matches_per_column_rules(self):
+        df = make_ohlcv(400, seed=2)
+        df.iloc[3:6, 0] = np.nan          # missing opens inside a week
+        df.iloc[50:70, :4] = np.nan       # whole weeks without prices
+        expected = df.resample("ME").agg(_BAR_RULES)
+
+        monthly = resample_price(df, freq="me", how="ohlc")
+        pd.testing.assert_frame_equal(monthly, expected, check_freq=False)
+        self.assertEqual(monthly["Volume"].dtype, np.int64)
+
+    def test_resample_price_ohlc_panel(self):
+        frames = {s: make_ohlcv(100, seed=i) for i, s in enumerate(["AAA", "BBB"])}
+        panel = pd.concat(frames, axis=1)
+        weekly = resample_price(panel, freq="W", how="ohlc")
+        for symbol, df in frames.items():
+            pd.testing.assert_frame_equal(
+                weekly[symbol], df.resample("W").agg(_BAR_RULES), check_freq=False
+            )
+
+    def test_resample_price_intraday_frequency(self):
+        df = make_ohlcv(300, freq="min")
+        hourly = resample_price(df, freq="h", how="ohlc")
+        self.assertEqual(len(hourly), 5)
+
+    # ---------- resample_price_multi ----------
+
+    def test_resample_price_multi_matches_single_frequency(self):
+        df = make_ohlcv(3000, freq="h", seed=4)
+        df.iloc[100:400, :] = np.nan
+        freqs = ["QE", "D", "W", "ME"]
+        bars = resample_price_multi(df, freqs)
+        self.assertEqual(list(bars), freqs)
+        for freq in freqs:
+            pd.testing.assert_frame_equal(
+                bars[freq], df.resample(freq).agg(_BAR_RULES), check_freq=False
+            )
+
+    def test_resample_price_multi_simple_aggregations(self):
+        df = make_ohlcv(500, seed=5)
+        for how in ("last", "first", "mean"):
+            bars = resample_price_multi(df, ["W", "ME"], how=how)
+            pd.testing.assert_frame_equal(
+                bars["ME"], getattr(df.resample("ME"), how)(), check_freq=False
+            )
+
+    def test_resample_price_multi_invalid(self):
+        df = make_ohlcv(10)
+        with self.assertRaises(ValueError):
+            resample_price_multi(df, [])
+        with self.assertRaises(ValueError):
+            resample_price_multi(df, ["W"], how="median")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+import unittest
+
+import stocktoolkit
+
+
+# Run a snippet in a fresh interpreter and return the stocktoolkit-relevant
+# heavy modules it left in sys.modules
+def _loaded_after(code):
+    script = (
+        code
+        + "\nimport sys"
+        + "\nprint('loaded:' + ','.join(m for m in ('yfinance', 'matplotlib', 'matplotlib.pyplot') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    return set(filter(None, out.removeprefix("loaded:").split(",")))
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_package_loads_no_heavy_dependencies(self):
+        self.assertEqual(_loaded_after("import stocktoolkit"), set())
+
+    def test_indicator_import_loads_no_heavy_dependencies(self):
+        code = "from stocktoolkit import compute_returns, ema, OnlineSMA, PriceCache, mark_validated"
+        self.assertEqual(_loaded_after(code), set())
+
+    def test_download_function_defers_yfinance_until_called(self):
+        self.assertEqual(_loaded_after("from stocktoolkit import download_price_data"), set())
+
+    def test_plot_function_defers_matplotlib_until_called(self):
+        self.assertEqual(_loaded_after("from stocktoolkit import plot_price"), set())
+        code = (
+            "import matplotlib; matplotlib.use('Agg')\n"
+            "import pandas as pd\n"
+            "from stocktoolkit import plot_returns\n"
+            "plot_returns(pd.Series([0.01, -0.02, 0.03], index=pd.date_range('2024-01-01', periods=3)))"
+        )
+        self.assertIn("matplotlib.pyplot", _loaded_after(code))
+
+    def test_all_public_names_resolve(self):
+        for name in stocktoolkit.__all__:
+            self.assertTrue(callable(getattr(stocktoolkit, name)), name)
+        self.assertTrue(set(stocktoolkit.__all__) <= set(dir(stocktoolkit)))
+        self.assertIs(stocktoolkit.indicators.ema, stocktoolkit.ema)
+        self.assertIs(stocktoolkit.validation.trusted_inputs, stocktoolkit.trusted_inputs)
+        self.assertIs(stocktoolkit.validation.ValidationReport, stocktoolkit.ValidationReport)
+
+    def test_unknown_attribute_raises(self):
+        with self.assertRaises(AttributeError):
+            stocktoolkit.not_a_function
+
+
+if __name__ == "__main__":
+    unittest.main()
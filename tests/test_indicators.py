@@ -4,8 +4,19 @@ import pandas as pd
 
 from stocktoolkit.indicators import (
     compute_returns,
+    compute_returns_panel,
     moving_average,
+    moving_average_panel,
+    moving_averages,
     rolling_volatility,
+    rolling_volatility_panel,
+    rolling_volatilities,
+    ema,
+    rsi,
+    macd,
+    bollinger_bands,
+    atr,
+    vwap,
 )
 
 
@@ -88,5 +99,185 @@ class TestIndicatorsModule(unittest.TestCase):
             rolling_volatility([0.1, 0.2, -0.1], window=2)
 
 
+    # ---------- panel indicators ----------
+
+    def _panel(self):
+        rng = np.random.default_rng(0)
+        idx = pd.date_range("2024-01-01", periods=200, freq="D")
+        values = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(200, 4)), axis=0))
+        values[:10, 2] = np.nan  # late listing
+        return pd.DataFrame(values, index=idx, columns=["A", "B", "C", "D"])
+
+    def test_compute_returns_panel_matches_series(self):
+        panel = self._panel()
+        for method in ("simple", "log"):
+            returns = compute_returns_panel(panel, method=method)
+            expected = compute_returns(panel["A"], method=method)
+            np.testing.assert_allclose(returns["A"].values, expected.values)
+            # ndarray input gives the same numbers
+            np.testing.assert_allclose(
+                compute_returns_panel(panel.to_numpy(), method=method), returns.to_numpy()
+            )
+
+    def test_moving_average_panel_matches_series(self):
+        panel = self._panel()
+        ma = moving_average_panel(panel, 20)
+        ma_array = moving_average_panel(panel.to_numpy(), 20)
+        for col in panel.columns:
+            expected = moving_average(panel[col], 20)
+            pd.testing.assert_series_equal(ma[col], expected)
+            np.testing.assert_allclose(ma_array[:, panel.columns.get_loc(col)], expected.values, rtol=1e-10)
+
+    def test_rolling_volatility_panel_matches_series(self):
+        returns = compute_returns_panel(self._panel())
+        vol_array = rolling_volatility_panel(returns.to_numpy(), 15)
+        for i, col in enumerate(returns.columns):
+            expected = returns[col].rolling(15).std()
+            np.testing.assert_allclose(vol_array[:, i], expected.values, rtol=1e-8)
+        self.assertTrue(np.isnan(rolling_volatility_panel(returns.to_numpy(), 1)).all())
+
+    def test_panel_invalid_input(self):
+        with self.assertRaises(TypeError):
+            moving_average_panel([[1.0, 2.0]], 2)
+        with self.assertRaises(ValueError):
+            moving_average_panel(np.ones(5), 2)
+        with self.assertRaises(ValueError):
+            compute_returns_panel(self._panel(), method="SIMPLE")
+
+
+    # ---------- multi-window indicators ----------
+
+    def test_moving_averages_matches_single_window(self):
+        prices = self._panel()["C"]  # includes leading NaN
+        mas = moving_averages(prices, [5, 20, 5, 60])
+        self.assertEqual(list(mas.columns), [5, 20, 60])
+        for window in mas.columns:
+            np.testing.assert_allclose(mas[window].values, moving_average(prices, window).values, rtol=1e-12)
+
+    def test_rolling_volatilities_matches_single_window(self):
+        returns = compute_returns(self._panel()["A"])
+        vols = rolling_volatilities(returns, [2, 10, 30])
+        for window in vols.columns:
+            np.testing.assert_allclose(vols[window].values, rolling_volatility(returns, window).values, rtol=1e-9)
+
+    def test_multi_window_long_series_is_stable(self):
+        # Trending series longer than one prefix-sum block
+        n = 20000
+        idx = pd.date_range("2000-01-01", periods=n, freq="min")
+        prices = pd.Series(1e4 + np.arange(n) * 0.5 + np.sin(np.arange(n)), index=idx)
+        mas = moving_averages(prices, [3, 250])
+        np.testing.assert_allclose(mas[250].values, prices.rolling(250).mean().values, rtol=1e-13)
+
+        flat = pd.Series(np.full(n, 123.456), index=idx)
+        self.assertTrue((rolling_volatilities(flat, [10])[10].iloc[9:] == 0.0).all())
+
+    def test_multi_window_invalid_windows(self):
+        with self.assertRaises(ValueError):
+            moving_averages(self.prices, [])
+        with self.assertRaises(TypeError):
+            rolling_volatilities(self.prices, [2, 2.5])
+
+
+    # ---------- technical indicators ----------
+
+    def _ohlcv(self, n=120):
+        rng = np.random.default_rng(3)
+        idx = pd.date_range("2024-01-01", periods=n, freq="h")
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        high = close * (1 + rng.uniform(0, 0.01, n))
+        low = close * (1 - rng.uniform(0, 0.01, n))
+        volume = rng.integers(1000, 5000, n)
+        return pd.DataFrame({"High": high, "Low": low, "Close": close, "Volume": volume}, index=idx)
+
+    def test_ema_matches_recursive_loop(self):
+        close = self._ohlcv()["Close"]
+        alpha = 2.0 / (10 + 1)
+        expected = [close.iloc[0]]
+        for x in close.iloc[1:]:
+            expected.append(alpha * x + (1 - alpha) * expected[-1])
+        np.testing.assert_allclose(ema(close, 10).values, expected)
+
+        panel = self._panel()
+        np.testing.assert_allclose(ema(panel, 10)["A"].values, ema(panel["A"], 10).values)
+
+    def test_rsi_matches_wilder_loop(self):
+        close = self._ohlcv()["Close"].values
+        window = 14
+        deltas = np.diff(close)
+        avg_gain = max(deltas[0], 0.0)
+        avg_loss = max(-deltas[0], 0.0)
+        expected = [np.nan]
+        for i, d in enumerate(deltas):
+            if i > 0:
+                avg_gain += (max(d, 0.0) - avg_gain) / window
+                avg_loss += (max(-d, 0.0) - avg_loss) / window
+            expected.append(100 - 100 / (1 + avg_gain / avg_loss) if i + 1 >= window else np.nan)
+
+        result = rsi(pd.Series(close, index=self._ohlcv().index), window)
+        np.testing.assert_allclose(result.values, expected)
+        self.assertTrue(((result.dropna() >= 0) & (result.dropna() <= 100)).all())
+
+    def test_macd_components(self):
+        close = self._ohlcv()["Close"]
+        result = macd(close)
+        self.assertEqual(list(result.columns), ["MACD", "Signal", "Histogram"])
+        np.testing.assert_allclose(result["MACD"].values, (ema(close, 12) - ema(close, 26)).values)
+        np.testing.assert_allclose(result["Histogram"].values, (result["MACD"] - result["Signal"]).values)
+
+        panel_result = macd(self._panel())
+        self.assertEqual(list(panel_result["MACD"].columns), ["A", "B", "C", "D"])
+        with self.assertRaises(ValueError):
+            macd(close, fast=26, slow=12)
+
+    def test_bollinger_bands(self):
+        close = self._ohlcv()["Close"]
+        bands = bollinger_bands(close, window=20, num_std=2.0)
+        std = close.iloc[:20].std(ddof=0)
+        self.assertAlmostEqual(bands["Upper"].iloc[19], close.iloc[:20].mean() + 2 * std, places=8)
+        self.assertTrue((bands["Upper"].dropna() >= bands["Lower"].dropna()).all())
+
+    def test_atr_matches_loop_and_accepts_yfinance_columns(self):
+        df = self._ohlcv()
+        window = 14
+        tr = [df["High"].iloc[0] - df["Low"].iloc[0]]
+        for i in range(1, len(df)):
+            h, l, pc = df["High"].iloc[i], df["Low"].iloc[i], df["Close"].iloc[i - 1]
+            tr.append(max(h - l, abs(h - pc), abs(l - pc)))
+        expected = [tr[0]]
+        for value in tr[1:]:
+            expected.append(expected[-1] + (value - expected[-1]) / window)
+        expected = np.array(expected)
+        expected[:window - 1] = np.nan
+        np.testing.assert_allclose(atr(df, window).values, expected)
+
+        # yfinance single-ticker layout: (Price, Ticker) columns
+        yf_df = df.copy()
+        yf_df.columns = pd.MultiIndex.from_product([df.columns, ["AAPL"]], names=["Price", "Ticker"])
+        np.testing.assert_allclose(atr(yf_df, window).values, expected)
+
+        with self.assertRaises(ValueError):
+            atr(df.drop(columns="High"))
+
+    def test_vwap(self):
+        df = self._ohlcv(48)
+        typical = (df["High"] + df["Low"] + df["Close"]) / 3
+        cumulative = vwap(df)
+        self.assertAlmostEqual(
+            cumulative.iloc[-1], (typical * df["Volume"]).sum() / df["Volume"].sum(), places=8
+        )
+
+        daily = vwap(df, anchor="D")
+        second_day = df.index.normalize() == df.index[-1].normalize()
+        self.assertAlmostEqual(
+            daily.iloc[-1],
+            (typical * df["Volume"])[second_day].sum() / df["Volume"][second_day].sum(),
+            places=8,
+        )
+        self.assertAlmostEqual(daily.iloc[24], typical.iloc[24], places=8)
+
+        rolling = vwap(df, window=5)
+        self.assertTrue(np.isnan(rolling.iloc[3]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,175 @@
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd
+
+from stocktoolkit.buffer import PriceBuffer
+from stocktoolkit.indicators import (
+    compute_returns,
+    compute_returns_panel,
+    macd,
+    moving_average,
+    moving_averages,
+    rolling_volatility,
+)
+from stocktoolkit.memo import (
+    IndicatorMemo,
+    disable_memoization,
+    enable_memoization,
+    get_memo,
+    memoization,
+)
+from stocktoolkit.plotting import render_price
+from stocktoolkit.synthetic import make_ohlcv
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(500)
+        self.close = self.df["Close"]
+
+    def tearDown(self):
+        disable_memoization()
+
+    # ---------- hits and misses ----------
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_memo())
+        moving_average(self.close, 20)
+        self.assertIsNone(get_memo())
+
+    def test_repeated_calls_hit(self):
+        with memoization() as memo:
+            first = moving_average(self.close, 20)
+            second = moving_average(self.close, window=20)
+            pd.testing.assert_series_equal(second, first)
+            # Equal content in another object hits too
+            moving_average(self.close.copy(), 20)
+            moving_average(self.close, 50)
+            compute_returns(self.close)
+            compute_returns(self.close, "simple")
+            compute_returns(self.close, "log")
+        self.assertIsNone(get_memo())
+        moving_average(self.close, 20)  # after the block: not recorded
+
+        stats = memo.stats()
+        self.assertEqual((stats.hits, stats.misses), (3, 4))
+        self.assertEqual(stats.entries, 4)
+        self.assertGreater(stats.nbytes, 0)
+        self.assertAlmostEqual(stats.hit_rate, 3 / 7)
+
+    def test_window_lists_and_plots_share_results(self):
+        with memoization() as memo:
+            moving_averages(self.close, [20, 60])
+            render_price(self.close, ma_windows=(20, 60))
+            macd(self.close)
+        # moving_averages, then macd with its two ema calls
+        self.assertEqual(memo.stats().hits, 1)
+        self.assertEqual(len(memo), 4)
+
+    def test_results_are_independent_copies(self):
+        with memoization():
+            returns = compute_returns(self.close)
+            expected = returns.copy()
+            returns.iloc[0] = 99.0
+            again = compute_returns(self.close)
+            pd.testing.assert_series_equal(again, expected)
+            again.iloc[1] = -99.0
+            pd.testing.assert_series_equal(compute_returns(self.close), expected)
+
+    def test_unkeyable_calls_run_unmemoized(self):
+        memo = enable_memoization()
+        self.assertIs(get_memo(), memo)
+        with self.assertRaises(TypeError):
+            compute_returns([1.0, 2.0])
+        # Errors are raised again, not stored
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                moving_average(self.close, 0)
+        with self.assertRaises(ValueError):
+            moving_average(pd.Series(dtype=float), 5)
+        self.assertEqual(len(memo), 0)
+        self.assertIs(disable_memoization(), memo)
+
+    # ---------- invalidation ----------
+
+    def test_in_place_changes_and_appends(self):
+        buffer = PriceBuffer.from_frame(self.df.iloc[:300])
+        with memoization() as memo:
+            view = buffer.frame["Close"]
+            before = moving_average(view, 10)
+
+            # A replaced bar changes the earlier view in place
+            bar = self.df.iloc[[299]].copy()
+            bar["Close"] *= 2
+            buffer.append(bar)
+            after = moving_average(view, 10)
+            self.assertNotEqual(after.iloc[-1], before.iloc[-1])
+            pd.testing.assert_series_equal(after, view.rolling(10).mean())
+
+            # The appended series replaces the results of its shorter version
+            buffer.append(self.df.iloc[300:])
+            grown = moving_average(buffer.frame["Close"], 10)
+            self.assertEqual(len(grown), 500)
+            # An older, shorter version does not evict the newer result
+            moving_average(self.df["Close"].iloc[:300], 10)
+
+            stats = memo.stats()
+            self.assertEqual(stats.hits, 0)
+            self.assertEqual(stats.superseded, 2)
+            self.assertEqual(stats.entries, 1)
+
+            rolling_volatility(compute_returns(self.close), 20)
+            # Every version of the close series: the grown view and self.close
+            self.assertEqual(memo.invalidate(self.close.iloc[:100]), 2)
+            self.assertEqual(memo.invalidate(), 1)
+            self.assertEqual(len(memo), 0)
+            memo.clear()
+            self.assertEqual(memo.stats().misses, 0)
+
+    def test_index_labels_are_part_of_the_key(self):
+        labels = self.close.index.to_numpy().copy()
+        labels[250] += pd.Timedelta(hours=1)
+        shifted = self.close.set_axis(pd.DatetimeIndex(labels))
+        aware = self.close.tz_localize("UTC")
+        with memoization() as memo:
+            moving_average(self.close, 5)
+            pd.testing.assert_index_equal(moving_average(shifted, 5).index, shifted.index)
+            pd.testing.assert_index_equal(moving_average(aware, 5).index, aware.index)
+            moving_average(aware, 5)
+        self.assertEqual((memo.stats().hits, memo.stats().misses), (1, 3))
+
+    def test_memory_cap(self):
+        size = moving_average(self.close, 5).memory_usage(index=True)
+        with memoization(max_bytes=int(size * 2.5)) as memo:
+            for window in (5, 10, 20):
+                moving_average(self.close, window)
+            moving_average(self.close, 5)
+            stats = memo.stats()
+        self.assertEqual(stats.entries, 2)
+        self.assertEqual(stats.evictions, 2)
+        self.assertEqual(stats.hits, 0)
+        self.assertLessEqual(stats.nbytes, stats.max_bytes)
+
+        with memoization(max_bytes=1) as memo:
+            moving_average(self.close, 5)
+        self.assertEqual(len(memo), 0)
+        with self.assertRaises(ValueError):
+            IndicatorMemo(max_bytes=0)
+
+    def test_panels(self):
+        panel = pd.DataFrame({"A": self.close, "B": self.close * 2})
+        with memoization() as memo:
+            first = macd(panel)
+            pd.testing.assert_frame_equal(macd(panel), first)
+            # Arrays are not fingerprinted
+            compute_returns_panel(panel.to_numpy())
+        self.assertEqual(memo.stats().hits, 1)
+        self.assertEqual(memo.stats().misses, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.concurrency import DownloadReport
+from stocktoolkit.data import get_close_price
+from stocktoolkit.indicators import compute_returns, rolling_volatility
+from stocktoolkit.parallel import parallel_map
+from stocktoolkit.synthetic import make_universe
+
+PIPELINE = [get_close_price, compute_returns, partial(rolling_volatility, window=20)]
+
+
+# Module-level so that it can be pickled to the worker processes
+def _last_close(df):
+    return float(get_close_price(df).iloc[-1])
+
+
+class TestParallelMap(unittest.TestCase):
+    def setUp(self):
+        self.universe = make_universe(6, 300)
+
+    def test_matches_serial_in_input_order(self):
+        serial = parallel_map(self.universe, PIPELINE, max_workers=1)
+        parallel = parallel_map(self.universe, PIPELINE, max_workers=2, chunk_size=2)
+        self.assertEqual(list(parallel), list(self.universe))
+        for symbol, expected in serial.items():
+            pd.testing.assert_series_equal(parallel[symbol], expected)
+
+    def test_results_viewing_shared_memory_are_detached(self):
+        closes = parallel_map(self.universe, get_close_price, max_workers=2)
+        for symbol, df in self.universe.items():
+            np.testing.assert_array_equal(closes[symbol].to_numpy(), df["Close"].to_numpy())
+        self.assertEqual(parallel_map(self.universe, _last_close, max_workers=2)["SYM0002"],
+                         float(self.universe["SYM0002"]["Close"].iloc[-1]))
+
+    def test_per_symbol_errors(self):
+        self.universe["SYM0001"] = self.universe["SYM0001"][["Open", "Volume"]]
+        report = DownloadReport()
+        result = parallel_map(self.universe, PIPELINE, max_workers=2, report=report)
+        self.assertNotIn("SYM0001", result)
+        self.assertEqual(len(result), 5)
+        self.assertEqual(list(report.failed), ["SYM0001"])
+        self.assertIsInstance(report.failed["SYM0001"].error, ValueError)
+
+        with self.assertRaises(ValueError):
+            parallel_map(self.universe, PIPELINE, max_workers=2)
+
+    def test_object_columns_are_pickled(self):
+        self.universe["SYM0003"] = self.universe["SYM0003"].assign(Exchange="XNAS")
+        report = DownloadReport()
+        result = parallel_map(self.universe, PIPELINE, max_workers=2, chunk_size=2, report=report)
+        self.assertTrue(report.ok)
+        self.assertEqual(list(result), list(self.universe))
+        serial = parallel_map(self.universe, PIPELINE, max_workers=1)
+        pd.testing.assert_series_equal(result["SYM0003"], serial["SYM0003"])
+
+    def test_panel_inputs(self):
+        panel = pd.concat(self.universe, axis=1)
+        closes = parallel_map(panel, get_close_price, max_workers=2)
+        self.assertEqual(list(closes), list(self.universe))
+
+        close_panel = pd.DataFrame({s: df["Close"] for s, df in self.universe.items()})
+        returns = parallel_map(close_panel, compute_returns, max_workers=2)
+        pd.testing.assert_series_equal(
+            returns["SYM0004"], compute_returns(close_panel["SYM0004"])
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            parallel_map({}, PIPELINE)
+        with self.assertRaises(ValueError):
+            parallel_map(self.universe, [])
+        with self.assertRaises(ValueError):
+            parallel_map(self.universe, PIPELINE, max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.indicators import compute_returns, moving_average, rolling_volatility
+from stocktoolkit.pipeline import CHECKPOINT_FILE, main, read_symbols, run_pipeline
+from stocktoolkit.synthetic import SyntheticFetcher
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "META"]
+
+
+def _read(path):
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.out_dir)
+
+    # ---------- read_symbols ----------
+
+    def test_read_symbols(self):
+        path = os.path.join(self.out_dir, "symbols.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("aapl, msft\n# header comment\n\nNVDA  amzn  # trailing comment\nAAPL\n")
+        self.assertEqual(read_symbols(path), ["AAPL", "MSFT", "NVDA", "AMZN"])
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("# nothing here\n")
+        with self.assertRaises(ValueError):
+            read_symbols(path)
+
+    # ---------- run_pipeline ----------
+
+    def test_outputs_match_indicators(self):
+        fetcher = SyntheticFetcher()
+        report = run_pipeline(
+            SYMBOLS, "2023-01-01", "2024-01-01", self.out_dir, fetcher=fetcher,
+            ma_windows=[5, 20], vol_windows=[10], chunk_size=2, max_workers=2,
+        )
+        self.assertTrue(report.ok)
+        self.assertEqual(report.succeeded, SYMBOLS)
+        self.assertEqual(report.done, 5)
+        self.assertGreater(report.bytes_written, 0)
+        self.assertGreater(report.rows_per_second, 0)
+        self.assertIn("5 written", report.summary())
+
+        close = fetcher("MSFT", "2023-01-01", "2024-01-01")["Close"]
+        df = _read(os.path.join(self.out_dir, "MSFT.csv"))
+        self.assertEqual(list(df.columns), ["Close", "Return", "MA_5", "MA_20", "Vol_10"])
+        self.assertEqual(report.rows, 5 * len(df))
+        np.testing.assert_allclose(df["Close"], close)
+        np.testing.assert_allclose(df["MA_20"], moving_average(close, 20), rtol=1e-10)
+        np.testing.assert_allclose(df["Return"].iloc[1:], compute_returns(close), rtol=1e-10)
+        np.testing.assert_allclose(
+            df["Vol_10"].iloc[1:], rolling_volatility(compute_returns(close), 10), rtol=1e-8
+        )
+        with open(os.path.join(self.out_dir, CHECKPOINT_FILE), encoding="utf-8") as fh:
+            self.assertEqual(fh.read().split(), SYMBOLS)
+
+    def test_resample_and_failures(self):
+        progress = []
+        report = run_pipeline(
+            SYMBOLS, "2023-01-01", "2024-01-01", self.out_dir, fetcher=SyntheticFetcher(fail=["NVDA"]),
+            ma_windows=[4], vol_windows=[], method="log", freq="ME", chunk_size=3, processes=2,
+            progress=lambda r: progress.append(r.done),
+        )
+        self.assertEqual(list(report.failed), ["NVDA"])
+        self.assertIsInstance(report.failed["NVDA"].error, ValueError)
+        self.assertEqual(progress, [3, 5])
+        self.assertFalse(os.path.exists(os.path.join(self.out_dir, "NVDA.csv")))
+        self.assertIn("failed NVDA", report.summary())
+
+        df = _read(os.path.join(self.out_dir, "AAPL.csv"))
+        self.assertEqual(list(df.columns), ["Close", "Return", "MA_4"])
+        self.assertEqual(len(df), 12)
+        np.testing.assert_allclose(df["Return"].iloc[1:], np.log(df["Close"]).diff().iloc[1:])
+
+    def test_resume_from_checkpoint(self):
+        run_pipeline(SYMBOLS[:3], "2023-01-01", "2023-06-01", self.out_dir, fetcher=SyntheticFetcher())
+
+        fetcher = SyntheticFetcher()
+        report = run_pipeline(SYMBOLS, "2023-01-01", "2023-06-01", self.out_dir, fetcher=fetcher, resume=True)
+        self.assertEqual(report.skipped, SYMBOLS[:3])
+        self.assertEqual(report.succeeded, SYMBOLS[3:])
+        self.assertEqual(fetcher.calls, 2)
+
+        # Without resume the checkpoint starts afresh
+        fetcher = SyntheticFetcher()
+        report = run_pipeline(SYMBOLS[:1], "2023-01-01", "2023-06-01", self.out_dir, fetcher=fetcher)
+        self.assertEqual(report.skipped, [])
+        self.assertEqual(fetcher.calls, 1)
+        with open(os.path.join(self.out_dir, CHECKPOINT_FILE), encoding="utf-8") as fh:
+            self.assertEqual(fh.read().split(), SYMBOLS[:1])
+
+    def test_charts(self):
+        report = run_pipeline(
+            SYMBOLS[:2], "2023-01-01", "2023-06-01", self.out_dir, fetcher=SyntheticFetcher(), charts="png"
+        )
+        self.assertTrue(report.ok)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.out_dir, "charts"))), ["AAPL_price.png", "MSFT_price.png"])
+
+    def test_invalid_arguments(self):
+        args = (SYMBOLS, "2023-01-01", "2023-06-01", self.out_dir)
+        with self.assertRaises(ValueError):
+            run_pipeline(*args, fmt="xlsx")
+        with self.assertRaises(ValueError):
+            run_pipeline(*args, charts="gif")
+        with self.assertRaises(ValueError):
+            run_pipeline(*args, method="bogus")
+        with self.assertRaises(ValueError):
+            run_pipeline(*args, chunk_size=0)
+        with self.assertRaises(ValueError):
+            run_pipeline(SYMBOLS, "2023/01/01", "2023-06-01", self.out_dir)
+        with self.assertRaises(ValueError):
+            run_pipeline(SYMBOLS, "2023-06-01", "2023-01-01", self.out_dir)
+        with self.assertRaises(ValueError):
+            run_pipeline(*args, freq="bogus")
+        with self.assertRaises(ValueError):
+            run_pipeline(*args, timeout=0)
+        # Nothing is written for invalid arguments
+        self.assertEqual(os.listdir(self.out_dir), [])
+
+    # ---------- command line ----------
+
+    def test_main(self):
+        path = os.path.join(self.out_dir, "symbols.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(SYMBOLS[:3]))
+        out = os.path.join(self.out_dir, "out")
+        argv = [path, "--start", "2023-01-01", "--end", "2023-06-01", "--out", out, "--synthetic", "--freq", "W"]
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            self.assertEqual(main(argv + ["--chunk-size", "2", "--profile"]), 0)
+        self.assertIn("3 written", stdout.getvalue())
+        self.assertIn("pipeline.run_pipeline", stdout.getvalue())
+        self.assertEqual(stderr.getvalue().count("symbols/s"), 2)
+        self.assertEqual(sorted(os.listdir(out)), ["AAPL.csv", "MSFT.csv", "NVDA.csv", CHECKPOINT_FILE])
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.assertEqual(main(argv + ["--resume", "--quiet"]), 0)
+        self.assertIn("3 skipped", stdout.getvalue())
+
+    def test_main_usage_errors(self):
+        path = os.path.join(self.out_dir, "symbols.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("AAPL\n")
+        out = os.path.join(self.out_dir, "out")
+        base = ["--out", out, "--synthetic", "--quiet"]
+        for argv in (
+            [path, "--start", "2020-13-01", "--end", "2021-01-01"],
+            [path, "--start", "2021-01-01", "--end", "2020-01-01"],
+            [path, "--start", "2020-01-01", "--end", "2021-01-01", "--chunk-size", "0"],
+            [os.path.join(self.out_dir, "missing.txt"), "--start", "2020-01-01", "--end", "2021-01-01"],
+        ):
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+                main(argv + base)
+            self.assertEqual(raised.exception.code, 2)
+            self.assertIn("error:", stderr.getvalue())
+        self.assertFalse(os.path.exists(out))
+
+    def test_main_run_errors_are_not_usage_errors(self):
+        path = os.path.join(self.out_dir, "symbols.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("AAPL\n")
+        # The output directory cannot be created: an error of the run, not of the arguments
+        argv = [path, "--start", "2020-01-01", "--end", "2021-01-01", "--out", path, "--synthetic", "--quiet"]
+        with self.assertRaises(OSError):
+            main(argv)
+
+    def test_module_entry_point(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "stocktoolkit", "--help"], capture_output=True, text=True, check=True
+        )
+        self.assertIn("--resume", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,34 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 import matplotlib
 matplotlib.use("Agg")  # use non-GUI backend for testing
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.figure import Figure
 
+from stocktoolkit.concurrency import DownloadReport
+from stocktoolkit.parallel import parallel_map
 from stocktoolkit.plotting import (
+    _MAX_TEMPLATES,
+    _TEMPLATES,
+    _decimate,
     plot_price,
     plot_returns,
+    render_charts,
+    render_price,
+    render_returns,
 )
+from stocktoolkit.synthetic import make_ohlcv, make_universe
+
+
+# Module-level so that it can be pickled to the worker processes
+def _tag(symbol, df):
+    return f"{symbol}:{len(df)}"
 
 
 class TestPlottingModule(unittest.TestCase):
@@ -43,5 +62,116 @@ class TestPlottingModule(unittest.TestCase):
             plot_returns([0.1, 0.2, -0.1])
 
 
+class TestRenderCharts(unittest.TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        self.universe = make_universe(4, 200)
+        self.prices = self.universe["SYM0000"]["Close"]
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    # ---------- render_price / render_returns ----------
+
+    def test_render_price_saves_figure(self):
+        path = os.path.join(self.out_dir, "price.png")
+        open_figures = plt.get_fignums()
+        fig = render_price(self.prices, ma_windows=[20], title="Rendered", path=path)
+        self.assertIsInstance(fig, Figure)
+        self.assertEqual(fig.axes[0].get_title(), "Rendered")
+        self.assertEqual(len(fig.axes[0].get_lines()), 2)
+        self.assertGreater(os.path.getsize(path), 0)
+        # pyplot does not track the figure
+        self.assertEqual(plt.get_fignums(), open_figures)
+
+    def test_render_on_given_axes(self):
+        fig = Figure()
+        top, bottom = fig.subplots(2)
+        render_price(self.prices, ax=top)
+        self.assertIs(render_returns(self.prices.pct_change().dropna(), ax=bottom), fig)
+        self.assertEqual(len(bottom.get_lines()), 2)  # returns and the zero line
+
+    def test_render_invalid_input_type(self):
+        with self.assertRaises(TypeError):
+            render_price([10.0, 10.5, 11.0])
+
+    # ---------- render_charts ----------
+
+    def test_render_charts_writes_one_file_per_symbol(self):
+        paths = render_charts(self.universe, self.out_dir, max_workers=2)
+        self.assertEqual(list(paths), list(self.universe))
+        self.assertEqual(paths["SYM0001"], os.path.join(self.out_dir, "SYM0001_price.png"))
+        for path in paths.values():
+            self.assertGreater(os.path.getsize(path), 0)
+
+        svgs = render_charts(self.universe, self.out_dir, kind="returns", fmt="SVG", max_workers=1)
+        self.assertTrue(svgs["SYM0003"].endswith("SYM0003_returns.svg"))
+        with open(svgs["SYM0003"], encoding="utf-8") as fh:
+            self.assertIn("SYM0003 Returns Chart", fh.read())
+
+    def test_reused_template_matches_fresh_figure(self):
+        paths = render_charts(self.universe, self.out_dir, fmt="svg", ma_windows=[20], max_workers=1)
+        fresh = os.path.join(self.out_dir, "fresh.svg")
+        render_price(self.universe["SYM0003"]["Close"], ma_windows=[20],
+                     title="SYM0003 Price Chart", path=fresh)
+        # The fourth chart reuses the figure drawn for the first one
+        with open(paths["SYM0003"], encoding="utf-8") as a, open(fresh, encoding="utf-8") as b:
+            self.assertEqual(len(a.read().splitlines()), len(b.read().splitlines()))
+
+    def test_templates_are_bounded(self):
+        _TEMPLATES.clear()
+        for width in range(_MAX_TEMPLATES + 2):
+            render_charts(self.universe, self.out_dir, figsize=(4 + width, 3), max_workers=1)
+        self.assertEqual(len(_TEMPLATES), _MAX_TEMPLATES)
+        self.assertEqual(next(reversed(_TEMPLATES))[2], (4 + _MAX_TEMPLATES + 1, 3))
+
+    def test_render_charts_per_symbol_errors(self):
+        self.universe["SYM0002"] = self.universe["SYM0002"][["Open", "Volume"]]
+        report = DownloadReport()
+        paths = render_charts(self.universe, self.out_dir, max_workers=1, report=report)
+        self.assertEqual(list(report.failed), ["SYM0002"])
+        self.assertNotIn("SYM0002", paths)
+
+    def test_render_charts_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            render_charts(self.universe, self.out_dir, kind="candles")
+        with self.assertRaises(ValueError):
+            render_charts(self.universe, self.out_dir, fmt="gif")
+
+    def test_parallel_map_pass_symbol(self):
+        tags = parallel_map(self.universe, _tag, max_workers=2, pass_symbol=True)
+        self.assertEqual(tags["SYM0001"], "SYM0001:200")
+
+
+class TestDownsampling(unittest.TestCase):
+    def test_decimate_keeps_bucket_extremes(self):
+        values = np.array([1.0, 5.0, 2.0, np.nan, np.nan, np.nan, 3.0, 0.0, 9.0, 4.0, 1.0, 2.0])
+        positions = _decimate(values, 2)
+        # first, max and last of [0:6]; first, min, max and last of [6:12]
+        np.testing.assert_array_equal(positions, [0, 1, 5, 6, 7, 8, 11])
+        self.assertIsNone(_decimate(values, 3))  # already few enough points
+        self.assertIsNone(_decimate(values, 0))
+
+    def test_long_series_are_decimated(self):
+        prices = make_ohlcv(50_000, freq="min")["Close"]
+        fig = render_price(prices, ma_windows=[20], figsize=(6, 3), dpi=100)
+        price_line, ma_line = fig.axes[0].get_lines()
+        self.assertLessEqual(len(price_line.get_ydata()), 4 * 600)
+        self.assertEqual(np.nanmax(price_line.get_ydata()), prices.max())
+        self.assertEqual(np.nanmin(price_line.get_ydata()), prices.min())
+        self.assertLessEqual(len(ma_line.get_ydata()), 4 * 600)
+
+        fig = render_returns(prices.pct_change().dropna(), downsample=100)
+        self.assertLessEqual(len(fig.axes[0].get_lines()[0].get_ydata()), 400)
+
+        fig = render_price(prices, downsample=False)
+        self.assertEqual(len(fig.axes[0].get_lines()[0].get_ydata()), 50_000)
+
+    def test_invalid_downsample(self):
+        prices = make_ohlcv(100)["Close"]
+        with self.assertRaises(ValueError):
+            render_price(prices, downsample=-1)
+
+
 if __name__ == "__main__":
     unittest.main()
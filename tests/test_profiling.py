@@ -0,0 +1,122 @@
+import asyncio
+import inspect
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+import stocktoolkit
+from stocktoolkit.aio import download_multiple_price_data_async
+from stocktoolkit.data import download_multiple_price_data, get_close_price
+from stocktoolkit.indicators import compute_returns, moving_average
+from stocktoolkit.profiling import disable_profiling, enable_profiling, get_profiler, profile
+from stocktoolkit.synthetic import AsyncSyntheticFetcher, SyntheticFetcher, make_ohlcv
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(300)
+
+    def tearDown(self):
+        disable_profiling()
+
+    # ---------- registry ----------
+
+    def test_every_public_function_is_instrumented(self):
+        for name in stocktoolkit.__all__:
+            obj = getattr(stocktoolkit, name)
+            if inspect.isfunction(obj) and obj.__module__ not in ("stocktoolkit.profiling", "stocktoolkit.memo"):
+                self.assertTrue(hasattr(obj, "__wrapped__"), name)
+        self.assertTrue(inspect.iscoroutinefunction(stocktoolkit.download_multiple_price_data_async))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_profiler())
+        compute_returns(self.df["Close"])
+        self.assertIsNone(get_profiler())
+
+    def test_records_calls_rows_and_nested_calls(self):
+        with profile() as prof:
+            close = get_close_price(self.df)
+            moving_average(close, 20)
+            moving_average(close, 50)
+            with self.assertRaises(ValueError):
+                compute_returns(close, method="bogus")
+        self.assertIsNone(get_profiler())
+        compute_returns(close)  # after the block: not recorded
+
+        stats = prof.stats()
+        self.assertEqual(stats.loc["indicators.moving_average", "calls"], 2)
+        self.assertEqual(stats.loc["indicators.moving_average", "rows"], 600)
+        self.assertEqual(stats.loc["indicators.compute_returns", "errors"], 1)
+        self.assertEqual(stats.loc["indicators.compute_returns", "calls"], 1)
+        self.assertEqual(stats.loc["validation.validate_price_series", "calls"], 3)
+        self.assertEqual(stats.loc["data.get_close_price", "rows"], 300)
+        self.assertTrue((stats["wall_s"] > 0).all())
+        self.assertTrue(stats["wall_s"].is_monotonic_decreasing)
+        line = next(l for l in prof.summary().splitlines() if l.startswith("indicators.moving_average"))
+        # Integer columns print as integers: calls, rows and bytes
+        self.assertRegex(line, r"^indicators\.moving_average\s+2\s.*ms\s+600\s+\d[\d,]*$")
+        self.assertNotIn(".0 ", line + " ")
+        self.assertEqual(len(prof.summary(limit=1).splitlines()), 2)
+
+        prof.reset()
+        self.assertTrue(prof.stats().empty)
+
+    def test_downloads_record_fetches_from_worker_threads(self):
+        fetcher = SyntheticFetcher()
+        profiler = enable_profiling()
+        self.assertIs(get_profiler(), profiler)
+        download_multiple_price_data(["AAPL", "MSFT", "NVDA"], "2024-01-01", "2024-03-01", fetcher=fetcher, max_workers=3)
+        download_multiple_price_data(["AAPL", "MSFT"], "2024-01-01", "2024-03-01", fetcher=fetcher, batch_size=2)
+        self.assertIs(disable_profiling(), profiler)
+
+        stats = profiler.stats()
+        self.assertEqual(stats.loc["data.download_multiple_price_data", "calls"], 2)
+        self.assertEqual(stats.loc["data.fetch", "calls"], 3)
+        self.assertEqual(stats.loc["data.fetch_batch", "calls"], 1)
+        self.assertEqual(stats.loc["validation.validate_price_dataframe", "calls"], 3)
+        self.assertGreater(stats.loc["data.fetch", "bytes"], 0)
+        self.assertEqual(stats.loc["data.download_multiple_price_data", "bytes"], 0)
+
+    def test_async_downloads(self):
+        with profile() as prof:
+            result = asyncio.run(download_multiple_price_data_async(
+                ["AAPL", "MSFT"], "2024-01-01", "2024-03-01", fetcher=AsyncSyntheticFetcher()
+            ))
+        stats = prof.stats()
+        self.assertEqual(stats.loc["aio.fetch", "calls"], 2)
+        self.assertEqual(stats.loc["aio.download_multiple_price_data_async", "rows"], sum(map(len, result.values())))
+
+    # ---------- Chrome trace ----------
+
+    def test_chrome_trace(self):
+        with profile(trace=True) as prof:
+            moving_average(compute_returns(self.df["Close"]), 10)
+        trace = prof.to_chrome_trace()
+        names = [event["name"] for event in trace["traceEvents"]]
+        self.assertEqual(names.count("indicators.moving_average"), 1)
+        outer = trace["traceEvents"][names.index("indicators.moving_average")]
+        self.assertEqual(outer["ph"], "X")
+        nested = [
+            event for event in trace["traceEvents"]
+            if event["name"] == "validation.validate_price_series"
+            and outer["ts"] <= event["ts"] <= outer["ts"] + outer["dur"]
+        ]
+        self.assertEqual(len(nested), 1)
+
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        prof.dump_chrome_trace(path)
+        with open(path, encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh)["traceEvents"], trace["traceEvents"])
+
+        with profile() as prof:
+            pass
+        with self.assertRaises(ValueError):
+            prof.to_chrome_trace()
+        self.assertIsInstance(prof.stats(), pd.DataFrame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from stocktoolkit.concurrency import DownloadReport
+from stocktoolkit.data import download_multiple_price_data, download_price_data, download_price_panel
+from stocktoolkit.providers import (
+    LocalFileProvider,
+    YFinanceProvider,
+    batch_fetcher_of,
+    get_default_provider,
+    set_default_provider,
+)
+from stocktoolkit.synthetic import SyntheticFetcher, make_ohlcv, make_universe
+
+HAS_PARQUET = any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet"))
+
+
+class TestLocalFileProvider(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.universe = make_universe(3, 300)
+        for symbol, df in self.universe.items():
+            df.to_csv(os.path.join(self.root, f"{symbol}.csv"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_serves_date_ranges_from_memory(self):
+        provider = LocalFileProvider(self.root)
+        df = provider("sym0001", "2000-02-01", "2000-03-01")
+        expected = self.universe["SYM0001"].loc["2000-02-01":"2000-02-29"]
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+        self.assertEqual(df.index[-1], pd.Timestamp("2000-02-29"))
+
+        provider("SYM0001", "2000-05-01", "2000-06-01")
+        self.assertEqual(provider.reads, 1)  # the file is read once
+        self.assertTrue(provider("SYM0001", "1990-01-01", "1990-02-01").empty)
+        self.assertTrue(provider("MISSING", "2000-01-01", "2001-01-01").empty)
+
+    def test_download_functions_accept_provider(self):
+        provider = LocalFileProvider(self.root)
+        df = download_price_data("SYM0002", "2000-01-01", "2000-06-01", fetcher=provider)
+        self.assertIsInstance(df.index, pd.DatetimeIndex)
+        with self.assertRaises(ValueError):
+            download_price_data("MISSING", "2000-01-01", "2000-06-01", fetcher=provider)
+
+        report = DownloadReport()
+        result = download_multiple_price_data(
+            ["SYM0000", "MISSING", "SYM0002"], "2000-01-01", "2000-06-01",
+            fetcher=provider, batch_size=2, report=report,
+        )
+        self.assertEqual(list(result), ["SYM0000", "SYM0002"])
+        self.assertEqual(list(report.failed), ["MISSING"])
+
+    def test_preload_symbols_and_eviction(self):
+        provider = LocalFileProvider(self.root, max_symbols=2)
+        self.assertEqual(provider.symbols(), ["SYM0000", "SYM0001", "SYM0002"])
+        self.assertEqual(provider.preload(), 3)
+        self.assertEqual(provider.reads, 3)
+        provider("SYM0000", "2000-01-01", "2000-02-01")  # evicted by SYM0002
+        self.assertEqual(provider.reads, 4)
+
+    def test_interval_directory_and_unsorted_file(self):
+        os.makedirs(os.path.join(self.root, "1m"))
+        minutes = make_ohlcv(500, freq="min", start="2024-01-02")
+        minutes.iloc[::-1].to_csv(os.path.join(self.root, "1m", "SYM0000.csv"))
+        provider = LocalFileProvider(self.root)
+        df = provider("SYM0000", "2024-01-02", "2024-01-03", "1m")
+        pd.testing.assert_frame_equal(df, minutes, check_freq=False)
+        self.assertEqual(provider.symbols("1m"), ["SYM0000"])
+        self.assertEqual(len(provider("SYM0000", "2000-01-01", "2000-02-01", "1d")), 21)
+
+    @unittest.skipUnless(HAS_PARQUET, "pyarrow or fastparquet is required for Parquet files")
+    def test_parquet_files(self):
+        self.universe["SYM0001"].to_parquet(os.path.join(self.root, "SYM0001.parquet"))
+        provider = LocalFileProvider(self.root, fmt="parquet")
+        pd.testing.assert_frame_equal(
+            provider("SYM0001", "2000-01-01", "2001-01-01"), self.universe["SYM0001"], check_freq=False
+        )
+        self.assertEqual(provider.symbols(), ["SYM0001"])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            LocalFileProvider(self.root, fmt="xlsx")
+        with self.assertRaises(ValueError):
+            LocalFileProvider(self.root, max_symbols=0)
+
+
+class TestDefaultProvider(unittest.TestCase):
+    def tearDown(self):
+        set_default_provider(None)
+
+    def test_defaults_to_yfinance(self):
+        self.assertIsInstance(get_default_provider(), YFinanceProvider)
+
+    def test_downloads_dispatch_through_default_provider(self):
+        fetcher = SyntheticFetcher()
+        self.assertIsNone(set_default_provider(fetcher))
+        self.assertIs(get_default_provider(), fetcher)
+
+        df = download_price_data("AAPL", "2024-01-01", "2024-02-01")
+        pd.testing.assert_frame_equal(df, fetcher("AAPL", "2024-01-01", "2024-02-01"))
+        download_multiple_price_data(["AAPL", "MSFT"], "2024-01-01", "2024-02-01", max_workers=2)
+        panel = download_price_panel(["AAPL", "MSFT"], "2024-01-01", "2024-02-01")
+        self.assertEqual(list(panel.columns.get_level_values(0).unique()), ["AAPL", "MSFT"])
+        self.assertEqual(fetcher.calls, 5)
+
+        self.assertIs(set_default_provider(None), fetcher)
+        with self.assertRaises(TypeError):
+            set_default_provider("yfinance")
+
+    def test_batch_fetcher_of_plain_function(self):
+        fetcher = SyntheticFetcher(fail=["BAD"])
+        self.assertEqual(batch_fetcher_of(fetcher), fetcher.batch)
+
+        def plain(symbol, start_date, end_date, interval):
+            return fetcher(symbol, start_date, end_date, interval)
+
+        panel = batch_fetcher_of(plain)(["AAPL", "BAD", "MSFT"], "2024-01-01", "2024-02-01", "1d")
+        self.assertEqual(list(panel.columns.get_level_values(0).unique()), ["AAPL", "MSFT"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.data import get_close_price
+from stocktoolkit.indicators import moving_average
+from stocktoolkit.store import PriceStore
+from stocktoolkit.synthetic import make_ohlcv, make_universe
+
+
+def _is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+# Runs in a worker process: reopen the store and compute from the mapped pages
+def _worker_moving_average(root, symbol):
+    close = get_close_price(PriceStore(root).open(symbol))
+    return _is_memory_mapped(close.to_numpy()), moving_average(close, 20)
+
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = PriceStore(self.root)
+        self.df = make_ohlcv(5_000, freq="min")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_round_trip_is_memory_mapped(self):
+        self.store.write("aapl", self.df)
+        stored = self.store.open("AAPL")
+        pd.testing.assert_frame_equal(stored, self.df, check_freq=False)
+
+        close = get_close_price(stored)
+        self.assertTrue(_is_memory_mapped(close.to_numpy()))
+        self.assertTrue(_is_memory_mapped(stored.index.asi8))
+        self.assertFalse(close.to_numpy().flags.writeable)
+        pd.testing.assert_series_equal(
+            moving_average(close, 20), moving_average(get_close_price(self.df), 20), check_freq=False
+        )
+
+    def test_open_in_memory(self):
+        self.store.write("AAPL", self.df)
+        stored = self.store.open("AAPL", mmap=False)
+        self.assertFalse(_is_memory_mapped(stored["Close"].to_numpy()))
+        pd.testing.assert_frame_equal(stored, self.df, check_freq=False)
+
+    def test_write_many_symbols_and_intervals(self):
+        universe = make_universe(3, 100)
+        self.assertGreater(self.store.write_many(universe), 0)
+        self.store.write("SYM0000", self.df, interval="1m")
+
+        self.assertEqual(self.store.symbols(), ["SYM0000", "SYM0001", "SYM0002"])
+        self.assertEqual(self.store.symbols("1m"), ["SYM0000"])
+        self.assertIn("SYM0001", self.store)
+        opened = self.store.open_many(["SYM0001", "SYM0002"])
+        pd.testing.assert_frame_equal(opened["SYM0002"], universe["SYM0002"], check_freq=False)
+
+        self.store.delete("SYM0000", "1d")
+        self.assertEqual(self.store.symbols("1m"), ["SYM0000"])
+        self.store.delete("SYM0000")
+        self.assertEqual(self.store.symbols("1m"), [])
+
+    def test_symbols_with_separators_are_kept_apart(self):
+        other = self.df * 2
+        self.store.write("BRK/B", self.df)
+        self.store.write("brk_b", other)
+        self.store.write("..", self.df)
+        self.assertEqual(self.store.symbols(), ["..", "BRK/B", "BRK_B"])
+        pd.testing.assert_frame_equal(self.store.open("BRK/B", mmap=False), self.df, check_freq=False)
+        pd.testing.assert_frame_equal(self.store.open("BRK_B", mmap=False), other, check_freq=False)
+        self.assertEqual(sorted(os.listdir(self.root)), ["%2E%2E", "BRK%2FB", "BRK_B"])
+        self.store.delete("BRK/B")
+        self.assertEqual(self.store.symbols(), ["..", "BRK_B"])
+
+    def test_open_missing_symbol(self):
+        with self.assertRaises(KeyError):
+            self.store.open("MISSING")
+
+    def test_tz_aware_index(self):
+        df = self.df.tz_localize("America/New_York")
+        self.store.write("AAPL", df)
+        pd.testing.assert_frame_equal(self.store.open("AAPL"), df, check_freq=False)
+
+    def test_concurrent_writes_of_one_symbol(self):
+        frames = [self.df.iloc[:n] for n in range(1_000, 5_000, 500)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda df: self.store.write("AAPL", df), frames * 4))
+        stored = self.store.open("AAPL", mmap=False)
+        self.assertIn(len(stored), [len(df) for df in frames])
+        # No temporary directory is left behind
+        self.assertEqual(os.listdir(os.path.join(self.root, "AAPL")), ["1d"])
+
+    def test_failed_write_leaves_no_temporary_directory(self):
+        df = self.df.assign(Note="x")
+        with self.assertRaises(ValueError):
+            self.store.write("AAPL", df)
+        self.assertEqual(os.listdir(os.path.join(self.root, "AAPL")), [])
+
+    def test_persistent_rename_error_is_raised(self):
+        self.store.write("AAPL", self.df)
+        error = OSError(errno.EXDEV, "Invalid cross-device link")
+        with mock.patch("stocktoolkit._columnar.os.replace", side_effect=error) as replace:
+            with self.assertRaises(OSError):
+                self.store.write("AAPL", self.df)
+        self.assertEqual(replace.call_count, 1)
+        self.assertEqual(os.listdir(os.path.join(self.root, "AAPL")), ["1d"])
+
+    def test_worker_processes_share_the_store(self):
+        self.store.write("AAPL", self.df)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_worker_moving_average, [self.root] * 2, ["AAPL"] * 2))
+        expected = moving_average(get_close_price(self.df), 20)
+        for mapped, ma in results:
+            self.assertTrue(mapped)
+            pd.testing.assert_series_equal(ma, expected, check_freq=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
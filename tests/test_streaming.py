@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.indicators import compute_returns, moving_average, rolling_volatility
+from stocktoolkit.streaming import OnlineReturns, OnlineRollingVolatility, OnlineSMA
+
+
+class TestStreamingModule(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        idx = pd.date_range("2024-01-01", periods=500, freq="D")
+        values = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+        values[[50, 51, 300]] = np.nan
+        self.prices = pd.Series(values, index=idx)
+
+    # ---------- OnlineReturns ----------
+
+    def test_online_returns_match_batch(self):
+        for method in ("simple", "log"):
+            state = OnlineReturns(method)
+            streamed = np.array([state.update(p) for p in self.prices])
+            clean = self.prices.dropna()
+            expected = compute_returns(clean, method=method)
+            seeded = OnlineReturns.from_series(clean.iloc[:100], method)
+            tail = [seeded.update(p) for p in clean.iloc[100:]]
+            np.testing.assert_allclose(tail, expected.iloc[99:].values)
+            self.assertTrue(np.isnan(streamed[0]))
+
+    def test_online_returns_invalid_method(self):
+        with self.assertRaises(ValueError):
+            OnlineReturns("SIMPLE")
+
+    # ---------- OnlineSMA ----------
+
+    def test_online_sma_matches_moving_average(self):
+        state = OnlineSMA(20)
+        streamed = [state.update(p) for p in self.prices]
+        expected = moving_average(self.prices, 20)
+        np.testing.assert_allclose(streamed, expected.values, rtol=1e-12)
+
+    def test_online_sma_seeded_from_history(self):
+        state = OnlineSMA.from_series(self.prices.iloc[:400], 20)
+        tail = [state.update(p) for p in self.prices.iloc[400:]]
+        expected = moving_average(self.prices, 20).iloc[400:]
+        np.testing.assert_allclose(tail, expected.values, rtol=1e-12)
+
+    # ---------- OnlineRollingVolatility ----------
+
+    def test_online_volatility_matches_rolling_volatility(self):
+        returns = compute_returns(self.prices.dropna())
+        state = OnlineRollingVolatility(30)
+        streamed = [state.update(r) for r in returns]
+        expected = rolling_volatility(returns, 30)
+        np.testing.assert_allclose(streamed, expected.values, rtol=1e-9)
+
+        seeded = OnlineRollingVolatility.from_series(returns.iloc[:200], 30)
+        tail = [seeded.update(r) for r in returns.iloc[200:]]
+        np.testing.assert_allclose(tail, expected.iloc[200:].values, rtol=1e-9)
+
+    def test_online_state_uses_slots(self):
+        for state in (OnlineReturns(), OnlineSMA(5), OnlineRollingVolatility(5)):
+            with self.assertRaises(AttributeError):
+                state.extra = 1
+
+    def test_online_invalid_window(self):
+        with self.assertRaises(ValueError):
+            OnlineSMA(0)
+        with self.assertRaises(TypeError):
+            OnlineRollingVolatility(2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stocktoolkit.concurrency import DownloadReport
+from stocktoolkit.data import download_multiple_price_data, download_price_data
+from stocktoolkit.synthetic import SyntheticFetcher, make_ohlcv, make_universe
+
+
+class TestSynthetic(unittest.TestCase):
+
+    # ---------- make_ohlcv / make_universe ----------
+
+    def test_make_ohlcv_shape_and_consistency(self):
+        df = make_ohlcv(500, seed=3)
+        self.assertEqual(list(df.columns), ["Open", "High", "Low", "Close", "Volume"])
+        self.assertEqual(len(df), 500)
+        self.assertEqual(df["Volume"].dtype, np.int64)
+        self.assertTrue((df["High"] >= df[["Open", "Close"]].max(axis=1)).all())
+        self.assertTrue((df["Low"] <= df[["Open", "Close"]].min(axis=1)).all())
+        pd.testing.assert_frame_equal(df, make_ohlcv(500, seed=3))
+
+    def test_make_universe_shares_calendar(self):
+        universe = make_universe(3, 50)
+        self.assertEqual(list(universe), ["SYM0000", "SYM0001", "SYM0002"])
+        self.assertTrue(universe["SYM0000"].index.equals(universe["SYM0002"].index))
+        self.assertFalse(universe["SYM0000"]["Close"].equals(universe["SYM0001"]["Close"]))
+
+    # ---------- SyntheticFetcher ----------
+
+    def test_overlapping_requests_return_identical_bars(self):
+        fetcher = SyntheticFetcher()
+        long = fetcher("AAPL", "2022-06-01", "2024-03-01", "1d")
+        short = fetcher("AAPL", "2023-11-15", "2024-01-20", "1d")
+        pd.testing.assert_frame_equal(long.loc[short.index], short)
+        self.assertEqual(fetcher.calls, 2)
+
+    def test_fail_symbols_give_empty_frames(self):
+        fetcher = SyntheticFetcher(fail=["BAD"])
+        report = DownloadReport()
+        data = download_multiple_price_data(
+            ["AAPL", "BAD"], "2024-01-01", "2024-02-01", fetcher=fetcher, report=report
+        )
+        self.assertEqual(list(data), ["AAPL"])
+        self.assertEqual(list(report.failed), ["BAD"])
+        with self.assertRaises(ValueError):
+            download_price_data("bad", "2024-01-01", "2024-02-01", fetcher=fetcher)
+
+    def test_batch_layout_matches_single_fetches(self):
+        fetcher = SyntheticFetcher()
+        wide = fetcher.batch(["AAPL", "MSFT"], "2024-01-01", "2024-03-01", "1d")
+        self.assertEqual(list(wide.columns.get_level_values(0).unique()), ["AAPL", "MSFT"])
+        pd.testing.assert_frame_equal(wide["MSFT"], fetcher("MSFT", "2024-01-01", "2024-03-01", "1d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from stocktoolkit.validation import (
@@ -9,7 +10,15 @@ from stocktoolkit.validation import (
     validate_price_series,
     validate_ma_window,
     validate_symbols,
+    validate_price_panel,
+    mark_validated,
+    is_validated,
+    set_trusted_inputs,
+    trusted_inputs,
+    validate_price_universe,
+    ValidationReport,
 )
+from stocktoolkit.synthetic import make_universe
 
 
 class TestValidationModule(unittest.TestCase):
@@ -77,6 +86,73 @@ class TestValidationModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_price_series(s)
 
+    # ---------- validate_price_panel ----------
+
+    def test_validate_price_panel_valid(self):
+        idx = pd.date_range("2024-01-01", periods=3, freq="D")
+        validate_price_panel(pd.DataFrame({"A": [1.0, 2.0, 3.0]}, index=idx))
+        validate_price_panel(np.ones((3, 2)))
+
+    def test_validate_price_panel_invalid(self):
+        with self.assertRaises(TypeError):
+            validate_price_panel([[1.0, 2.0]])
+        with self.assertRaises(ValueError):
+            validate_price_panel(np.ones(3))
+        with self.assertRaises(ValueError):
+            validate_price_panel(pd.DataFrame({"A": [1.0]}, index=[0]))
+
+    def test_validate_price_series_gaps_and_dtypes(self):
+        idx = pd.date_range("2024-01-01", periods=20_000, freq="min")
+        s = pd.Series(np.nan, index=idx)
+        s.iloc[15_000] = 1.0  # only value, past the first scan block
+        validate_price_series(s)
+        s.iloc[15_000] = np.nan
+        with self.assertRaises(ValueError):
+            validate_price_series(s)
+
+        validate_price_series(pd.Series([1, 2, 3], index=idx[:3]))
+        validate_price_series(pd.Series([None, 2.0], index=idx[:2], dtype="Float64"))
+        with self.assertRaises(ValueError):
+            validate_price_series(pd.Series([None, None], index=idx[:2], dtype="Float64"))
+
+    # ---------- mark_validated / trusted_inputs ----------
+
+    def test_mark_validated_skips_checks(self):
+        idx = pd.date_range("2024-01-01", periods=3, freq="D")
+        s = pd.Series([float("nan")] * 3, index=idx)
+        self.assertFalse(is_validated(s))
+        self.assertIs(mark_validated(s), s)
+        self.assertTrue(is_validated(s))
+        validate_price_series(s)  # marked, so not re-checked
+
+        # The mark belongs to the object, not to equal data
+        with self.assertRaises(ValueError):
+            validate_price_series(s.copy())
+
+        df = mark_validated(pd.DataFrame({"Close": [1, 2, 3]}, index=[1, 2, 3]))
+        validate_price_dataframe(df)
+        del df, s
+        import stocktoolkit.validation as validation
+        self.assertEqual(validation._VALIDATED, {})
+
+    def test_trusted_inputs(self):
+        bad = pd.Series([1, 2, 3], index=[1, 2, 3])
+        with trusted_inputs():
+            validate_price_series(bad)
+            validate_price_panel(np.zeros(3))
+            with trusted_inputs(False):
+                with self.assertRaises(ValueError):
+                    validate_price_series(bad)
+            self.assertTrue(is_validated(bad))
+        with self.assertRaises(ValueError):
+            validate_price_series(bad)
+
+        self.assertFalse(set_trusted_inputs(True))
+        try:
+            validate_price_series(bad)
+        finally:
+            self.assertTrue(set_trusted_inputs(False))
+
     # ---------- validate_ma_window ----------
 
     def test_validate_ma_window_valid(self):
@@ -113,5 +189,104 @@ class TestValidationModule(unittest.TestCase):
             validate_symbols(["   ", ""])
 
 
+
+class TestValidatePriceUniverse(unittest.TestCase):
+    def setUp(self):
+        self.universe = make_universe(6, 50)
+
+    def break_universe(self):
+        u = self.universe
+        u["SYM0000"] = u["SYM0000"].iloc[0:0]
+        u["SYM0001"] = u["SYM0001"].iloc[::-1]
+        u["SYM0002"] = pd.concat([u["SYM0002"], u["SYM0002"].iloc[-3:]]).sort_index(kind="stable")
+        u["SYM0003"] = u["SYM0003"].copy()
+        u["SYM0003"].iloc[:40, :4] = np.nan
+        u["SYM0004"] = u["SYM0004"].copy()
+        u["SYM0004"].iloc[3, 2] = 0.0
+        return u
+
+    def test_clean_universe(self):
+        report = validate_price_universe(self.universe)
+        self.assertIsInstance(report, ValidationReport)
+        self.assertTrue(report.ok)
+        self.assertEqual(report.valid, list(self.universe))
+        self.assertEqual(report.stats.loc["SYM0001", "rows"], 50)
+        self.assertEqual(report.stats.loc["SYM0001", "nan_ratio"], 0.0)
+
+    def test_reports_every_problem_per_symbol(self):
+        report = validate_price_universe(self.break_universe())
+        self.assertFalse(report.ok)
+        self.assertEqual(report.valid, ["SYM0005"])
+        self.assertEqual(report.issues["SYM0000"], ["no data"])
+        self.assertEqual(report.issues["SYM0001"], ["index is not sorted"])
+        self.assertEqual(report.issues["SYM0002"], ["3 duplicate timestamps"])
+        self.assertEqual(report.issues["SYM0003"], ["NaN ratio 0.80 exceeds 0.50"])
+        self.assertEqual(report.issues["SYM0004"], ["1 non-positive prices"])
+        self.assertEqual(validate_price_universe(self.universe, max_nan_ratio=0.9).invalid,
+                         ["SYM0000", "SYM0001", "SYM0002", "SYM0004"])
+
+    def test_bad_entries_and_symbols(self):
+        data = {
+            "aapl": self.universe["SYM0000"],
+            "AAPL": self.universe["SYM0001"],
+            "": self.universe["SYM0002"],
+            "NOINDEX": self.universe["SYM0003"].reset_index(drop=True),
+            "ALLNAN": pd.Series(np.nan, index=self.universe["SYM0004"].index),
+            "LIST": [1.0, 2.0],
+        }
+        issues = validate_price_universe(data).issues
+        self.assertEqual(issues["aapl"], ["symbol is duplicated after normalization"])
+        self.assertEqual(issues[""], ["symbol is not a non-empty string"])
+        self.assertEqual(issues["NOINDEX"], ["index is not a DateTimeIndex"])
+        self.assertEqual(issues["ALLNAN"], ["contains only NaN values"])
+        self.assertEqual(issues["LIST"], ["no data"])
+
+    def test_panels_match_dict(self):
+        universe = self.break_universe()
+        del universe["SYM0000"], universe["SYM0001"], universe["SYM0002"]
+        expected = validate_price_universe(universe)
+
+        panel = validate_price_universe(pd.concat(universe, axis=1))
+        self.assertEqual(panel.issues, expected.issues)
+        pd.testing.assert_frame_equal(panel.stats, expected.stats, check_dtype=False)
+
+        closes = pd.DataFrame({s: df["Close"] for s, df in universe.items()})
+        # With one column per symbol, missing closes are dates without a bar
+        report = validate_price_universe(closes)
+        self.assertTrue(report.ok)
+        self.assertEqual(report.stats.loc["SYM0003", "rows"], 10)
+
+    def test_ragged_panel_counts_rows_with_bars(self):
+        short = self.universe["SYM0001"].iloc[10:]
+        panel = pd.concat({"A": self.universe["SYM0000"], "B": short}, axis=1)
+        report = validate_price_universe(panel)
+        self.assertTrue(report.ok)
+        self.assertEqual(report.stats["rows"].tolist(), [50, 40])
+
+    def test_many_series_with_alternating_indexes(self):
+        close = self.universe["SYM0000"]["Close"].to_numpy()
+        dates = self.universe["SYM0000"].index
+        data = {}
+        for i in range(2_000):
+            index = dates.copy() if i % 2 == 0 else dates[::-1]
+            data[f"S{i:04d}"] = pd.Series(close, index=index)
+        report = validate_price_universe(data)
+        self.assertEqual(report.invalid, list(data)[1::2])
+        for symbol in report.invalid:
+            self.assertEqual(report.issues[symbol], ["index is not sorted"])
+
+    def test_mark_valid_frames(self):
+        universe = self.break_universe()
+        validate_price_universe(universe, mark=True)
+        self.assertTrue(is_validated(universe["SYM0005"]))
+        self.assertFalse(is_validated(universe["SYM0004"]))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            validate_price_universe([self.universe["SYM0000"]])
+        with self.assertRaises(ValueError):
+            validate_price_universe(self.universe, max_nan_ratio=1.5)
+
+
 if __name__ == "__main__":
     unittest.main()